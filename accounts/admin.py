@@ -16,6 +16,7 @@ class UserAdmin(BaseUserAdmin):
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
     list_display = ('sender', 'recipient', 'subject', 'is_read', 'created_at')
+    list_select_related = ('sender', 'recipient')
     list_filter = ('is_read', 'created_at')
     search_fields = ('sender__username', 'recipient__username', 'subject')
     readonly_fields = ('created_at',)
@@ -24,6 +25,7 @@ class MessageAdmin(admin.ModelAdmin):
 @admin.register(AdminProfile)
 class AdminProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'department', 'is_super_admin', 'created_at')
+    list_select_related = ('user',)
     list_filter = ('is_super_admin', 'created_at')
     search_fields = ('user__username',)
     readonly_fields = ('created_at',)
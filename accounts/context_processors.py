@@ -0,0 +1,11 @@
+from .notifications import get_notifications
+
+
+def notifications(request):
+    """Expose the current user's notification counters to every template."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    counts = get_notifications(user)
+    counts['pending_total'] = counts['pending_applications'] + counts['pending_connections']
+    return {'notifications': counts}
@@ -0,0 +1,70 @@
+"""Password hashers whose cost is set in ``settings.PASSWORD_HASHER_PARAMS``.
+
+``settings.PASSWORD_HASHER_POLICY`` picks the hasher used for new passwords
+and lists the others after it, so existing hashes keep verifying. Django
+re-hashes a password on the next successful login whenever it was made by a
+non-preferred hasher or with different cost parameters, so changing the
+policy or its parameters migrates users transparently as they log in.
+
+The classes keep Django's algorithm names, so hashes written by the stock
+hashers are read by these and vice versa. ``argon2`` needs the optional
+``argon2-cffi`` package; the other two only need the standard library.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# Hasher class path for each policy name in PASSWORD_HASHER_POLICY.
+POLICIES = {
+    'pbkdf2': 'accounts.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'accounts.hashers.ScryptPasswordHasher',
+    'argon2': 'accounts.hashers.Argon2PasswordHasher',
+}
+
+
+def policy_hashers(policy):
+    """``PASSWORD_HASHERS`` for ``policy``: its hasher first, then the rest."""
+    if policy not in POLICIES:
+        raise ValueError(f'Unknown password hasher policy {policy!r}; choose from {", ".join(POLICIES)}.')
+    return [POLICIES[policy]] + [path for name, path in POLICIES.items() if name != policy]
+
+
+def param(policy, name, default):
+    return getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(policy, {}).get(name, default)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return param('pbkdf2', 'iterations', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return param('scrypt', 'work_factor', hashers.ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return param('scrypt', 'block_size', hashers.ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return param('scrypt', 'parallelism', hashers.ScryptPasswordHasher.parallelism)
+
+    @property
+    def maxmem(self):
+        return param('scrypt', 'maxmem', hashers.ScryptPasswordHasher.maxmem)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return param('argon2', 'time_cost', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return param('argon2', 'memory_cost', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return param('argon2', 'parallelism', hashers.Argon2PasswordHasher.parallelism)
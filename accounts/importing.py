@@ -0,0 +1,216 @@
+"""Bulk import of startups, investors and manufacturers from CSV or JSONL.
+
+Creating accounts one by one with ``create_user`` costs a password hash, an
+INSERT and a ``create_profile`` signal (another INSERT) per row. The importer
+instead reads the file in chunks and, per chunk:
+
+1. drops rows that are invalid or whose username is already taken,
+2. hashes the passwords in a process pool (rows without a password, or every
+   row with ``invite_only``, get an unusable password instead),
+3. ``bulk_create``\\ s the users and then their profiles in one transaction.
+
+``bulk_create`` sends no signals, so the side effects of the signal handlers
+are applied here in bulk: profiles are created directly, new startups are
+filed under their niche and stage facets and added to the search index,
+recommendation refreshes are queued for new investors and new approved
+startups, and the cached platform statistics are dropped.
+
+Each row holds ``username``, ``user_email``, optionally ``password``, and
+the profile's own fields by model field name, e.g. for a startup::
+
+    {"username": "acme", "user_email": "founder@acme.io", "name": "Acme",
+     "niche": "Robotics", "valuation": 2500000, "stage": "Seed", "vision": "..."}
+"""
+import csv
+import gzip
+import io
+import itertools
+import json
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.apps import apps
+from django.db import transaction
+from admin_dashboard.stats import invalidate_platform_stats
+from investors.models import InvestorProfile
+from investors.tasks import refresh_investor_recommendations_task, refresh_startup_recommendations_task
+from manufacturers.models import ManufacturerProfile
+from startups import facets
+from startups.models import Startup
+from startups.search import get_backend
+from .models import User
+
+Entity = namedtuple('Entity', 'role model user_field fields required')
+
+ENTITIES = {
+    'startups': Entity(
+        'STARTUP', Startup, 'founder',
+        ('name', 'niche', 'valuation', 'stage', 'vision', 'email', 'phone', 'website', 'demo_video', 'approved'),
+        ('name',),
+    ),
+    'investors': Entity(
+        'INVESTOR', InvestorProfile, 'user',
+        ('investment_range_min', 'investment_range_max', 'industry_focus', 'location'),
+        (),
+    ),
+    'manufacturers': Entity(
+        'MANUFACTURER', ManufacturerProfile, 'user',
+        ('company_name', 'industry', 'production_capacity', 'location', 'email', 'phone'),
+        (),
+    ),
+}
+
+# Values for the profile fields a row leaves out. Startup's text fields are
+# required on the model but the sign-up flow also starts them blank.
+PROFILE_DEFAULTS = {'name': '', 'niche': '', 'valuation': 0, 'stage': '', 'vision': ''}
+
+ImportReport = namedtuple('ImportReport', 'read created skipped invalid seconds')
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+def read_rows(path, fmt=None):
+    """Yield the rows of a CSV or JSONL file (optionally ``.gz``) as dicts, lazily."""
+    name = path[:-3] if path.endswith('.gz') else path
+    fmt = fmt or ('jsonl' if name.endswith(('.jsonl', '.ndjson')) else 'csv')
+    opener = gzip.open if path.endswith('.gz') else io.open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+def build_profile(entity, row):
+    """Return the unsaved profile for ``row``, converting and validating its fields."""
+    missing = [field for field in ('username', *entity.required) if not row.get(field)]
+    if missing:
+        raise InvalidRow(f'missing {", ".join(missing)}')
+
+    values = {}
+    for name in entity.fields:
+        field = entity.model._meta.get_field(name)
+        value = row.get(name)
+        if value in (None, ''):
+            value = PROFILE_DEFAULTS.get(name, field.get_default())
+        try:
+            value = field.to_python(value)
+            if value not in field.empty_values:
+                field.run_validators(value)
+        except ValidationError as exc:
+            raise InvalidRow(f'{name}: {" ".join(exc.messages)}')
+        values[name] = value
+    return entity.model(**values)
+
+
+def init_hasher():
+    """Process pool initializer: workers started with ``spawn`` need Django set up."""
+    if not apps.ready:
+        django.setup()
+
+
+def hash_passwords(passwords, pool=None):
+    """Hash ``passwords`` in ``pool`` when one is given; ``None`` becomes an unusable password."""
+    real = [password for password in passwords if password]
+    if pool and real:
+        hashed = iter(pool.map(make_password, real, chunksize=16))
+    else:
+        hashed = map(make_password, real)
+    return [next(hashed) if password else make_password(None) for password in passwords]
+
+
+def import_chunk(entity, rows, pool=None, invite_only=False, seen=None):
+    """Import one chunk of rows. Returns ``(created, skipped, errors)``.
+
+    ``errors`` is a list of ``(row, message)``. ``seen`` collects usernames
+    across chunks so duplicates within a file are skipped too.
+    """
+    seen = set() if seen is None else seen
+    errors = []
+    valid = []
+    for row in rows:
+        try:
+            profile = build_profile(entity, row)
+        except InvalidRow as exc:
+            errors.append((row, str(exc)))
+            continue
+        valid.append((row, profile))
+
+    usernames = [row['username'] for row, _profile in valid]
+    taken = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+    fresh = []
+    for row, profile in valid:
+        if row['username'] in taken or row['username'] in seen:
+            continue
+        seen.add(row['username'])
+        fresh.append((row, profile))
+    skipped = len(valid) - len(fresh)
+    if not fresh:
+        return 0, skipped, errors
+
+    passwords = [None if invite_only else row.get('password') or None for row, _profile in fresh]
+    users = [
+        User(username=row['username'], email=row.get('user_email') or '', role=entity.role, password=encoded)
+        for (row, _profile), encoded in zip(fresh, hash_passwords(passwords, pool))
+    ]
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        profiles = []
+        for user, (_row, profile) in zip(users, fresh):
+            setattr(profile, entity.user_field, user)
+            profiles.append(profile)
+        if entity.model is Startup:
+            facets.assign_many(profiles)
+        entity.model.objects.bulk_create(profiles)
+        if entity.model is Startup:
+            facets.record_many(facets.facet_key(p.approved, p.niche_tag_id, p.stage_tag_id) for p in profiles)
+            facets.invalidate()
+            get_backend().index_many(profiles)
+            approved_ids = [profile.pk for profile in profiles if profile.approved]
+            if approved_ids:
+                refresh_startup_recommendations_task.delay(approved_ids)
+        elif entity.model is InvestorProfile:
+            refresh_investor_recommendations_task.delay([profile.pk for profile in profiles])
+    return len(fresh), skipped, errors
+
+
+def import_entities(kind, rows, chunk_size=1000, workers=None, invite_only=False, on_chunk=None):
+    """Import ``rows`` of ``kind`` (a key of ``ENTITIES``) and return an ``ImportReport``.
+
+    ``on_chunk(report, errors)`` is called after every chunk with the running
+    totals and that chunk's invalid rows.
+    """
+    entity = ENTITIES[kind]
+    started = time.monotonic()
+    read = created = skipped = invalid = 0
+    seen = set()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_hasher) if workers != 1 and not invite_only else None
+    try:
+        for chunk in chunked(rows, chunk_size):
+            chunk_created, chunk_skipped, errors = import_chunk(entity, chunk, pool, invite_only, seen)
+            read += len(chunk)
+            created += chunk_created
+            skipped += chunk_skipped
+            invalid += len(errors)
+            if on_chunk:
+                on_chunk(ImportReport(read, created, skipped, invalid, time.monotonic() - started), errors)
+    finally:
+        if pool:
+            pool.shutdown()
+    if created:
+        invalidate_platform_stats()
+    return ImportReport(read, created, skipped, invalid, time.monotonic() - started)
@@ -0,0 +1,43 @@
+"""In-process wake-ups for the message long-poll endpoint.
+
+A waiting ``poll_messages`` request registers an ``asyncio.Event`` for its
+user; the ``Message`` post_save signal sets it once the new row commits.
+Signals fire on the thread that saved the message, so events are set with
+``call_soon_threadsafe`` on the waiter's own loop. Messages saved by other
+processes are not seen here, which is why the endpoint also re-checks the
+database every ``MESSAGE_POLL_INTERVAL`` seconds.
+"""
+import asyncio
+import threading
+
+_waiters = {}
+_lock = threading.Lock()
+
+
+async def wait_for_message(user_id, timeout):
+    """Wait up to ``timeout`` seconds for a message to ``user_id``. Returns True if woken."""
+    loop = asyncio.get_running_loop()
+    waiter = (loop, asyncio.Event())
+    with _lock:
+        _waiters.setdefault(user_id, set()).add(waiter)
+    try:
+        await asyncio.wait_for(waiter[1].wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        with _lock:
+            waiters = _waiters.get(user_id)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del _waiters[user_id]
+
+
+def notify(user_id):
+    """Wake every request in this process waiting on ``user_id``."""
+    with _lock:
+        waiters = list(_waiters.get(user_id, ()))
+    for loop, event in waiters:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(event.set)
@@ -0,0 +1,65 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from accounts.hashers import POLICIES
+from accounts.importing import init_hasher
+
+PASSWORD = 'correct horse battery staple'
+
+
+def verify_many(hasher_path, encoded, rounds):
+    """Check ``encoded`` ``rounds`` times and return the seconds taken."""
+    hasher = import_string(hasher_path)()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        if not hasher.verify(PASSWORD, encoded):
+            raise RuntimeError('Password did not verify.')
+    return time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'Measure password checks (the CPU cost of a login) per second for each hasher policy.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--policy', action='append', choices=sorted(POLICIES),
+                            help='Policy to measure; repeat for several (default: all).')
+        parser.add_argument('--rounds', type=int, default=20,
+                            help='Password checks per process.')
+        parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                            help='Processes checking in parallel for the aggregate figure.')
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        processes = options['processes']
+        if rounds < 1 or processes < 1:
+            raise CommandError('--rounds and --processes must be at least 1.')
+
+        self.stdout.write(f'{"policy":<8} {"parameters":<50} {"ms/login":>9} {"per core/s":>11} '
+                          f'{f"x{processes} procs/s":>14}')
+        for policy in options['policy'] or list(POLICIES):
+            path = POLICIES[policy]
+            hasher = import_string(path)()
+            if hasher.library:
+                try:
+                    hasher._load_library()
+                except ValueError:
+                    self.stdout.write(f'{policy:<8} skipped: the {hasher.library} library is not installed')
+                    continue
+            encoded = make_password(PASSWORD, hasher=hasher)
+            params = ', '.join(f'{k}={v}' for k, v in hasher.decode(encoded).items()
+                               if k not in ('algorithm', 'hash', 'salt'))
+
+            single = verify_many(path, encoded, rounds)
+            with ProcessPoolExecutor(max_workers=processes, initializer=init_hasher) as pool:
+                started = time.perf_counter()
+                list(pool.map(verify_many, [path] * processes, [encoded] * processes, [rounds] * processes))
+                parallel = time.perf_counter() - started
+
+            self.stdout.write(
+                f'{policy:<8} {params:<50} {single / rounds * 1000:>9.1f} {rounds / single:>11.1f} '
+                f'{rounds * processes / parallel:>14.1f}'
+            )
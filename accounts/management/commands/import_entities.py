@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounts.importing import ENTITIES, import_entities, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create startup, investor or manufacturer accounts from a CSV or JSONL file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(ENTITIES))
+        parser.add_argument('path', help='CSV or JSONL file, optionally gzipped (.gz).')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default=None,
+                            help='Input format; guessed from the file extension by default.')
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Rows read, hashed and inserted at a time.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Processes hashing passwords (default: one per CPU; 1 hashes inline).')
+        parser.add_argument('--invite-only', action='store_true',
+                            help='Ignore passwords in the file and give every account an unusable one.')
+
+    def handle(self, *args, **options):
+        verbosity = options['verbosity']
+
+        def progress(report, errors):
+            for row, message in errors:
+                self.stderr.write(f'Invalid row {row.get("username") or row}: {message}')
+            if verbosity > 1:
+                self.stdout.write(f'{report.read} rows read, {report.created} created '
+                                  f'({report.created / max(report.seconds, 1e-6):.0f} accounts/s)')
+
+        try:
+            rows = read_rows(options['path'], options['format'])
+            report = import_entities(
+                options['kind'], rows, chunk_size=options['chunk_size'], workers=options['workers'],
+                invite_only=options['invite_only'], on_chunk=progress,
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(exc)
+
+        rate = report.read / max(report.seconds, 1e-6)
+        self.stdout.write(
+            f'{report.read} rows in {report.seconds:.1f}s ({rate:.0f} rows/s): '
+            f'{report.created} created, {report.skipped} skipped as existing, {report.invalid} invalid.'
+        )
+        self.stdout.write(self.style.SUCCESS(f'Imported {report.created} {options["kind"]}.'))
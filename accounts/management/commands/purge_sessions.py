@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounts.sessions import purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Delete expired sessions from the database in small batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows deleted per transaction.')
+        parser.add_argument('--sleep', type=float, default=0,
+                            help='Seconds to pause between batches.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+        deleted = purge_expired(
+            options['batch_size'], options['sleep'],
+            on_batch=lambda total: self.stdout.write(f'{total} expired sessions deleted'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Purged {deleted} expired sessions.'))
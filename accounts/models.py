@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 
 class User(AbstractUser):
     ROLE_CHOICES = (
@@ -11,6 +12,15 @@ class User(AbstractUser):
     
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['-date_joined', '-id'], name='user_joined_idx'),
+            models.Index(fields=['role', '-date_joined', '-id'], name='user_role_joined_idx'),
+            # Case-insensitive prefix search on the admin user listing.
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
+
     def is_investor(self):
         return self.role == 'INVESTOR'
 
@@ -35,7 +45,20 @@ class Message(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at'], name='message_recipient_idx'),
+            models.Index(fields=['sender', '-created_at'], name='message_sender_idx'),
+            # Unread badge/counts only need the recipient's unread rows.
+            models.Index(fields=['recipient'], condition=models.Q(is_read=False), name='message_unread_idx'),
+        ]
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored flag so the notification signals can diff it.
+        instance._loaded_is_read = instance.__dict__.get('is_read')
+        return instance
+
     def __str__(self):
         return f"From {self.sender.username} to {self.recipient.username}: {self.subject}"
 
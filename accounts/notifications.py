@@ -0,0 +1,78 @@
+"""Per-user notification counters kept in the cache.
+
+Each user has one cache entry per counter:
+
+* ``unread_messages`` - unread messages in the inbox
+* ``pending_applications`` - investment applications awaiting an investor
+* ``pending_connections`` - manufacturer requests awaiting a startup
+
+On a miss the counters are read from the unread-message index and the
+dashboard counter columns; after that, signals adjust them in place with
+``incr``/``decr`` so rendering the nav badge needs no query. A counter that
+is not cached is simply skipped by ``adjust`` and recomputed on next read.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+KINDS = ('unread_messages', 'pending_applications', 'pending_connections')
+DEFAULT_TIMEOUT = 300
+
+
+def cache_key(user_id, kind):
+    return f'notifications:{user_id}:{kind}'
+
+
+def compute_notifications(user):
+    """Read every counter for ``user`` from the database."""
+    from investors.models import InvestorProfile
+    from startups.models import Startup
+    from .models import Message
+
+    counts = dict.fromkeys(KINDS, 0)
+    counts['unread_messages'] = Message.objects.filter(recipient=user, is_read=False).count()
+    if user.is_investor():
+        counts['pending_applications'] = (
+            InvestorProfile.objects.filter(user=user).values_list('applications_pending', flat=True).first() or 0
+        )
+    elif user.is_startup():
+        counts['pending_connections'] = (
+            Startup.objects.filter(founder=user).values_list('connections_pending', flat=True).first() or 0
+        )
+    return counts
+
+
+def get_notifications(user):
+    """Return the counters for ``user``, from the cache when possible."""
+    keys = {cache_key(user.pk, kind): kind for kind in KINDS}
+    cached = cache.get_many(keys)
+    if len(cached) == len(keys):
+        return {kind: cached[key] for key, kind in keys.items()}
+
+    counts = compute_notifications(user)
+    timeout = getattr(settings, 'NOTIFICATION_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+    cache.set_many({key: counts[kind] for key, kind in keys.items()}, timeout)
+    return counts
+
+
+def reset(user_id):
+    """Drop every cached counter for ``user_id``."""
+    cache.delete_many([cache_key(user_id, kind) for kind in KINDS])
+
+
+def adjust(user_id, kind, delta):
+    """Add ``delta`` to a cached counter, if it is cached."""
+    adjust_many([user_id], kind, delta)
+
+
+def adjust_many(user_ids, kind, delta):
+    if not delta:
+        return
+    for user_id in user_ids:
+        try:
+            if delta > 0:
+                cache.incr(cache_key(user_id, kind), delta)
+            else:
+                cache.decr(cache_key(user_id, kind), -delta)
+        except ValueError:
+            # Not cached; the next read recomputes it.
+            pass
@@ -0,0 +1,192 @@
+"""Session engine that keeps the database off the request path.
+
+Enabled with ``SESSION_ENGINE = 'accounts.sessions'``. A session is looked
+up in three places, each filling the ones before it on a miss:
+
+1. a small per-process LRU (``SESSION_LOCAL_CACHE_SIZE`` entries, each
+   trusted for ``SESSION_LOCAL_CACHE_TTL`` seconds, so a logout in another
+   process is seen here that much later at most),
+2. the ``SESSION_CACHE_ALIAS`` cache, shared by every process using it: a
+   file-based cache by default, or Redis by pointing the alias at
+   ``django.core.cache.backends.redis.RedisCache``,
+3. the ``django_session`` table, which stays the durable copy.
+
+Changes to the session data are written through to the table. Saves that
+only push the expiry forward (e.g. with ``SESSION_SAVE_EVERY_REQUEST``) go to
+the caches only; the row's ``expire_date`` is rewritten once it lags behind
+by ``SESSION_WRITE_BEHIND_INTERVAL`` seconds, so an active user costs one
+UPDATE per interval instead of one per request.
+
+Expired rows are removed in batches by ``purge_expired``, which backs both
+the ``purge_sessions`` command and Django's ``clearsessions``.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.cache import caches
+from django.utils import timezone
+
+KEY_PREFIX = 'sessions:'
+DEFAULT_LOCAL_CACHE_SIZE = 1000
+DEFAULT_LOCAL_CACHE_TTL = 2
+DEFAULT_WRITE_BEHIND_INTERVAL = 300
+
+
+class LocalCache:
+    """Thread-safe LRU of session entries, each valid for ``SESSION_LOCAL_CACHE_TTL`` seconds."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        ttl = getattr(settings, 'SESSION_LOCAL_CACHE_TTL', DEFAULT_LOCAL_CACHE_TTL)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            stored_at, entry = item
+            if time.monotonic() - stored_at >= ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        size = getattr(settings, 'SESSION_LOCAL_CACHE_SIZE', DEFAULT_LOCAL_CACHE_SIZE)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_sessions = LocalCache()
+
+
+class SessionStore(DBStore):
+    """Database sessions read through a local LRU and a shared cache.
+
+    Cache entries are ``(payload, expires, stored_expires)``: the serialized
+    session data, when it expires, and the ``expire_date`` last written to
+    its row.
+    """
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._cache = caches[settings.SESSION_CACHE_ALIAS]
+        self._loaded = None
+
+    def load(self):
+        key = self.session_key
+        if key is None:
+            return {}
+        entry = local_sessions.get(key)
+        if entry is None:
+            entry = self._cache.get(KEY_PREFIX + key)
+            if entry is None:
+                entry = self._load_from_db()
+                if entry is None:
+                    return {}
+                self._cache.set(KEY_PREFIX + key, entry, self._timeout(entry))
+            local_sessions.set(key, entry)
+
+        payload, expires, _stored = entry
+        if expires <= timezone.now():
+            self._session_key = None
+            return {}
+        self._loaded = entry
+        return self.serializer().loads(payload)
+
+    async def aload(self):
+        return await sync_to_async(self.load)()
+
+    def _load_from_db(self):
+        session = self._get_session_from_db()
+        if session is None:
+            return None
+        payload = self.serializer().dumps(self.decode(session.session_data))
+        return (payload, session.expire_date, session.expire_date)
+
+    def _timeout(self, entry):
+        return max(int((entry[1] - timezone.now()).total_seconds()), 1)
+
+    def exists(self, session_key):
+        if not session_key:
+            return False
+        return (KEY_PREFIX + session_key) in self._cache or super().exists(session_key)
+
+    async def aexists(self, session_key):
+        return await sync_to_async(self.exists)(session_key)
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        payload = self.serializer().dumps(data)
+        expires = self.get_expiry_date()
+        interval = timedelta(seconds=getattr(settings, 'SESSION_WRITE_BEHIND_INTERVAL', DEFAULT_WRITE_BEHIND_INTERVAL))
+
+        if not must_create and self._loaded and self._loaded[0] == payload and expires - self._loaded[2] < interval:
+            # Only the expiry moved and the row is recent enough: update the caches alone.
+            stored = self._loaded[2]
+        else:
+            super().save(must_create=must_create)
+            stored = expires
+
+        entry = (payload, expires, stored)
+        self._cache.set(KEY_PREFIX + self.session_key, entry, self._timeout(entry))
+        local_sessions.set(self.session_key, entry)
+        self._loaded = entry
+
+    async def asave(self, must_create=False):
+        return await sync_to_async(self.save)(must_create)
+
+    def delete(self, session_key=None):
+        key = session_key or self.session_key
+        super().delete(session_key)
+        if key:
+            self._cache.delete(KEY_PREFIX + key)
+            local_sessions.delete(key)
+
+    async def adelete(self, session_key=None):
+        return await sync_to_async(self.delete)(session_key)
+
+    @classmethod
+    def clear_expired(cls):
+        purge_expired()
+
+
+def purge_expired(batch_size=1000, pause=0, on_batch=None):
+    """Delete expired session rows ``batch_size`` at a time and return how many went.
+
+    Each batch is its own short transaction and ``pause`` seconds are slept
+    between batches, so other writers are not locked out for the whole purge.
+    ``on_batch(deleted)`` is called with the running total after each batch.
+    Cache entries expire on their own.
+    """
+    sessions = SessionStore.get_model_class().objects
+    now = timezone.now()
+    deleted = 0
+    while True:
+        keys = list(sessions.filter(expire_date__lt=now).values_list('pk', flat=True)[:batch_size])
+        if not keys:
+            return deleted
+        deleted += sessions.filter(pk__in=keys).delete()[0]
+        if on_batch:
+            on_batch(deleted)
+        if pause:
+            time.sleep(pause)
@@ -1,6 +1,9 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from .models import User, AdminProfile
+from .live import notify
+from .notifications import adjust, reset
+from .models import User, AdminProfile, Message
 from investors.models import InvestorProfile
 from manufacturers.models import ManufacturerProfile
 from startups.models import Startup
@@ -16,3 +19,26 @@ def create_profile(sender, instance, created, **kwargs):
             Startup.objects.create(founder=instance, name="", niche="", valuation=0, stage="", vision="")
         elif instance.role == 'ADMIN':
             AdminProfile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Message)
+def wake_message_pollers(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: notify(instance.recipient_id))
+
+
+@receiver(post_save, sender=Message)
+def count_unread_on_save(sender, instance, created, **kwargs):
+    loaded_is_read = True if created else getattr(instance, '_loaded_is_read', None)
+    if loaded_is_read is None:
+        # Saved without being loaded first, so the change is unknown.
+        reset(instance.recipient_id)
+    else:
+        adjust(instance.recipient_id, 'unread_messages', int(loaded_is_read) - int(instance.is_read))
+    instance._loaded_is_read = instance.is_read
+
+
+@receiver(post_delete, sender=Message)
+def count_unread_on_delete(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust(instance.recipient_id, 'unread_messages', -1)
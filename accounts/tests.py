@@ -1,3 +1,295 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+import time
+from io import StringIO
 
-# Create your tests here.
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.sessions.models import Session
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from investors.models import InvestorProfile
+from investors.tasks import refresh_investor_recommendations_task, refresh_startup_recommendations_task
+from jobs.models import Job
+from manufacturers.models import ConnectionRequest, ManufacturerProfile
+from startups.models import InvestmentApplication, Startup
+from startups.search import search_startups
+from .hashers import policy_hashers
+from .importing import ENTITIES, import_chunk
+from .models import Message, User
+from .notifications import get_notifications
+from .sessions import KEY_PREFIX, SessionStore, local_sessions
+
+
+class MessagingViewTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='pass', role='INVESTOR')
+        self.bob = User.objects.create_user(username='bob', password='pass', role='STARTUP')
+        self.client.login(username='alice', password='pass')
+
+    def test_compose_inbox_and_read(self):
+        response = self.client.post(reverse('compose_message'), {
+            'recipient_id': self.bob.id, 'subject': 'Hello', 'content': 'Hi Bob',
+        })
+        self.assertRedirects(response, reverse('sent_messages'))
+        self.assertContains(self.client.get(reverse('sent_messages')), 'Hello')
+
+        self.client.login(username='bob', password='pass')
+        response = self.client.get(reverse('inbox'))
+        self.assertContains(response, 'Hello')
+        self.assertEqual(response.context['unread_count'], 1)
+
+        msg = Message.objects.get()
+        self.assertContains(self.client.get(reverse('view_message', args=[msg.id])), 'Hi Bob')
+        msg.refresh_from_db()
+        self.assertTrue(msg.is_read)
+
+    def test_strangers_cannot_read(self):
+        carol = User.objects.create_user(username='carol', role='INVESTOR')
+        msg = Message.objects.create(sender=self.bob, recipient=carol, subject='s', content='c')
+        response = self.client.get(reverse('view_message', args=[msg.id]))
+        self.assertRedirects(response, reverse('inbox'))
+
+    def test_poll_returns_existing_messages_immediately(self):
+        self.assertEqual(self.client.get(reverse('poll_messages')).json()['last_id'], 0)
+        msg = Message.objects.create(sender=self.bob, recipient=self.alice, subject='New', content='c')
+        data = self.client.get(reverse('poll_messages'), {'since': 0}).json()
+        self.assertEqual([m['id'] for m in data['messages']], [msg.id])
+        self.assertEqual(data['last_id'], msg.id)
+
+    @override_settings(MESSAGE_POLL_TIMEOUT=0.2, MESSAGE_POLL_INTERVAL=0.1)
+    def test_poll_times_out_empty(self):
+        data = self.client.get(reverse('poll_messages'), {'since': 0}).json()
+        self.assertEqual(data, {'messages': [], 'last_id': 0})
+
+
+class PollWakeUpTests(TransactionTestCase):
+    @override_settings(MESSAGE_POLL_TIMEOUT=10, MESSAGE_POLL_INTERVAL=10)
+    def test_poll_wakes_when_message_arrives(self):
+        alice = User.objects.create_user(username='alice', password='pass', role='INVESTOR')
+        bob = User.objects.create_user(username='bob', role='STARTUP')
+        self.client.login(username='alice', password='pass')
+
+        # Send from another thread once the poll is waiting; the in-process
+        # wake-up must answer long before the 10 second interval.
+        sender = threading.Timer(0.3, lambda: Message.objects.create(
+            sender=bob, recipient=alice, subject='Ping', content='c'))
+        sender.start()
+        started = time.monotonic()
+        data = self.client.get(reverse('poll_messages'), {'since': 0}).json()
+        sender.join()
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(data['messages'][0]['subject'], 'Ping')
+
+
+class NotificationCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.investor = User.objects.create_user(username='inv', role='INVESTOR')
+        self.founder = User.objects.create_user(username='founder', role='STARTUP')
+        self.maker = User.objects.create_user(username='maker', role='MANUFACTURER')
+        self.startup = Startup.objects.get(founder=self.founder)
+
+    def test_cache_hit_runs_no_queries(self):
+        get_notifications(self.investor)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_notifications(self.investor)['unread_messages'], 0)
+
+    def test_unread_count_follows_messages(self):
+        get_notifications(self.investor)
+        msg = Message.objects.create(sender=self.founder, recipient=self.investor, subject='s', content='c')
+        Message.objects.create(sender=self.founder, recipient=self.investor, subject='s', content='c')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_notifications(self.investor)['unread_messages'], 2)
+
+        msg.is_read = True
+        msg.save()
+        self.assertEqual(get_notifications(self.investor)['unread_messages'], 1)
+        Message.objects.filter(is_read=False).get().delete()
+        self.assertEqual(get_notifications(self.investor)['unread_messages'], 0)
+
+    def test_pending_counts_follow_status_changes(self):
+        get_notifications(self.investor)
+        get_notifications(self.founder)
+        application = InvestmentApplication.objects.create(
+            startup=self.startup, investor=InvestorProfile.objects.get(user=self.investor),
+            subject='s', message='m', amount_requested=1000, equity_offered=5,
+        )
+        request = ConnectionRequest.objects.create(
+            startup=self.startup, manufacturer=ManufacturerProfile.objects.get(user=self.maker), message='m',
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(get_notifications(self.investor)['pending_applications'], 1)
+            self.assertEqual(get_notifications(self.founder)['pending_connections'], 1)
+
+        application.status = 'ACCEPTED'
+        application.save()
+        request.delete()
+        self.assertEqual(get_notifications(self.investor)['pending_applications'], 0)
+        self.assertEqual(get_notifications(self.founder)['pending_connections'], 0)
+
+    def test_nav_shows_unread_badge(self):
+        Message.objects.create(sender=self.founder, recipient=self.investor, subject='s', content='c')
+        self.client.force_login(self.investor)
+        response = self.client.get(reverse('inbox'))
+        self.assertContains(response, 'Messages<span class="badge">1</span>', html=False)
+
+
+class ImportEntitiesTests(TestCase):
+    def write_jsonl(self, rows):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(fd, 'w') as f:
+            f.writelines(json.dumps(row) + '\n' for row in rows)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_imports_startups_without_signals(self):
+        User.objects.create_user(username='taken', role='STARTUP')
+        path = self.write_jsonl([
+            {'username': 'acme', 'user_email': 'a@acme.io', 'name': 'Acme Robotics', 'niche': 'Robotics',
+             'valuation': '2500000', 'stage': 'Seed', 'approved': True},
+            {'username': 'taken', 'name': 'Duplicate'},
+            {'username': 'acme', 'name': 'Duplicate in file'},
+            {'username': 'broken', 'name': 'Broken', 'valuation': 'lots'},
+        ])
+        out, err = StringIO(), StringIO()
+        call_command('import_entities', 'startups', path, workers=1, stdout=out, stderr=err)
+        self.assertIn('1 created, 2 skipped as existing, 1 invalid', out.getvalue())
+        self.assertIn('Invalid row broken', err.getvalue())
+
+        startup = Startup.objects.get(founder__username='acme')
+        self.assertEqual(Startup.objects.filter(founder__username='acme').count(), 1)
+        self.assertTrue(startup.approved)
+        self.assertFalse(startup.founder.has_usable_password())
+        self.assertEqual(list(search_startups(Startup.objects.all(), search='robot')), [startup])
+        job = Job.objects.get(task=refresh_startup_recommendations_task.name)
+        self.assertEqual(job.args, [[startup.pk]])
+
+    def test_batches_queries_per_chunk(self):
+        rows = [{'username': f'inv{n}', 'industry_focus': 'SaaS'} for n in range(20)]
+        # Existing usernames, users, profiles, the recommendation job, plus the savepoint pair.
+        with self.assertNumQueries(6):
+            created, skipped, errors = import_chunk(ENTITIES['investors'], rows)
+        self.assertEqual((created, skipped, errors), (20, 0, []))
+        investor_ids = list(InvestorProfile.objects.filter(industry_focus='SaaS').values_list('pk', flat=True))
+        self.assertEqual(len(investor_ids), 20)
+        job = Job.objects.get(task=refresh_investor_recommendations_task.name)
+        self.assertEqual(sorted(job.args[0]), sorted(investor_ids))
+
+    def test_hashes_passwords_unless_invite_only(self):
+        rows = [{'username': 'pw', 'password': 'secret-pass'}]
+        import_chunk(ENTITIES['manufacturers'], rows)
+        self.assertTrue(User.objects.get(username='pw').check_password('secret-pass'))
+        import_chunk(ENTITIES['manufacturers'], [{'username': 'invited', 'password': 'x'}], invite_only=True)
+        self.assertFalse(User.objects.get(username='invited').has_usable_password())
+
+
+@override_settings(PASSWORD_HASHER_PARAMS={'pbkdf2': {'iterations': 1000}, 'scrypt': {'work_factor': 2 ** 10}})
+class HasherPolicyTests(TestCase):
+    def setUp(self):
+        with self.settings(PASSWORD_HASHERS=policy_hashers('pbkdf2')):
+            self.user = User.objects.create_user(username='alice', password='s3cret-pass', role='INVESTOR')
+
+    def algorithm(self):
+        self.user.refresh_from_db()
+        return self.user.password.split('$')[:2]
+
+    def test_policy_change_rehashes_on_login(self):
+        self.assertEqual(self.algorithm(), ['pbkdf2_sha256', '1000'])
+        with self.settings(PASSWORD_HASHERS=policy_hashers('scrypt')):
+            self.assertEqual(authenticate(username='alice', password='s3cret-pass'), self.user)
+            self.assertEqual(self.algorithm()[0], 'scrypt')
+            self.assertEqual(authenticate(username='alice', password='s3cret-pass'), self.user)
+
+    def test_cost_change_rehashes_on_login(self):
+        with self.settings(PASSWORD_HASHERS=policy_hashers('pbkdf2'),
+                           PASSWORD_HASHER_PARAMS={'pbkdf2': {'iterations': 2000}}):
+            self.assertEqual(authenticate(username='alice', password='s3cret-pass'), self.user)
+        self.assertEqual(self.algorithm(), ['pbkdf2_sha256', '2000'])
+
+    def test_settings_order_matches_policy(self):
+        self.assertEqual(settings.PASSWORD_HASHERS, policy_hashers(settings.PASSWORD_HASHER_POLICY))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_logins', policy=['pbkdf2', 'scrypt'], rounds=1, processes=1, stdout=out)
+        self.assertIn('iterations=1000', out.getvalue())
+        self.assertIn('work_factor=1024', out.getvalue())
+
+
+class CachedSessionTests(TestCase):
+    def setUp(self):
+        local_sessions.clear()
+        self.store = SessionStore()
+        self.store['cart'] = [1, 2]
+        self.store.save()
+        self.key = self.store.session_key
+
+    def forget_caches(self):
+        local_sessions.clear()
+        caches['sessions'].delete(KEY_PREFIX + self.key)
+
+    def test_exists_without_a_key_skips_the_database(self):
+        with self.assertNumQueries(0):
+            self.assertFalse(self.store.exists(None))
+            self.assertFalse(self.store.exists(''))
+
+    def test_reads_skip_the_database(self):
+        self.assertTrue(Session.objects.filter(session_key=self.key).exists())
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(self.key)['cart'], [1, 2])
+        local_sessions.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(self.key)['cart'], [1, 2])
+        self.forget_caches()
+        with self.assertNumQueries(1):
+            self.assertEqual(SessionStore(self.key)['cart'], [1, 2])
+
+    def test_expiry_only_saves_are_written_behind(self):
+        session = SessionStore(self.key)
+        session.load()
+        with self.assertNumQueries(0):
+            session.save()
+        with self.settings(SESSION_WRITE_BEHIND_INTERVAL=0), CaptureQueriesContext(connection) as queries:
+            session.save()
+        self.assertTrue(any(q['sql'].startswith('UPDATE') for q in queries))
+
+        session['cart'] = [3]
+        with CaptureQueriesContext(connection) as queries:
+            session.save()
+        self.assertTrue(any(q['sql'].startswith('UPDATE') for q in queries))
+        self.forget_caches()
+        self.assertEqual(SessionStore(self.key)['cart'], [3])
+
+    def test_delete_clears_every_layer(self):
+        SessionStore(self.key).delete()
+        session = SessionStore(self.key)
+        self.assertEqual(session.load(), {})
+        self.assertIsNone(session.session_key)
+
+    def test_logged_in_requests_do_not_query_sessions(self):
+        user = User.objects.create_user(username='alice', role='STARTUP')
+        self.client.force_login(user)
+        self.client.get(reverse('inbox'))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('inbox'))
+        self.assertFalse([q for q in queries if 'django_session' in q['sql']])
+
+    def test_purge_sessions_command(self):
+        expired = timezone.now() - timedelta(days=1)
+        Session.objects.bulk_create(
+            Session(session_key=f'expired{i:025d}', session_data='', expire_date=expired) for i in range(5)
+        )
+        out = StringIO()
+        call_command('purge_sessions', batch_size=2, stdout=out)
+        self.assertIn('Purged 5 expired sessions.', out.getvalue())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), [self.key])
@@ -9,4 +9,5 @@ urlpatterns = [
     path('message/<int:message_id>/', views.view_message, name='view_message'),
     path('compose/', views.compose_message, name='compose_message'),
     path('compose/<int:recipient_id>/', views.compose_message, name='compose_message_to'),
+    path('messages/poll/', views.poll_messages, name='poll_messages'),
 ]
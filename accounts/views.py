@@ -1,8 +1,14 @@
-from django.shortcuts import redirect, render, get_object_or_404
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import redirect, render, aget_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login
 from django.contrib import messages
-from django.db.models import Q
+from .live import wait_for_message
 from .models import User, Message
 
 
@@ -44,61 +50,74 @@ def register(request):
     return render(request, 'registration/register.html')
 
 
+async def _auser(request):
+    """Resolve the user once with the async ORM and reuse it for the template."""
+    request.user = await request.auser()
+    return request.user
+
+
 @login_required
-def inbox(request):
+async def inbox(request):
     """View inbox messages."""
-    received = Message.objects.filter(recipient=request.user).order_by('-created_at')
-    unread_count = received.filter(is_read=False).count()
+    user = await _auser(request)
+    received = Message.objects.filter(recipient=user).select_related('sender').order_by('-created_at')
+    messages_list = [msg async for msg in received]
+    unread_count = sum(not msg.is_read for msg in messages_list)
+    last_id = max((msg.id for msg in messages_list), default=0)
     
-    return render(request, 'accounts/inbox.html', {
-        'messages_list': received,
+    return await sync_to_async(render)(request, 'accounts/inbox.html', {
+        'messages_list': messages_list,
         'unread_count': unread_count,
+        'last_id': last_id,
     })
 
 
 @login_required
-def sent_messages(request):
+async def sent_messages(request):
     """View sent messages."""
-    sent = Message.objects.filter(sender=request.user).order_by('-created_at')
+    user = await _auser(request)
+    sent = Message.objects.filter(sender=user).select_related('recipient').order_by('-created_at')
     
-    return render(request, 'accounts/sent.html', {
-        'messages_list': sent,
+    return await sync_to_async(render)(request, 'accounts/sent.html', {
+        'messages_list': [msg async for msg in sent],
     })
 
 
 @login_required
-def view_message(request, message_id):
+async def view_message(request, message_id):
     """View a single message."""
-    msg = get_object_or_404(Message, id=message_id)
+    user = await _auser(request)
+    msg = await aget_object_or_404(Message.objects.select_related('sender', 'recipient'), id=message_id)
     
     # Only sender or recipient can view
-    if msg.sender != request.user and msg.recipient != request.user:
+    if msg.sender_id != user.id and msg.recipient_id != user.id:
         return redirect('inbox')
     
     # Mark as read if recipient
-    if msg.recipient == request.user and not msg.is_read:
+    if msg.recipient_id == user.id and not msg.is_read:
         msg.is_read = True
-        msg.save()
+        await msg.asave(update_fields=['is_read'])
     
-    return render(request, 'accounts/message_detail.html', {'msg': msg})
+    return await sync_to_async(render)(request, 'accounts/message_detail.html', {'msg': msg})
 
 
 @login_required
-def compose_message(request, recipient_id=None):
+async def compose_message(request, recipient_id=None):
     """Compose a new message."""
+    user = await _auser(request)
     recipient = None
     if recipient_id:
-        recipient = get_object_or_404(User, id=recipient_id)
+        recipient = await aget_object_or_404(User, id=recipient_id)
     
     if request.method == 'POST':
         recipient_id = request.POST.get('recipient_id')
         subject = request.POST.get('subject')
         content = request.POST.get('content')
         
-        recipient = get_object_or_404(User, id=recipient_id)
+        recipient = await aget_object_or_404(User, id=recipient_id)
         
-        Message.objects.create(
-            sender=request.user,
+        await Message.objects.acreate(
+            sender=user,
             recipient=recipient,
             subject=subject,
             content=content
@@ -108,9 +127,49 @@ def compose_message(request, recipient_id=None):
         return redirect('sent_messages')
     
     # Get list of users to message (exclude self)
-    users = User.objects.exclude(id=request.user.id).order_by('username')
+    users = User.objects.exclude(id=user.id).order_by('username')
     
-    return render(request, 'accounts/compose.html', {
+    return await sync_to_async(render)(request, 'accounts/compose.html', {
         'recipient': recipient,
-        'users': users,
+        'users': [u async for u in users],
+    })
+
+
+@login_required
+async def poll_messages(request):
+    """Long-poll for messages newer than ``?since=<message id>``.
+
+    Responds as soon as a new message for the current user exists, or with
+    an empty list after ``MESSAGE_POLL_TIMEOUT`` seconds. Without ``since``
+    it returns the latest id immediately so clients know where to start.
+    """
+    user = await _auser(request)
+    latest = Message.objects.filter(recipient=user).order_by('-id').values_list('id', flat=True)
+    try:
+        since = int(request.GET['since'])
+    except (KeyError, ValueError):
+        return JsonResponse({'messages': [], 'last_id': await latest.afirst() or 0})
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.MESSAGE_POLL_TIMEOUT
+    new = Message.objects.filter(recipient=user, id__gt=since).select_related('sender').order_by('id')
+    while True:
+        found = [msg async for msg in new.all()]
+        remaining = deadline - loop.time()
+        if found or remaining <= 0:
+            break
+        await wait_for_message(user.id, min(remaining, settings.MESSAGE_POLL_INTERVAL))
+    
+    return JsonResponse({
+        'messages': [
+            {
+                'id': msg.id,
+                'sender': msg.sender.username,
+                'subject': msg.subject,
+                'created_at': msg.created_at.isoformat(),
+                'url': reverse('view_message', args=[msg.id]),
+            }
+            for msg in found
+        ],
+        'last_id': found[-1].id if found else since,
     })
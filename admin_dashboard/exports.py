@@ -0,0 +1,149 @@
+"""Streaming CSV/JSONL exports of the platform's main tables.
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` and encoded
+one at a time, so memory stays flat however large the table is. Output can
+be gzip-compressed on the fly.
+
+Exports are ordered by a watermark ``(created_at, id)`` (``(date_joined,
+id)`` for users, ``id`` alone for startups, which have no timestamp). An
+incremental export passes the last row's values back as ``since`` /
+``since_id`` and only gets the rows after it.
+
+Served by ``admin_dashboard.views.export_api`` and the ``export`` command.
+"""
+import csv
+import datetime
+import decimal
+import json
+import zlib
+from collections import namedtuple
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from accounts.models import User
+from manufacturers.models import ConnectionRequest
+from startups.models import InvestmentApplication, Startup
+from venturehub.pagination import keyset_filter
+
+Export = namedtuple('Export', 'queryset watermark columns')
+
+CHUNK_SIZE = 2000
+FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+EXPORTS = {
+    'applications': Export(
+        lambda: InvestmentApplication.objects.all(), 'created_at',
+        ['id', 'startup_id', 'startup__name', 'investor_id', 'investor__user__username',
+         'subject', 'amount_requested', 'equity_offered', 'status', 'created_at'],
+    ),
+    'connections': Export(
+        lambda: ConnectionRequest.objects.all(), 'created_at',
+        ['id', 'startup_id', 'startup__name', 'manufacturer_id', 'manufacturer__company_name',
+         'status', 'created_at'],
+    ),
+    'users': Export(
+        lambda: User.objects.all(), 'date_joined',
+        ['id', 'username', 'email', 'role', 'is_active', 'date_joined'],
+    ),
+    'startups': Export(
+        lambda: Startup.objects.all(), None,
+        ['id', 'founder_id', 'name', 'niche', 'stage', 'valuation', 'approved',
+         'applications_total', 'connections_total'],
+    ),
+}
+
+
+class InvalidWatermark(ValueError):
+    pass
+
+
+def parse_since(value):
+    """Parse an ISO 8601 ``since`` value; naive times are in the current time zone."""
+    since = parse_datetime(value)
+    if since is None:
+        raise InvalidWatermark(f'{value!r} is not an ISO 8601 date/time.')
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def export_queryset(name, since=None, since_id=None):
+    """Rows of export ``name`` in watermark order, after ``(since, since_id)`` if given."""
+    export = EXPORTS[name]
+    rows = export.queryset()
+    ordering = [export.watermark, 'pk'] if export.watermark else ['pk']
+
+    if export.watermark and since is not None:
+        if since_id is None:
+            rows = rows.filter(**{f'{export.watermark}__gt': since})
+        else:
+            rows = rows.filter(keyset_filter(ordering, [since, since_id]))
+    elif since_id is not None:
+        rows = rows.filter(pk__gt=since_id)
+    elif since is not None:
+        raise InvalidWatermark(f'{name} has no timestamp; use since_id.')
+    return rows.order_by(*ordering).values_list(*export.columns)
+
+
+def encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+class Echo:
+    """File-like object whose ``write`` just returns the line, for ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([encode_value(value) for value in row])
+
+
+def jsonl_lines(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, map(encode_value, row))), separators=(',', ':')) + '\n'
+
+
+def gzip_chunks(lines, flush_every=256 * 1024):
+    """Gzip ``lines`` on the fly, yielding compressed chunks as they fill up."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    pending = 0
+    for line in lines:
+        data = line.encode()
+        pending += len(data)
+        chunk = compressor.compress(data)
+        if pending >= flush_every:
+            chunk += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+def encode(rows, header, fmt='csv', compress=False):
+    """Yield ``rows`` encoded as ``fmt``, as bytes, optionally gzipped."""
+    lines = csv_lines(header, rows) if fmt == 'csv' else jsonl_lines(header, rows)
+    return gzip_chunks(lines) if compress else (line.encode() for line in lines)
+
+
+def stream(queryset, header, fmt='csv', compress=False, chunk_size=CHUNK_SIZE):
+    """Yield the encoded export of ``queryset`` (a ``values_list``) chunk by chunk."""
+    return encode(queryset.iterator(chunk_size=chunk_size), header, fmt, compress)
+
+
+def streaming_response(queryset, header, filename, fmt='csv', compress=False):
+    content_type = FORMATS[fmt]
+    if compress:
+        filename, content_type = f'{filename}.gz', 'application/gzip'
+    response = StreamingHttpResponse(stream(queryset, header, fmt, compress), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
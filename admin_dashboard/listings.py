@@ -0,0 +1,168 @@
+"""Querysets behind the admin manage_* listings and their CSV exports.
+
+Each listing turns the request's filter, search and sort parameters into one
+queryset, shared by the paginated page and the export so both show the same
+rows. Pages load only the columns their template renders; exports stream
+``values_list`` rows through ``admin_dashboard.exports``.
+
+Search goes through indexes instead of ``icontains`` across joins: startup
+names through the full-text index, usernames, emails and company names as a
+case-insensitive prefix over their ``Lower()`` functional indexes.
+"""
+from collections import namedtuple
+
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.db.models.lookups import GreaterThanOrEqual, LessThan
+from accounts.models import User
+from investors.models import InvestorProfile
+from manufacturers.models import ConnectionRequest, ManufacturerProfile
+from startups.models import InvestmentApplication, Startup
+from startups.search import matching_startup_ids
+from .exports import streaming_response
+
+Listing = namedtuple('Listing', 'build columns')
+
+
+def prefix_match(field, text):
+    """Case-insensitive prefix match on ``field`` served by a ``Lower(field)`` index.
+
+    ``istartswith`` compiles to ``LIKE``, which SQLite only answers from an
+    index declared ``COLLATE NOCASE``; a range over ``LOWER(field)`` can use
+    the functional index instead.
+    """
+    text = text.lower()
+    return Q(GreaterThanOrEqual(Lower(field), text)) & Q(LessThan(Lower(field), text + '\U0010ffff'))
+
+
+def matching_investors(text):
+    users = User.objects.filter(prefix_match('username', text)).values('pk')
+    return InvestorProfile.objects.filter(user__in=users).values('pk')
+
+
+def sort_key(params, sorts):
+    """Return the requested sort, falling back to the listing's first one."""
+    sort = params.get('sort', '')
+    return sort if sort in sorts else next(iter(sorts))
+
+
+def startup_listing(params):
+    filter_type = params.get('filter', 'all')
+    search = params.get('search', '')
+    sort = sort_key(params, STARTUP_SORTS)
+
+    startups = Startup.objects.select_related('founder').only(
+        'name', 'niche', 'stage', 'valuation', 'approved', 'founder__username',
+    )
+    if filter_type == 'pending':
+        startups = startups.filter(approved=False)
+    elif filter_type == 'approved':
+        startups = startups.filter(approved=True)
+    if search:
+        startups = startups.filter(pk__in=matching_startup_ids(search))
+
+    context = {'filter_type': filter_type, 'search': search, 'sort': sort}
+    return startups.order_by(*STARTUP_SORTS[sort]), context
+
+
+def user_listing(params):
+    role_filter = params.get('role', 'all')
+    search = params.get('search', '')
+    sort = sort_key(params, USER_SORTS)
+
+    users = User.objects.exclude(role='ADMIN').only('username', 'email', 'role', 'date_joined')
+    if role_filter != 'all':
+        users = users.filter(role=role_filter)
+    if search:
+        users = users.filter(prefix_match('username', search) | prefix_match('email', search))
+
+    context = {'role_filter': role_filter, 'search': search, 'sort': sort}
+    return users.order_by(*USER_SORTS[sort]), context
+
+
+def application_listing(params):
+    status_filter = params.get('status', 'all')
+    search = params.get('search', '')
+    sort = sort_key(params, APPLICATION_SORTS)
+
+    applications = InvestmentApplication.objects.select_related('startup', 'investor__user').only(
+        'amount_requested', 'equity_offered', 'status', 'created_at',
+        'startup__name', 'investor__user__username',
+    )
+    if status_filter != 'all':
+        applications = applications.filter(status=status_filter)
+    if search:
+        applications = applications.filter(
+            Q(startup__in=matching_startup_ids(search)) | Q(investor__in=matching_investors(search))
+        )
+
+    context = {'status_filter': status_filter, 'search': search, 'sort': sort}
+    return applications.order_by(*APPLICATION_SORTS[sort]), context
+
+
+def connection_listing(params):
+    status_filter = params.get('status', 'all')
+    search = params.get('search', '')
+    sort = sort_key(params, CONNECTION_SORTS)
+
+    connections = ConnectionRequest.objects.select_related('startup', 'manufacturer').only(
+        'message', 'status', 'created_at', 'startup__name', 'manufacturer__company_name',
+    )
+    if status_filter != 'all':
+        connections = connections.filter(status=status_filter)
+    if search:
+        manufacturers = ManufacturerProfile.objects.filter(prefix_match('company_name', search)).values('pk')
+        connections = connections.filter(
+            Q(startup__in=matching_startup_ids(search)) | Q(manufacturer__in=manufacturers)
+        )
+
+    context = {'status_filter': status_filter, 'search': search, 'sort': sort}
+    return connections.order_by(*CONNECTION_SORTS[sort]), context
+
+
+# Sort options offered by each listing, first one is the default. Every
+# ordering is backed by an index so cursor pages stay cheap.
+STARTUP_SORTS = {
+    'newest': ('-id',),
+    'oldest': ('id',),
+    'name': ('name',),
+}
+USER_SORTS = {
+    'newest': ('-date_joined',),
+    'oldest': ('date_joined',),
+    'username': ('username',),
+}
+APPLICATION_SORTS = {
+    'newest': ('-created_at',),
+    'oldest': ('created_at',),
+    'amount': ('-amount_requested',),
+}
+CONNECTION_SORTS = {
+    'newest': ('-created_at',),
+    'oldest': ('created_at',),
+}
+
+LISTINGS = {
+    'startups': Listing(startup_listing, [
+        ('id', 'ID'), ('name', 'Name'), ('founder__username', 'Founder'), ('niche', 'Niche'),
+        ('stage', 'Stage'), ('valuation', 'Valuation'), ('approved', 'Approved'),
+    ]),
+    'users': Listing(user_listing, [
+        ('id', 'ID'), ('username', 'Username'), ('email', 'Email'), ('role', 'Role'),
+        ('date_joined', 'Joined'),
+    ]),
+    'applications': Listing(application_listing, [
+        ('id', 'ID'), ('startup__name', 'Startup'), ('investor__user__username', 'Investor'),
+        ('subject', 'Subject'), ('amount_requested', 'Amount'), ('equity_offered', 'Equity'),
+        ('status', 'Status'), ('created_at', 'Applied'),
+    ]),
+    'connections': Listing(connection_listing, [
+        ('id', 'ID'), ('manufacturer__company_name', 'Manufacturer'), ('startup__name', 'Startup'),
+        ('message', 'Message'), ('status', 'Status'), ('created_at', 'Created'),
+    ]),
+}
+
+
+def csv_response(queryset, columns, filename):
+    rows = queryset.values_list(*[field for field, _label in columns])
+    return streaming_response(rows, [label for _field, label in columns], filename)
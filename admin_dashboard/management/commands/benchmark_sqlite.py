@@ -0,0 +1,134 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from venturehub.sqlite import PROFILES, init_command
+
+SCHEMA = """
+CREATE TABLE application (id INTEGER PRIMARY KEY, startup INTEGER NOT NULL, amount INTEGER NOT NULL,
+                          status TEXT NOT NULL);
+CREATE INDEX application_startup ON application (startup, id);
+CREATE TABLE startup (id INTEGER PRIMARY KEY, applications_total INTEGER NOT NULL);
+"""
+STARTUPS = 500
+
+
+def connect(path, profile):
+    """Open ``path`` the way Django's backend would under ``profile``."""
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    for statement in init_command(PROFILES[profile]['pragmas']).split(';'):
+        if statement:
+            conn.execute(statement)
+    return conn
+
+
+def create_database(path, rows):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(SCHEMA)
+    conn.execute('BEGIN')
+    conn.executemany('INSERT INTO startup VALUES (?, 0)', [(i,) for i in range(STARTUPS)])
+    conn.executemany(
+        'INSERT INTO application (startup, amount, status) VALUES (?, ?, ?)',
+        [(random.randrange(STARTUPS), random.randrange(1000, 100000), 'PENDING') for _ in range(rows)],
+    )
+    conn.execute('UPDATE startup SET applications_total = '
+                 '(SELECT count(*) FROM application WHERE application.startup = startup.id)')
+    conn.execute('COMMIT')
+    conn.close()
+
+
+def read(conn, _mode):
+    """A page view: a dashboard figure and the latest rows of one startup."""
+    startup = random.randrange(STARTUPS)
+    conn.execute('SELECT applications_total FROM startup WHERE id = ?', (startup,)).fetchone()
+    conn.execute('SELECT * FROM application WHERE startup = ? ORDER BY id DESC LIMIT 10', (startup,)).fetchall()
+
+
+def write(conn, mode):
+    """An application submit: check for a duplicate, insert, bump the counter."""
+    startup = random.randrange(STARTUPS)
+    conn.execute(f'BEGIN {mode or ""}')
+    try:
+        conn.execute('SELECT count(*) FROM application WHERE startup = ? AND status = ?',
+                     (startup, 'PENDING')).fetchone()
+        conn.execute('INSERT INTO application (startup, amount, status) VALUES (?, ?, ?)',
+                     (startup, random.randrange(1000, 100000), 'PENDING'))
+        conn.execute('UPDATE startup SET applications_total = applications_total + 1 WHERE id = ?', (startup,))
+        conn.execute('COMMIT')
+    except sqlite3.OperationalError:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def worker(path, profile, operation, deadline, results):
+    """Run ``operation`` until ``deadline``, one "request" at a time.
+
+    Without ``conn_max_age`` every request opens (and configures) its own
+    connection, like Django does with ``CONN_MAX_AGE = 0``.
+    """
+    config = PROFILES[profile]
+    done = locked = 0
+    conn = connect(path, profile) if config['conn_max_age'] else None
+    while time.monotonic() < deadline:
+        request_conn = conn or connect(path, profile)
+        try:
+            operation(request_conn, config['transaction_mode'])
+            done += 1
+        except sqlite3.OperationalError as exc:
+            if 'locked' not in str(exc) and 'busy' not in str(exc):
+                raise
+            locked += 1
+        finally:
+            if conn is None:
+                request_conn.close()
+    if conn:
+        conn.close()
+    results.append((operation.__name__, done, locked))
+
+
+class Command(BaseCommand):
+    help = 'Measure concurrent read/write throughput of SQLite under each connection profile.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', action='append', choices=sorted(PROFILES),
+                            help='Profile to measure; repeat for several (default: all).')
+        parser.add_argument('--seconds', type=float, default=5, help='Duration of each run.')
+        parser.add_argument('--readers', type=int, default=4, help='Threads serving reads.')
+        parser.add_argument('--writers', type=int, default=2, help='Threads serving writes.')
+        parser.add_argument('--rows', type=int, default=20000, help='Applications in the test database.')
+
+    def handle(self, *args, **options):
+        seconds = options['seconds']
+        if seconds <= 0 or options['readers'] < 0 or options['writers'] < 0:
+            raise CommandError('--seconds must be positive and thread counts not negative.')
+
+        self.stdout.write(f'{"profile":<12} {"reads/s":>10} {"writes/s":>10} {"locked errors":>14}')
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in options['profile'] or list(PROFILES):
+                path = os.path.join(directory, f'{profile}.sqlite3')
+                create_database(path, options['rows'])
+                deadline = time.monotonic() + seconds
+                results = []
+                threads = [
+                    threading.Thread(target=worker, args=(path, profile, operation, deadline, results))
+                    for operation, count in ((read, options['readers']), (write, options['writers']))
+                    for _ in range(count)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+                totals = {'read': 0, 'write': 0}
+                locked = 0
+                for name, done, errors in results:
+                    totals[name] += done
+                    locked += errors
+                self.stdout.write(
+                    f'{profile:<12} {totals["read"] / seconds:>10.0f} {totals["write"] / seconds:>10.0f} '
+                    f'{locked:>14}'
+                )
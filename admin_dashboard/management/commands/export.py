@@ -0,0 +1,62 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from admin_dashboard.exports import CHUNK_SIZE, EXPORTS, FORMATS, encode, export_queryset, parse_since
+
+
+class Command(BaseCommand):
+    help = 'Stream a table as CSV or JSONL, optionally only the rows after a watermark.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--output', '-o', default='-',
+                            help='File to write to; "-" (the default) writes to stdout.')
+        parser.add_argument('--since', default=None,
+                            help='Only export rows created after this ISO 8601 time.')
+        parser.add_argument('--since-id', type=int, default=None,
+                            help='With --since, resume after this id among rows created at that time; '
+                                 'on its own, export rows with a larger id.')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output.')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Rows fetched from the database at a time.')
+
+    def handle(self, *args, **options):
+        name = options['name']
+        export = EXPORTS[name]
+        try:
+            since = parse_since(options['since']) if options['since'] else None
+            queryset = export_queryset(name, since, options['since_id'])
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        written = 0
+        last = None
+
+        def rows():
+            nonlocal written, last
+            for row in queryset.iterator(chunk_size=options['chunk_size']):
+                written += 1
+                last = row
+                yield row
+
+        chunks = encode(rows(), export.columns, options['format'], options['gzip'])
+        if options['output'] == '-':
+            self.write_chunks(sys.stdout.buffer, chunks)
+        else:
+            with open(options['output'], 'wb') as out:
+                self.write_chunks(out, chunks)
+
+        self.stderr.write(f'{written} {name} exported.')
+        if last is not None:
+            # The watermark to pass back for the next incremental export.
+            row = dict(zip(export.columns, last))
+            if export.watermark:
+                self.stderr.write(f'Next: --since {row[export.watermark].isoformat()} --since-id {row["id"]}')
+            else:
+                self.stderr.write(f'Next: --since-id {row["id"]}')
+
+    def write_chunks(self, out, chunks):
+        for chunk in chunks:
+            out.write(chunk)
+        out.flush()
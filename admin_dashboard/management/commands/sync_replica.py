@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into each local replica in DATABASE_REPLICAS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('aliases', nargs='*', help='Replicas to refresh (default: all).')
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or settings.DATABASE_REPLICAS
+        if not aliases:
+            raise CommandError('No replicas configured; add them to DATABASE_REPLICAS.')
+        primary = connections[DEFAULT_DB_ALIAS]
+        for alias in aliases:
+            if alias not in settings.DATABASE_REPLICAS:
+                raise CommandError(f'{alias!r} is not in DATABASE_REPLICAS.')
+            replica = connections[alias]
+            if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+                raise CommandError('sync_replica only copies SQLite databases; use your database\'s replication.')
+            primary.ensure_connection()
+            replica.ensure_connection()
+            # The online backup API copies a consistent snapshot while the primary stays writable.
+            primary.connection.backup(replica.connection)
+            self.stdout.write(f'{alias}: copied from {primary.settings_dict["NAME"]}')
+        self.stdout.write(self.style.SUCCESS('Replicas refreshed.'))
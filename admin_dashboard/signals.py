@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from accounts.models import User
+from manufacturers.models import ConnectionRequest
+from startups.models import InvestmentApplication, Startup
+from .stats import invalidate_platform_stats
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Startup)
+@receiver(post_save, sender=InvestmentApplication)
+@receiver(post_save, sender=ConnectionRequest)
+def stats_changed_on_save(sender, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no statistic depends on.
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    invalidate_platform_stats()
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Startup)
+@receiver(post_delete, sender=InvestmentApplication)
+@receiver(post_delete, sender=ConnectionRequest)
+def stats_changed_on_delete(sender, **kwargs):
+    invalidate_platform_stats()
@@ -0,0 +1,71 @@
+"""Platform-wide statistics for the admin dashboard and monitoring.
+
+Each table is aggregated once with conditional ``COUNT``s instead of one
+query per figure. The result is cached for ``PLATFORM_STATS_TTL`` seconds
+and dropped by ``admin_dashboard.signals`` whenever a counted row changes.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from accounts.models import User
+from manufacturers.models import ConnectionRequest
+from startups.models import InvestmentApplication, Startup
+
+CACHE_KEY = 'admin_dashboard:platform_stats'
+DEFAULT_TTL = 60
+
+
+def status_counts(model):
+    """Aggregate ``model`` by every value of its ``status`` choices."""
+    return {
+        status.lower(): Count('pk', filter=Q(status=status))
+        for status, _label in model.STATUS_CHOICES
+    }
+
+
+def compute_platform_stats():
+    """Run one aggregate query per table and return a flat dict of counts."""
+    users = User.objects.aggregate(
+        total=Count('pk'),
+        **{role.lower(): Count('pk', filter=Q(role=role)) for role, _label in User.ROLE_CHOICES},
+    )
+    startups = Startup.objects.aggregate(
+        total=Count('pk'),
+        approved_startups=Count('pk', filter=Q(approved=True)),
+        pending_startups=Count('pk', filter=Q(approved=False)),
+    )
+    applications = InvestmentApplication.objects.aggregate(total=Count('pk'), **status_counts(InvestmentApplication))
+    connections = ConnectionRequest.objects.aggregate(total=Count('pk'), **status_counts(ConnectionRequest))
+
+    return {
+        'total_users': users['total'],
+        'total_investors': users['investor'],
+        'total_startups': users['startup'],
+        'total_manufacturers': users['manufacturer'],
+        'total_admins': users['admin'],
+        'total_startup_profiles': startups['total'],
+        'approved_startups': startups['approved_startups'],
+        'pending_startups': startups['pending_startups'],
+        'total_applications': applications['total'],
+        'pending_applications': applications['pending'],
+        'accepted_applications': applications['accepted'],
+        'rejected_applications': applications['rejected'],
+        'more_info_applications': applications['more_info'],
+        'total_connections': connections['total'],
+        'pending_connections': connections['pending'],
+        'accepted_connections': connections['accepted'],
+        'rejected_connections': connections['rejected'],
+    }
+
+
+def get_platform_stats():
+    """Return the cached statistics, computing them on a miss."""
+    stats = cache.get(CACHE_KEY)
+    if stats is None:
+        stats = compute_platform_stats()
+        cache.set(CACHE_KEY, stats, getattr(settings, 'PLATFORM_STATS_TTL', DEFAULT_TTL))
+    return stats
+
+
+def invalidate_platform_stats():
+    cache.delete(CACHE_KEY)
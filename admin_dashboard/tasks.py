@@ -0,0 +1,8 @@
+from jobs.registry import task
+from accounts.models import User
+
+
+@task(priority=1)
+def delete_user_task(user_id):
+    """Delete a user and everything that cascades from it."""
+    User.objects.filter(id=user_id).delete()
@@ -0,0 +1,313 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import User
+from investors.models import InvestorProfile
+from jobs.worker import Worker
+from manufacturers.models import ConnectionRequest, ManufacturerProfile
+from startups.models import InvestmentApplication, Startup
+from venturehub.replicas import PIN_SESSION_KEY, PinPrimaryMiddleware, ReplicaRouter, replica_reads, use_replicas
+from venturehub.sqlite import database_settings
+from venturehub.sqlite_backend.base import DatabaseWrapper
+from .exports import export_queryset
+from .listings import prefix_match
+from .stats import compute_platform_stats, get_platform_stats
+
+
+class PlatformStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='pass', role='ADMIN')
+        User.objects.create_user(username='i1', password='pass', role='INVESTOR')
+        self.founder = User.objects.create_user(username='s1', password='pass', role='STARTUP')
+
+    def test_counts_in_one_query_per_table(self):
+        with self.assertNumQueries(4):
+            stats = compute_platform_stats()
+        self.assertEqual(stats['total_users'], 3)
+        self.assertEqual(stats['total_investors'], 1)
+        self.assertEqual(stats['total_startups'], 1)
+        self.assertEqual(stats['pending_startups'], 1)
+        self.assertEqual(stats['approved_startups'], 0)
+
+    def test_cached_until_write(self):
+        get_platform_stats()
+        with self.assertNumQueries(0):
+            get_platform_stats()
+
+        startup = Startup.objects.get(founder=self.founder)
+        startup.approved = True
+        startup.save()
+        self.assertEqual(get_platform_stats()['approved_startups'], 1)
+
+    def test_json_endpoint_requires_admin(self):
+        url = reverse('platform_stats_api')
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.login(username='admin', password='pass')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_users'], 3)
+
+    @override_settings(PLATFORM_STATS_TOKEN='secret')
+    def test_json_endpoint_accepts_token(self):
+        url = reverse('platform_stats_api')
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+
+class DeleteUserTests(TestCase):
+    def test_delete_runs_in_background(self):
+        User.objects.create_user(username='admin', password='pass', role='ADMIN')
+        target = User.objects.create_user(username='s1', role='STARTUP')
+        self.client.login(username='admin', password='pass')
+
+        response = self.client.post(reverse('delete_user', args=[target.id]))
+        self.assertRedirects(response, reverse('manage_users'))
+        target.refresh_from_db()
+        self.assertFalse(target.is_active)
+
+        Worker().run(burst=True)
+        self.assertFalse(User.objects.filter(id=target.id).exists())
+        self.assertFalse(Startup.objects.filter(founder_id=target.id).exists())
+
+
+class ManageListingTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='admin', password='pass', role='ADMIN')
+        self.client.login(username='admin', password='pass')
+        founder = User.objects.create_user(username='founder', role='STARTUP')
+        self.startup = Startup.objects.get(founder=founder)
+        self.startup.name = 'Orbital Kitchens'
+        self.startup.save()
+        for name, amount in [('Alice', 500), ('bob', 900)]:
+            investor = User.objects.create_user(username=name, email=f'{name.lower()}@example.com', role='INVESTOR')
+            InvestmentApplication.objects.create(
+                startup=self.startup, investor=InvestorProfile.objects.get(user=investor),
+                message='hi', amount_requested=amount, equity_offered=5,
+            )
+        maker = User.objects.create_user(username='maker', role='MANUFACTURER')
+        ManufacturerProfile.objects.filter(user=maker).update(company_name='Acme Tooling')
+        ConnectionRequest.objects.create(manufacturer=ManufacturerProfile.objects.get(user=maker), startup=self.startup)
+
+    def listed(self, url_name, key, **params):
+        return [str(row) for row in self.client.get(reverse(url_name), params).context[key]]
+
+    def test_search_is_case_insensitive_prefix(self):
+        self.assertEqual(self.listed('manage_users', 'users', search='ALI'), ['Alice'])
+        self.assertEqual(self.listed('manage_users', 'users', search='bob@'), ['bob'])
+        self.assertEqual(len(self.listed('manage_applications', 'applications', search='alice')), 1)
+        self.assertEqual(len(self.listed('manage_applications', 'applications', search='orbit')), 2)
+        self.assertEqual(len(self.listed('manage_connections', 'connections', search='acme')), 1)
+        self.assertEqual(self.listed('manage_startups', 'startups', search='kitch'), ['Orbital Kitchens'])
+
+    def test_sort_and_unknown_sort(self):
+        response = self.client.get(reverse('manage_applications'), {'sort': 'amount'})
+        self.assertEqual([app.amount_requested for app in response.context['applications']], [900, 500])
+        response = self.client.get(reverse('manage_users'), {'sort': 'bogus'})
+        self.assertEqual(response.context['sort'], 'newest')
+
+    def test_csv_export_streams_filtered_rows(self):
+        response = self.client.get(reverse('export_listing', args=['applications']), {'search': 'bob'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'ID,Startup,Investor,Subject,Amount,Equity,Status,Applied')
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Orbital Kitchens,bob', lines[1])
+        self.assertEqual(self.client.get(reverse('export_listing', args=['secrets'])).status_code, 404)
+
+    def test_prefix_search_uses_functional_index(self):
+        plan = User.objects.filter(prefix_match('username', 'ali')).explain()
+        self.assertIn('user_username_lower_idx', plan)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='admin', password='pass', role='ADMIN')
+        founder = User.objects.create_user(username='founder', role='STARTUP')
+        startup = Startup.objects.get(founder=founder)
+        self.start = timezone.now() - timedelta(days=1)
+        for n in range(5):
+            investor = User.objects.create_user(username=f'i{n}', role='INVESTOR')
+            InvestmentApplication.objects.create(
+                startup=startup, investor=InvestorProfile.objects.get(user=investor), message='hi',
+                amount_requested=1000 + n, equity_offered=5, created_at=self.start + timedelta(hours=n // 2),
+            )
+        self.url = reverse('export_api', args=['applications', 'jsonl'])
+
+    def rows(self, response):
+        content = b''.join(response.streaming_content)
+        if response['Content-Type'] == 'application/gzip':
+            content = gzip.decompress(content)
+        return [json.loads(line) for line in content.decode().splitlines()]
+
+    def test_requires_admin_or_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        with self.settings(EXPORT_API_TOKEN='secret'):
+            response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(len(self.rows(response)), 5)
+
+    def test_incremental_export_resumes_after_watermark(self):
+        self.client.login(username='admin', password='pass')
+        rows = self.rows(self.client.get(self.url))
+        self.assertEqual([row['amount_requested'] for row in rows], ['1000.00', '1001.00', '1002.00', '1003.00', '1004.00'])
+        # Rows 2 and 3 share a timestamp; resuming after row 2 must still return row 3.
+        watermark = rows[2]
+        later = self.rows(self.client.get(self.url, {'since': watermark['created_at'], 'since_id': watermark['id']}))
+        self.assertEqual([row['id'] for row in later], [row['id'] for row in rows[3:]])
+        self.assertEqual(self.client.get(self.url, {'since': 'yesterday'}).status_code, 400)
+
+    def test_gzip_csv(self):
+        self.client.login(username='admin', password='pass')
+        url = reverse('export_api', args=['users', 'csv'])
+        response = self.client.get(url, {'gzip': '1'})
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="users.csv.gz"')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(lines[0], 'id,username,email,role,is_active,date_joined')
+        self.assertEqual(len(lines), 8)
+
+    def test_command_writes_file_and_next_watermark(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'startups.jsonl.gz')
+            err = StringIO()
+            call_command('export', 'startups', format='jsonl', gzip=True, output=path, stderr=err)
+            with gzip.open(path, 'rt') as f:
+                rows = [json.loads(line) for line in f]
+        self.assertEqual(len(rows), 1)
+        self.assertIn(f'Next: --since-id {rows[0]["id"]}', err.getvalue())
+
+    def test_export_query_uses_watermark_index(self):
+        plan = export_queryset('applications', self.start, 1).explain()
+        self.assertIn('app_created_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class SQLiteProfileTests(TestCase):
+    def test_production_profile_applies_pragmas_on_connect(self):
+        config = database_settings('production')
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual(database_settings('default')['OPTIONS'], {})
+        with self.settings(SQLITE_PROFILE='production'):
+            production = DatabaseWrapper(connection.settings_dict, alias='production')
+        self.addCleanup(production.close)
+        self.assertEqual(production.settings_dict['CONN_MAX_AGE'], 600)
+        with production.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+    def test_explicit_connection_settings_win(self):
+        explicit = {**connection.settings_dict, 'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True,
+                    'OPTIONS': {'timeout': 1}}
+        with self.settings(SQLITE_PROFILE='production'):
+            wrapper = DatabaseWrapper(explicit, alias='explicit')
+        self.assertEqual(wrapper.settings_dict['CONN_MAX_AGE'], 60)
+        self.assertIs(wrapper.settings_dict['CONN_HEALTH_CHECKS'], True)
+        self.assertEqual(wrapper.settings_dict['OPTIONS']['timeout'], 1)
+        self.assertEqual(wrapper.settings_dict['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        with self.settings(SQLITE_PROFILE='production'):
+            persistent = DatabaseWrapper({**connection.settings_dict, 'CONN_MAX_AGE': None}, alias='persistent')
+        self.assertIsNone(persistent.settings_dict['CONN_MAX_AGE'])
+
+    def test_plain_sqlite_by_default(self):
+        self.assertEqual(connection.settings_dict['CONN_MAX_AGE'], 0)
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 2)  # FULL
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_sqlite', seconds=0.2, readers=1, writers=1, rows=100, stdout=out)
+        self.assertIn('default', out.getvalue())
+        self.assertIn('production', out.getvalue())
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTests(SimpleTestCase):
+    def test_reads_go_to_replicas_only_when_allowed(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Startup), 'default')
+        with use_replicas():
+            self.assertEqual(router.db_for_read(Startup), 'replica')
+            self.assertEqual(router.db_for_read(Session), 'default')
+            self.assertEqual(router.db_for_write(Startup), 'default')
+
+    def test_replica_reads_skips_writes_and_pinned_sessions(self):
+        router = ReplicaRouter()
+        view = replica_reads(lambda request: router.db_for_read(Startup))
+        factory = RequestFactory()
+        request = factory.get('/')
+        request.session = {}
+        self.assertEqual(view(request), 'replica')
+        request.session = {PIN_SESSION_KEY: time.time()}
+        self.assertEqual(view(request), 'default')
+        with self.settings(REPLICA_STICKY_SECONDS=5):
+            request.session = {PIN_SESSION_KEY: time.time() - 10}
+            self.assertEqual(view(request), 'replica')
+        request = factory.post('/')
+        request.session = {}
+        self.assertEqual(view(request), 'default')
+
+
+class PinPrimaryTests(TestCase):
+    def test_post_pins_the_session(self):
+        investor = User.objects.create_user(username='ivy', role='INVESTOR')
+        founder = User.objects.create_user(username='sam', role='STARTUP')
+        startup = Startup.objects.get(founder=founder)
+        Startup.objects.filter(pk=startup.pk).update(approved=True)
+        self.client.force_login(investor)
+        with self.settings(DATABASE_REPLICAS=['replica']):
+            self.assertEqual(self.client.get(reverse('browse_startups')).status_code, 200)
+            self.assertNotIn(PIN_SESSION_KEY, self.client.session)
+            self.client.post(reverse('toggle_favorite', args=[startup.pk]))
+        self.assertIn(PIN_SESSION_KEY, self.client.session)
+
+    def test_writes_on_get_pin_the_session(self):
+        investor = User.objects.create_user(username='ivy', role='INVESTOR')
+        founder = User.objects.create_user(username='sam', role='STARTUP')
+        startup = Startup.objects.get(founder=founder)
+        Startup.objects.filter(pk=startup.pk).update(approved=True)
+        self.client.force_login(investor)
+        with self.settings(DATABASE_REPLICAS=['replica']):
+            self.client.get(reverse('startup_detail_investor', args=[startup.pk]))
+            self.assertNotIn(PIN_SESSION_KEY, self.client.session)
+            self.client.get(reverse('toggle_favorite', args=[startup.pk]))
+        self.assertIn(PIN_SESSION_KEY, self.client.session)
+
+    def test_async_requests_pin_without_a_thread(self):
+        user = User.objects.create_user(username='ivy', role='INVESTOR')
+
+        async def view(request):
+            await User.objects.filter(pk=user.pk).aupdate(first_name='Ivy')
+            return HttpResponse()
+
+        middleware = PinPrimaryMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = RequestFactory().get('/')
+        request.user, request.session = user, {}
+        with self.settings(DATABASE_REPLICAS=['replica']):
+            async_to_sync(middleware)(request)
+        self.assertIn(PIN_SESSION_KEY, request.session)
+
+    def test_login_does_not_pin(self):
+        User.objects.create_user(username='ivy', password='pass', role='INVESTOR')
+        with self.settings(DATABASE_REPLICAS=['replica']):
+            response = self.client.post(reverse('investor_login'), {'username': 'ivy', 'password': 'pass'})
+        self.assertRedirects(response, reverse('investor_dashboard'), fetch_redirect_response=False)
+        self.assertNotIn(PIN_SESSION_KEY, self.client.session)
@@ -4,6 +4,8 @@ from . import views
 urlpatterns = [
     path('login/', views.admin_login, name='admin_login'),
     path('dashboard/', views.admin_dashboard, name='admin_dashboard'),
+    path('stats.json', views.platform_stats_api, name='platform_stats_api'),
+    path('api/export/<str:name>.<str:fmt>', views.export_api, name='export_api'),
     path('logout/', views.admin_logout, name='admin_logout'),
     path('startups/', views.manage_startups, name='manage_startups'),
     path('startup/<int:startup_id>/<str:action>/', views.startup_approval, name='startup_approval'),
@@ -12,4 +14,5 @@ urlpatterns = [
     path('user/<int:user_id>/delete/', views.delete_user, name='delete_user'),
     path('applications/', views.manage_applications, name='manage_applications'),
     path('connections/', views.manage_connections, name='manage_connections'),
+    path('export/<str:listing>.csv', views.export_listing, name='export_listing'),
 ]
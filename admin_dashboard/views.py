@@ -1,14 +1,27 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
 from django.contrib import messages
-from django.db.models import Q
+from venturehub.pagination import paginate
+from venturehub.replicas import no_primary_pin, replica_reads
 from accounts.models import User, AdminProfile
 from startups.models import Startup, InvestmentApplication
+from startups.page_cache import cache_stats as page_cache_stats
 from manufacturers.models import ManufacturerProfile, ConnectionRequest
 from investors.models import InvestorProfile
+from .exports import EXPORTS, FORMATS, export_queryset, parse_since, streaming_response
+from .listings import (
+    LISTINGS, application_listing, connection_listing, csv_response, startup_listing, user_listing,
+)
+from .stats import get_platform_stats
+from .tasks import delete_user_task
 
 
+@no_primary_pin
 def admin_login(request):
     """Admin login page."""
     if request.user.is_authenticated and request.user.is_admin():
@@ -34,70 +47,80 @@ def admin_login(request):
 
 
 @login_required(login_url='admin_login')
+@replica_reads
 def admin_dashboard(request):
     """Main admin dashboard with platform statistics."""
     if not request.user.is_admin():
         return redirect('home')
     
-    # Get statistics
-    total_users = User.objects.count()
-    total_investors = User.objects.filter(role='INVESTOR').count()
-    total_startups = User.objects.filter(role='STARTUP').count()
-    total_manufacturers = User.objects.filter(role='MANUFACTURER').count()
-    
-    approved_startups = Startup.objects.filter(approved=True).count()
-    pending_startups = Startup.objects.filter(approved=False).count()
-    
-    pending_applications = InvestmentApplication.objects.filter(status='PENDING').count()
-    pending_connections = ConnectionRequest.objects.filter(status='PENDING').count()
+    # Get statistics (cached, one aggregate query per table on a miss)
+    context = dict(get_platform_stats())
+    context['page_cache'] = page_cache_stats()
     
     # Recent activity
-    recent_startups = Startup.objects.all().order_by('-id')[:5]
-    recent_users = User.objects.all().order_by('-date_joined')[:5]
-    recent_applications = InvestmentApplication.objects.all().order_by('-created_at')[:5]
-    
-    context = {
-        'total_users': total_users,
-        'total_investors': total_investors,
-        'total_startups': total_startups,
-        'total_manufacturers': total_manufacturers,
-        'approved_startups': approved_startups,
-        'pending_startups': pending_startups,
-        'pending_applications': pending_applications,
-        'pending_connections': pending_connections,
-        'recent_startups': recent_startups,
-        'recent_users': recent_users,
-        'recent_applications': recent_applications,
-    }    
+    context.update({
+        'recent_startups': Startup.objects.all().order_by('-id')[:5],
+        'recent_users': User.objects.all().order_by('-date_joined')[:5],
+        'recent_applications': InvestmentApplication.objects.select_related(
+            'startup', 'investor__user'
+        ).order_by('-created_at')[:5],
+    })
     return render(request, 'admin_dashboard/dashboard.html', context)
 
 
+def platform_stats_api(request):
+    """Platform statistics as JSON for monitoring.
+
+    Available to logged-in admins, or to any client sending
+    ``Authorization: Bearer <PLATFORM_STATS_TOKEN>`` when that setting is set.
+    """
+    if not api_access_allowed(request, getattr(settings, 'PLATFORM_STATS_TOKEN', '')):
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    
+    return JsonResponse(get_platform_stats())
+
+
+def api_access_allowed(request, token):
+    """True for logged-in admins, or for ``Authorization: Bearer <token>`` when ``token`` is set."""
+    header = request.headers.get('Authorization', '')
+    if token and hmac.compare_digest(header, f'Bearer {token}'):
+        return True
+    return request.user.is_authenticated and request.user.is_admin()
+
+
+def export_api(request, name, fmt):
+    """Stream a whole table as CSV or JSONL for analytics.
+
+    Available to logged-in admins, or with ``Authorization: Bearer
+    <EXPORT_API_TOKEN>``. ``?since=<ISO time>&since_id=<id>`` resumes after
+    the last exported row and ``?gzip=1`` compresses the stream.
+    """
+    if not api_access_allowed(request, getattr(settings, 'EXPORT_API_TOKEN', '')):
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    if name not in EXPORTS or fmt not in FORMATS:
+        raise Http404
+    
+    try:
+        since = parse_since(request.GET['since']) if request.GET.get('since') else None
+        since_id = int(request.GET['since_id']) if request.GET.get('since_id') else None
+        rows = export_queryset(name, since, since_id)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    
+    compress = request.GET.get('gzip') in ('1', 'true')
+    return streaming_response(rows, EXPORTS[name].columns, f'{name}.{fmt}', fmt, compress)
+
+
 @login_required(login_url='admin_login')
+@replica_reads
 def manage_startups(request):
     """View all startups and approve/reject them."""
     if not request.user.is_admin():
         return redirect('home')
     
-    filter_type = request.GET.get('filter', 'all')
-    search = request.GET.get('search', '')
-    
-    startups = Startup.objects.all()
-    
-    if filter_type == 'pending':
-        startups = startups.filter(approved=False)
-    elif filter_type == 'approved':
-        startups = startups.filter(approved=True)
-    
-    if search:
-        startups = startups.filter(Q(name__icontains=search) | Q(niche__icontains=search))
-    
-    startups = startups.order_by('-id')
-    
-    context = {
-        'startups': startups,
-        'filter_type': filter_type,
-        'search': search,
-    }
+    startups, context = startup_listing(request.GET)
+    page_obj = paginate(request, startups, settings.ADMIN_PAGE_SIZE, count_limit=settings.PAGINATION_COUNT_LIMIT)
+    context.update({'startups': page_obj, 'page_obj': page_obj, 'listing': 'startups'})
     
     return render(request, 'admin_dashboard/manage_startups.html', context)
 
@@ -122,29 +145,15 @@ def startup_approval(request, startup_id, action):
 
 
 @login_required(login_url='admin_login')
+@replica_reads
 def manage_users(request):
     """View all users and manage them."""
     if not request.user.is_admin():
         return redirect('home')
     
-    role_filter = request.GET.get('role', 'all')
-    search = request.GET.get('search', '')
-    
-    users = User.objects.exclude(role='ADMIN')
-    
-    if role_filter != 'all':
-        users = users.filter(role=role_filter)
-    
-    if search:
-        users = users.filter(Q(username__icontains=search) | Q(email__icontains=search))
-    
-    users = users.order_by('-date_joined')
-    
-    context = {
-        'users': users,
-        'role_filter': role_filter,
-        'search': search,
-    }
+    users, context = user_listing(request.GET)
+    page_obj = paginate(request, users, settings.ADMIN_PAGE_SIZE, count_limit=settings.PAGINATION_COUNT_LIMIT)
+    context.update({'users': page_obj, 'page_obj': page_obj, 'listing': 'users'})
     
     return render(request, 'admin_dashboard/manage_users.html', context)
 
@@ -186,61 +195,46 @@ def user_detail(request, user_id):
 
 
 @login_required(login_url='admin_login')
+@replica_reads
 def manage_applications(request):
     """View all investment applications."""
     if not request.user.is_admin():
         return redirect('home')
     
-    status_filter = request.GET.get('status', 'all')
-    search = request.GET.get('search', '')
-    
-    applications = InvestmentApplication.objects.all()
-    
-    if status_filter != 'all':
-        applications = applications.filter(status=status_filter)
-    
-    if search:
-        applications = applications.filter(Q(startup__name__icontains=search) | Q(investor__user__username__icontains=search))
-    
-    applications = applications.order_by('-created_at')
-    
-    context = {
-        'applications': applications,
-        'status_filter': status_filter,
-        'search': search,
-    }
+    applications, context = application_listing(request.GET)
+    page_obj = paginate(request, applications, settings.ADMIN_PAGE_SIZE, count_limit=settings.PAGINATION_COUNT_LIMIT)
+    context.update({'applications': page_obj, 'page_obj': page_obj, 'listing': 'applications'})
     
     return render(request, 'admin_dashboard/manage_applications.html', context)
 
 
 @login_required(login_url='admin_login')
+@replica_reads
 def manage_connections(request):
     """View all manufacturer-startup connection requests."""
     if not request.user.is_admin():
         return redirect('home')
     
-    status_filter = request.GET.get('status', 'all')
-    search = request.GET.get('search', '')
-    
-    connections = ConnectionRequest.objects.all()
-    
-    if status_filter != 'all':
-        connections = connections.filter(status=status_filter)
-    
-    if search:
-        connections = connections.filter(Q(startup__name__icontains=search) | Q(manufacturer__company_name__icontains=search))
-    
-    connections = connections.order_by('-created_at')
-    
-    context = {
-        'connections': connections,
-        'status_filter': status_filter,
-        'search': search,
-    }
+    connections, context = connection_listing(request.GET)
+    page_obj = paginate(request, connections, settings.ADMIN_PAGE_SIZE, count_limit=settings.PAGINATION_COUNT_LIMIT)
+    context.update({'connections': page_obj, 'page_obj': page_obj, 'listing': 'connections'})
     
     return render(request, 'admin_dashboard/manage_connections.html', context)
 
 
+@login_required(login_url='admin_login')
+def export_listing(request, listing):
+    """Stream a manage_* listing, with its current filters and sort, as CSV."""
+    if not request.user.is_admin():
+        return redirect('home')
+    if listing not in LISTINGS:
+        raise Http404
+    
+    queryset, _context = LISTINGS[listing].build(request.GET)
+    return csv_response(queryset, LISTINGS[listing].columns, f'{listing}.csv')
+
+
+@no_primary_pin
 @login_required(login_url='admin_login')
 def admin_logout(request):
     """Logout for admin."""
@@ -261,8 +255,10 @@ def delete_user(request, user_id):
         messages.error(request, 'Cannot delete admin accounts.')
         return redirect('manage_users')
     
-    username = user.username
-    user.delete()
-    messages.success(request, f'User {username} has been deleted.')
+    # Cascading deletes can be slow; lock the account now and delete it in the worker.
+    user.is_active = False
+    user.save(update_fields=['is_active'])
+    delete_user_task.delay(user.id)
+    messages.success(request, f'User {user.username} has been deactivated and scheduled for deletion.')
     
     return redirect('manage_users')
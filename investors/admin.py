@@ -5,6 +5,7 @@ from .models import InvestorProfile, FavoriteStartup
 @admin.register(InvestorProfile)
 class InvestorProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'investment_range_min', 'investment_range_max', 'industry_focus', 'location')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'industry_focus', 'location')
     readonly_fields = ('user',)
 
@@ -12,6 +13,7 @@ class InvestorProfileAdmin(admin.ModelAdmin):
 @admin.register(FavoriteStartup)
 class FavoriteStartupAdmin(admin.ModelAdmin):
     list_display = ('user', 'startup', 'created_at')
+    list_select_related = ('user', 'startup')
     list_filter = ('created_at',)
     search_fields = ('user__username', 'startup__name')
     readonly_fields = ('created_at',)
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from investors.matching import CHUNK_SIZE, refresh_investors
+
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed startup recommendations of every investor.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Number of investors scored per batch.')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+        started = time.monotonic()
+        total = refresh_investors(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed recommendations for {total} investors in {time.monotonic() - started:.1f}s.'
+        ))
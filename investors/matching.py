@@ -0,0 +1,190 @@
+"""Investor–startup matching and the precomputed ``Recommendation`` table.
+
+Every investor is scored against every approved startup with NumPy, a
+batch of investors at a time, as a weighted sum (``INVESTOR_MATCH_WEIGHTS``)
+of:
+
+* ``range``: how the investor's cheque range meets the round a startup of
+  that valuation typically raises (``INVESTOR_MATCH_ROUND_FRACTION`` of it),
+  compared in orders of magnitude;
+* ``niche``: token overlap between ``industry_focus`` and the startup niche;
+* ``history``: similarity of the startup's niche and stage to those of the
+  startups the investor favorited or received applications from.
+
+Startups the investor already favorited or has an application with are
+left out. The best ``INVESTOR_RECOMMENDATIONS`` per investor are stored in
+``Recommendation`` and read by the dashboard.
+
+Refreshes are incremental and run in the worker (``investors.tasks``,
+queued by ``investors.signals``): a changed investor is rescored against
+all startups; a changed startup is scored against all investors, and only
+the investors whose list it enters or leaves are rescored. Run
+``manage.py rebuild_recommendations`` for a full rebuild.
+"""
+from collections import Counter
+
+import numpy as np
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from startups.models import InvestmentApplication, Startup
+from venturehub.matching import Vocabulary, jaccard, log_range_fit, tokens, top_k, unit_rows
+from .models import DEFAULT_ROUND_FRACTION, FavoriteStartup, InvestorProfile, Recommendation
+
+DEFAULT_WEIGHTS = {'range': 0.4, 'niche': 0.4, 'history': 0.2}
+DEFAULT_RECOMMENDATIONS = 20
+CHUNK_SIZE = 500
+
+
+def recommendations_per_investor():
+    return getattr(settings, 'INVESTOR_RECOMMENDATIONS', DEFAULT_RECOMMENDATIONS)
+
+
+def round_sizes(valuations):
+    """Smallest and largest cheque a round at each valuation typically takes."""
+    low, high = getattr(settings, 'INVESTOR_MATCH_ROUND_FRACTION', DEFAULT_ROUND_FRACTION)
+    valuations = np.asarray(valuations, dtype=np.float64)
+    return valuations * low, valuations * high
+
+
+def profile_tokens(niche, stage):
+    """Tokens the history score compares startups by."""
+    return tokens(niche) | {f'stage:{word}' for word in tokens(stage)}
+
+
+class Catalog:
+    """Approved startups (all, or those in ``startup_ids``) as matrices."""
+
+    def __init__(self, startup_ids=None):
+        startups = Startup.objects.filter(approved=True)
+        if startup_ids is not None:
+            startups = startups.filter(pk__in=startup_ids)
+        rows = list(startups.order_by('pk').values_list('pk', 'niche', 'stage', 'valuation'))
+        self.ids = [pk for pk, *_ in rows]
+        self.index = {pk: column for column, pk in enumerate(self.ids)}
+
+        niches = [tokens(niche) for _pk, niche, _stage, _valuation in rows]
+        self.niche_vocabulary = Vocabulary(niches)
+        self.niches, self.niche_sizes = self.niche_vocabulary.matrix(niches)
+
+        profiles = [profile_tokens(niche, stage) for _pk, niche, stage, _valuation in rows]
+        self.profile_vocabulary = Vocabulary(profiles)
+        self.profiles = unit_rows(self.profile_vocabulary.matrix(profiles)[0])
+
+        self.round_low, self.round_high = round_sizes([valuation for *_, valuation in rows])
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def load_history(investors):
+    """Per investor pk: (niche/stage token counts, ids of startups already seen)."""
+    by_user = {user_id: pk for pk, user_id, *_ in investors}
+    history = {pk: (Counter(), set()) for pk in by_user.values()}
+    favorites = FavoriteStartup.objects.filter(user_id__in=by_user).values_list(
+        'user_id', 'startup_id', 'startup__niche', 'startup__stage')
+    for user_id, startup_id, niche, stage in favorites:
+        counts, seen = history[by_user[user_id]]
+        counts.update(profile_tokens(niche, stage))
+        seen.add(startup_id)
+    applications = InvestmentApplication.objects.filter(investor_id__in=history).values_list(
+        'investor_id', 'startup_id', 'startup__niche', 'startup__stage')
+    for investor_id, startup_id, niche, stage in applications:
+        counts, seen = history[investor_id]
+        counts.update(profile_tokens(niche, stage))
+        seen.add(startup_id)
+    return history
+
+
+def score(investors, catalog):
+    """``len(investors) x len(catalog)`` scores; ``-inf`` for startups the investor has seen.
+
+    ``investors`` are ``(pk, user_id, range_min, range_max, industry_focus)`` rows.
+    """
+    weights = getattr(settings, 'INVESTOR_MATCH_WEIGHTS', DEFAULT_WEIGHTS)
+    history = load_history(investors)
+
+    fit = log_range_fit([row[2] for row in investors], [row[3] for row in investors],
+                        catalog.round_low, catalog.round_high)
+    focus, focus_sizes = catalog.niche_vocabulary.matrix(tokens(row[4]) for row in investors)
+    niche = jaccard(focus, focus_sizes, catalog.niches, catalog.niche_sizes)
+    taste = catalog.profile_vocabulary.weights([history[row[0]][0] for row in investors])
+    scores = weights['range'] * fit + weights['niche'] * niche + weights['history'] * (taste @ catalog.profiles.T)
+
+    for row, investor in enumerate(investors):
+        seen = [catalog.index[pk] for pk in history[investor[0]][1] if pk in catalog.index]
+        scores[row, seen] = -np.inf
+    return scores
+
+
+def investor_rows(investor_ids=None):
+    investors = InvestorProfile.objects.order_by('pk')
+    if investor_ids is not None:
+        investors = investors.filter(pk__in=investor_ids)
+    return investors.values_list('pk', 'user_id', 'investment_range_min', 'investment_range_max', 'industry_focus')
+
+
+def investor_batches(investor_ids, size):
+    """Investor rows in batches of ``size``; ids are looked up a batch at a time."""
+    if investor_ids is None:
+        batch = []
+        for row in investor_rows().iterator(chunk_size=size):
+            batch.append(row)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        return
+    investor_ids = sorted(investor_ids)
+    for start in range(0, len(investor_ids), size):
+        yield list(investor_rows(investor_ids[start:start + size]))
+
+
+def refresh_investors(investor_ids=None, chunk_size=CHUNK_SIZE):
+    """Recompute the recommendations of ``investor_ids`` (every investor if ``None``); returns how many."""
+    catalog = Catalog()
+    k = recommendations_per_investor()
+    total = 0
+    for investors in investor_batches(investor_ids, chunk_size):
+        scores = score(investors, catalog)
+        now = timezone.now()
+        recommendations = [
+            Recommendation(investor_id=investor[0], startup_id=catalog.ids[column], rank=rank,
+                           score=float(scores[row, column]), computed_at=now)
+            for row, (investor, columns) in enumerate(zip(investors, top_k(scores, k)))
+            for rank, column in enumerate(columns, 1)
+        ]
+        with transaction.atomic():
+            Recommendation.objects.filter(investor_id__in=[investor[0] for investor in investors]).delete()
+            Recommendation.objects.bulk_create(recommendations)
+        total += len(investors)
+    return total
+
+
+def refresh_startups(startup_ids, chunk_size=CHUNK_SIZE):
+    """Update the recommendations after ``startup_ids`` changed; returns how many investors were rescored.
+
+    An investor is rescored if the startup is on their list (it may have to
+    move or leave) or now scores above the last entry of their list.
+    """
+    affected = set(Recommendation.objects.filter(startup_id__in=startup_ids).values_list('investor_id', flat=True))
+    changed = Catalog(startup_ids)
+    if len(changed):
+        k = recommendations_per_investor()
+        # The score to beat for investors with a full list; anyone else takes any startup.
+        cutoffs = dict(
+            Recommendation.objects.values('investor_id').annotate(entries=Count('id'), lowest=Min('score'))
+            .filter(entries__gte=k).values_list('investor_id', 'lowest')
+        )
+        for investors in investor_batches(None, chunk_size):
+            best = score(investors, changed).max(axis=1)
+            affected.update(
+                investor[0] for investor, top in zip(investors, best)
+                if np.isfinite(top) and top > cutoffs.get(investor[0], -np.inf)
+            )
+    if not affected:
+        return 0
+    return refresh_investors(affected, chunk_size)
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investors', '0005_investorprofile_updated_at'),
+        ('startups', '0013_pitch_deck_preview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Recommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('investor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='investors.investorprofile')),
+                ('startup', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='startups.startup')),
+            ],
+            options={
+                'ordering': ['rank'],
+                'indexes': [models.Index(fields=['investor', 'rank'], name='recommendation_rank_idx')],
+                'unique_together': {('investor', 'startup')},
+            },
+        ),
+    ]
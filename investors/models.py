@@ -1,5 +1,12 @@
+from decimal import Decimal
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+# Share of its valuation a startup's round is assumed to raise (INVESTOR_MATCH_ROUND_FRACTION).
+DEFAULT_ROUND_FRACTION = (0.05, 0.25)
+
 
 class InvestorProfile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -7,6 +14,25 @@ class InvestorProfile(models.Model):
     investment_range_max = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     industry_focus = models.CharField(max_length=200, blank=True, default='')
     location = models.CharField(max_length=200, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Dashboard counters, maintained by startups.signals
+    applications_total = models.IntegerField(default=0, editable=False)
+    applications_pending = models.IntegerField(default=0, editable=False)
+    applications_accepted = models.IntegerField(default=0, editable=False)
+
+    def valuation_window(self):
+        """Valuations whose typical round fits this investor's cheque range, as ``(low, high)``.
+
+        ``high`` is ``None`` without a maximum; returns ``None`` when no range is set.
+        """
+        if not self.investment_range_min and not self.investment_range_max:
+            return None
+        fraction = getattr(settings, 'INVESTOR_MATCH_ROUND_FRACTION', DEFAULT_ROUND_FRACTION)
+        low_share, high_share = (Decimal(str(share)) for share in fraction)
+        low = Decimal(self.investment_range_min) / high_share
+        high = Decimal(self.investment_range_max) / low_share if self.investment_range_max else None
+        return low, high
 
     def __str__(self):
         return self.user.username
@@ -24,3 +50,23 @@ class FavoriteStartup(models.Model):
     
     def __str__(self):
         return f"{self.user.username} saved {self.startup.name}"
+
+
+class Recommendation(models.Model):
+    """A startup ranked for an investor by ``investors.matching``; rows are replaced, never edited."""
+    investor = models.ForeignKey(InvestorProfile, on_delete=models.CASCADE, related_name='recommendations')
+    startup = models.ForeignKey('startups.Startup', on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ['investor', 'startup']
+        ordering = ['rank']
+        indexes = [
+            # The dashboard reads an investor's list in rank order.
+            models.Index(fields=['investor', 'rank'], name='recommendation_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.startup_id} for {self.investor_id}"
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from startups.models import Startup
+from .models import FavoriteStartup, InvestorProfile, Recommendation
+from .tasks import refresh_investor_recommendations_task, refresh_startup_recommendations_task
+
+# Startup fields the matching engine scores on.
+MATCHED_STARTUP_FIELDS = {'niche', 'stage', 'valuation', 'approved'}
+
+
+@receiver(post_save, sender=InvestorProfile)
+def refresh_investor(sender, instance, **kwargs):
+    refresh_investor_recommendations_task.delay([instance.pk])
+
+
+@receiver(post_save, sender=FavoriteStartup)
+@receiver(post_delete, sender=FavoriteStartup)
+def refresh_favoriting_investor(sender, instance, **kwargs):
+    investor_id = InvestorProfile.objects.filter(user_id=instance.user_id).values_list('pk', flat=True).first()
+    if investor_id is not None:
+        refresh_investor_recommendations_task.delay([investor_id])
+
+
+def matching_changed(instance):
+    """Whether the save moved a startup in or out of the catalog, or changed what it is scored on."""
+    # Set by startups.signals before the save: the stored values, or None for a new startup.
+    previous = getattr(instance, '_previous_values', None)
+    if not instance.approved and not (previous and previous['approved']):
+        return False
+    if previous is None:
+        return True
+    return any(
+        previous[name] != Startup._meta.get_field(name).to_python(getattr(instance, name))
+        for name in MATCHED_STARTUP_FIELDS
+    )
+
+
+@receiver(post_save, sender=Startup)
+def refresh_startup(sender, instance, **kwargs):
+    if matching_changed(instance):
+        refresh_startup_recommendations_task.delay([instance.pk])
+
+
+@receiver(pre_delete, sender=Startup)
+def refresh_after_startup_delete(sender, instance, **kwargs):
+    # The cascade empties a slot on these lists; refill them.
+    investor_ids = list(Recommendation.objects.filter(startup=instance).values_list('investor_id', flat=True))
+    if investor_ids:
+        refresh_investor_recommendations_task.delay(investor_ids)
@@ -0,0 +1,17 @@
+from jobs.registry import task
+
+
+# investors.matching needs NumPy, which only the worker has to import.
+
+@task(priority=1)
+def refresh_investor_recommendations_task(investor_ids):
+    """Rescore the given investors against every approved startup."""
+    from .matching import refresh_investors
+    refresh_investors(investor_ids)
+
+
+@task(priority=1)
+def refresh_startup_recommendations_task(startup_ids):
+    """Update the recommendation lists a changed startup enters or leaves."""
+    from .matching import refresh_startups
+    refresh_startups(startup_ids)
@@ -1,3 +1,206 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from accounts.models import User
+from jobs.models import Job
+from jobs.worker import Worker
+from startups.models import InvestmentApplication, Startup
+from .matching import refresh_investors
+from .models import FavoriteStartup, InvestorProfile, Recommendation
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        founder = User.objects.create_user(username='founder', role='STARTUP')
+        self.startup = Startup.objects.get(founder=founder)
+        self.startup.name = 'Acme'
+        self.startup.approved = True
+        self.startup.save()
+        self.investor = User.objects.create_user(username='ivy', role='INVESTOR')
+        self.client.force_login(self.investor)
+
+    def revalidate(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('Last-Modified', first)
+        self.assertIn('private', first['Cache-Control'])
+        return first, self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+    def test_unchanged_pages_answer_304(self):
+        FavoriteStartup.objects.create(user=self.investor, startup=self.startup)
+        for url in [reverse('startup_detail_investor', args=[self.startup.pk]),
+                    reverse('browse_startups'), reverse('saved_startups')]:
+            with self.subTest(url):
+                _first, second = self.revalidate(url)
+                self.assertEqual(second.status_code, 304)
+
+    def test_startup_change_invalidates(self):
+        url = reverse('startup_detail_investor', args=[self.startup.pk])
+        first, _second = self.revalidate(url)
+        self.startup.vision = 'Robots for everyone'
+        self.startup.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertContains(response, 'Robots for everyone')
+
+    def test_detail_reads_updated_at_once(self):
+        url = reverse('startup_detail_investor', args=[self.startup.pk])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        version_queries = [query for query in queries
+                           if query['sql'].startswith('SELECT "startups_startup"."updated_at"')]
+        self.assertEqual(len(version_queries), 1)
+
+    def test_favorites_change_browse_etag(self):
+        first, _second = self.revalidate(reverse('browse_startups'))
+        FavoriteStartup.objects.create(user=self.investor, startup=self.startup)
+        response = self.client.get(reverse('browse_startups'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_investment_range_changes_fits_etag(self):
+        url = reverse('browse_startups') + '?fits=1'
+        first, _second = self.revalidate(url)
+        InvestorProfile.objects.filter(user=self.investor).update(investment_range_max=5_000_000)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_is_per_viewer(self):
+        first, _second = self.revalidate(reverse('browse_startups'))
+        self.client.force_login(User.objects.create_user(username='other', role='INVESTOR'))
+        response = self.client.get(reverse('browse_startups'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        self.health = self.make_startup('health', 'HealthTech', 1_000_000)
+        self.fintech = self.make_startup('fintech', 'FinTech', 1_000_000_000)
+        self.health_ai = self.make_startup('healthai', 'HealthTech AI', 100_000_000)
+        self.user = User.objects.create_user(username='ivy', role='INVESTOR')
+        self.investor = InvestorProfile.objects.get(user=self.user)
+        self.investor.industry_focus = 'HealthTech'
+        self.investor.investment_range_min = 50_000
+        self.investor.investment_range_max = 200_000
+        self.investor.save()
+
+    def make_startup(self, username, niche, valuation, approved=True):
+        startup = Startup.objects.get(founder=User.objects.create_user(username=username, role='STARTUP'))
+        startup.name, startup.niche, startup.valuation = username.title(), niche, valuation
+        startup.stage, startup.approved = 'Seed', approved
+        startup.save()
+        return startup
+
+    def ranked(self):
+        return list(Recommendation.objects.filter(investor=self.investor).values_list('startup_id', flat=True))
+
+    def test_ranks_by_focus_and_cheque_size(self):
+        self.assertEqual(refresh_investors(), 1)
+        self.assertEqual(self.ranked(), [self.health.pk, self.health_ai.pk, self.fintech.pk])
+
+    def test_leaves_out_favorites_and_applications(self):
+        FavoriteStartup.objects.create(user=self.user, startup=self.health)
+        InvestmentApplication.objects.create(startup=self.fintech, investor=self.investor,
+                                             amount_requested=1000, equity_offered=1)
+        refresh_investors()
+        self.assertEqual(self.ranked(), [self.health_ai.pk])
+
+    def test_worker_keeps_lists_fresh(self):
+        Worker().run(burst=True)
+        self.assertEqual(self.ranked()[0], self.health.pk)
+        with self.settings(INVESTOR_RECOMMENDATIONS=2):
+            newcomer = self.make_startup('newco', 'HealthTech', 2_000_000)
+            Worker().run(burst=True)
+            self.assertEqual(self.ranked(), [self.health.pk, newcomer.pk])
+            self.health.approved = False
+            self.health.save()
+            Worker().run(burst=True)
+            self.assertEqual(self.ranked(), [newcomer.pk, self.health_ai.pk])
+
+    def test_only_matched_changes_queue_refreshes(self):
+        task = 'investors.tasks.refresh_startup_recommendations_task'
+        Job.objects.all().delete()
+        self.health.vision = 'Better clinics'
+        self.health.save()
+        User.objects.create_user(username='newfounder', role='STARTUP')
+        self.assertFalse(Job.objects.filter(task=task).exists())
+        self.health.valuation = '2000000'
+        self.health.save()
+        self.assertEqual(list(Job.objects.filter(task=task).values_list('args', flat=True)), [[[self.health.pk]]])
+
+    def test_dashboard_shows_recommendations(self):
+        refresh_investors()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('investor_dashboard'))
+        self.assertContains(response, 'Recommended for You')
+        self.assertEqual(response.context['startups'], [self.health, self.health_ai, self.fintech])
+
+
+class ValuationBrowseTests(TestCase):
+    def setUp(self):
+        self.small = self.make_startup('small', 2_000_000)
+        self.mid = self.make_startup('mid', 40_000_000)
+        self.large = self.make_startup('large', 900_000_000)
+        self.investor = User.objects.create_user(username='ivy', role='INVESTOR')
+        self.client.force_login(self.investor)
+
+    def make_startup(self, username, valuation):
+        founder = User.objects.create_user(username=username, role='STARTUP')
+        startup = Startup.objects.get(founder=founder)
+        startup.name = username.title()
+        startup.valuation = valuation
+        startup.approved = True
+        startup.save()
+        return startup
+
+    def browse(self, **params):
+        response = self.client.get(reverse('browse_startups'), params)
+        return [startup.pk for startup in response.context['startups']]
+
+    def test_range_and_sort(self):
+        self.assertEqual(self.browse(sort='valuation_low'), [self.small.pk, self.mid.pk, self.large.pk])
+        self.assertEqual(self.browse(sort='valuation_high', valuation_min='1,000,000', valuation_max='5e7'),
+                         [self.mid.pk, self.small.pk])
+        self.assertEqual(self.browse(valuation_min='nonsense'), [self.large.pk, self.mid.pk, self.small.pk])
+
+    def test_recently_updated_and_pages(self):
+        self.small.save()
+        self.assertEqual(self.browse(sort='updated'), [self.small.pk, self.large.pk, self.mid.pk])
+        extra = [self.make_startup(f'extra{i}', 10_000_000 + i) for i in range(8)]
+        first = self.client.get(reverse('browse_startups'), {'sort': 'valuation_low'}).context['page_obj']
+        self.assertEqual(len(first), 9)
+        rest = self.client.get(reverse('browse_startups') + '?' + first.next_query).context['startups']
+        self.assertEqual([startup.pk for startup in rest], [self.mid.pk, self.large.pk])
+        self.assertEqual(first[0].pk, self.small.pk)
+        self.assertEqual([startup.pk for startup in first][1:], [startup.pk for startup in extra])
+
+    @override_settings(INVESTOR_MATCH_ROUND_FRACTION=(0.1, 0.2))
+    def test_fits_my_check_size(self):
+        profile = InvestorProfile.objects.get(user=self.investor)
+        self.assertEqual(self.browse(fits='1'), [self.large.pk, self.mid.pk, self.small.pk])
+
+        # Rounds of 10-20% of valuation meet cheques of 1M-5M for valuations of 5M-50M.
+        profile.investment_range_min = 1_000_000
+        profile.investment_range_max = 5_000_000
+        profile.save()
+        self.assertEqual(profile.valuation_window(), (Decimal(5_000_000), Decimal(50_000_000)))
+        self.assertEqual(self.browse(fits='1'), [self.mid.pk])
+        self.assertEqual(self.browse(), [self.large.pk, self.mid.pk, self.small.pk])
+
+    @override_settings(INVESTOR_MATCH_ROUND_FRACTION=(0.1, 0.2))
+    def test_facet_counts_follow_the_valuation_filters(self):
+        for startup in (self.small, self.mid, self.large):
+            startup.niche = 'Robotics'
+            startup.save()
+
+        def niche_counts(**params):
+            response = self.client.get(reverse('browse_startups'), params)
+            return [(value['slug'], value['count']) for value in response.context['facets']['niches']]
+
+        self.assertEqual(niche_counts(), [('robotics', 3)])
+        self.assertEqual(niche_counts(valuation_max='50000000'), [('robotics', 2)])
+        InvestorProfile.objects.filter(user=self.investor).update(
+            investment_range_min=1_000_000, investment_range_max=5_000_000)
+        self.assertEqual(niche_counts(fits='1'), [('robotics', 1)])
+        self.assertEqual(niche_counts(fits='1', valuation_min='45000000'), [])
@@ -2,12 +2,20 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
 from django.contrib import messages
-from django.core.paginator import Paginator
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.functional import SimpleLazyObject
+from venturehub.pagination import paginate
+from venturehub.conditional import conditional_page, page_last_modified
+from venturehub.replicas import no_primary_pin, replica_reads
+from startups import facets, listing, page_cache
 from startups.models import InvestmentApplication, Startup
-from .models import InvestorProfile, FavoriteStartup
+from startups.search import search_startups
+from .models import InvestorProfile, FavoriteStartup, Recommendation
 from accounts.models import User
 
 
+@no_primary_pin
 def investor_login(request):
     """Login page for investors."""
     if request.user.is_authenticated:
@@ -69,6 +77,7 @@ def investor_register(request):
     return render(request, 'investors/register.html', {'error': error})
 
 
+@no_primary_pin
 def investor_logout(request):
     """Logout for investors."""
     if request.method == 'POST':
@@ -77,6 +86,7 @@ def investor_logout(request):
 
 
 @login_required(login_url='investor_login')
+@replica_reads
 def investor_dashboard(request):
     """Dashboard for investors."""
     if not request.user.is_investor():
@@ -84,24 +94,33 @@ def investor_dashboard(request):
     
     profile, created = InvestorProfile.objects.get_or_create(user=request.user)
     
-    # Get recent startups
-    startups = Startup.objects.filter(approved=True)[:6]
+    # Precomputed by investors.matching; pairs that became applications or
+    # favorites since the last refresh are dropped here.
+    recommendations = (
+        Recommendation.objects.filter(investor=profile, startup__approved=True)
+        .exclude(startup__in=InvestmentApplication.objects.filter(investor=profile).values('startup'))
+        .exclude(startup__in=FavoriteStartup.objects.filter(user=request.user).values('startup'))
+        .select_related('startup')[:6]
+    )
+    startups = [recommendation.startup for recommendation in recommendations]
+    recommended = bool(startups)
+    if not recommended:
+        # Not computed yet (e.g. a new profile waiting for the worker).
+        startups = Startup.objects.filter(approved=True)[:6]
     total_startups = Startup.objects.filter(approved=True).count()
     
-    # Get investment applications
-    applications = InvestmentApplication.objects.filter(investor=profile).order_by('-created_at')
-    total_applications = applications.count()
-    pending_applications = applications.filter(status='PENDING').count()
-    accepted_applications = applications.filter(status='ACCEPTED').count()
+    # Get investment applications; totals come from the profile counters
+    applications = InvestmentApplication.objects.filter(investor=profile).select_related('startup').order_by('-created_at')
     
     return render(request, 'investors/dashboard.html', {
         'profile': profile,
         'startups': startups,
+        'recommended': recommended,
         'applications': applications[:5],
         'total_startups': total_startups,
-        'total_applications': total_applications,
-        'pending_applications': pending_applications,
-        'accepted_applications': accepted_applications,
+        'total_applications': profile.applications_total,
+        'pending_applications': profile.applications_pending,
+        'accepted_applications': profile.applications_accepted,
     })
 
 
@@ -126,33 +145,78 @@ def investor_profile(request):
     return render(request, 'investors/profile.html', {'profile': profile})
 
 
+def latest(*values):
+    return max((value for value in values if value is not None), default=None)
+
+
+def favorites_state(user):
+    return FavoriteStartup.objects.filter(user=user).aggregate(
+        count=Count('pk'), last=Max('pk'), added=Max('created_at'), updated=Max('startup__updated_at'),
+    )
+
+
+def browse_state(request):
+    """Validators for the browse page: the approved startups, the viewer's favorites and,
+    for "fits my check size", the viewer's investment range."""
+    startups = Startup.objects.filter(approved=True).aggregate(count=Count('pk'), updated=Max('updated_at'))
+    favorites = favorites_state(request.user)
+    profile = None
+    if request.GET.get('fits'):
+        profile = InvestorProfile.objects.filter(user=request.user).values(
+            'investment_range_min', 'investment_range_max', 'updated_at').first()
+    return (('browse', startups, favorites, profile),
+            latest(startups['updated'], favorites['added'], profile and profile['updated_at']))
+
+
+def startup_detail_state(request, startup_id):
+    updated_at = (
+        Startup.objects.filter(id=startup_id, approved=True).values_list('updated_at', flat=True).first()
+    )
+    if updated_at is None:
+        return None, None
+    return ('startup', startup_id, updated_at), updated_at
+
+
+def saved_state(request):
+    favorites = favorites_state(request.user)
+    return ('saved', favorites), latest(favorites['added'], favorites['updated'])
+
+
 @login_required(login_url='investor_login')
+@replica_reads
+@conditional_page(browse_state)
 def browse_startups(request):
     """Browse all approved startups."""
     if not request.user.is_investor():
         return redirect('home')
     
-    startups = Startup.objects.filter(approved=True)
+    startups = Startup.objects.filter(approved=True).order_by('-id')
     
-    # Search
-    search = request.GET.get('search')
-    if search:
-        startups = startups.filter(name__icontains=search)
-    
-    # Filter by niche
-    niche = request.GET.get('niche')
-    if niche:
-        startups = startups.filter(niche__icontains=niche)
+    # Search and filter by niche/stage through the full-text index
+    startups = search_startups(
+        startups,
+        search=request.GET.get('search', ''),
+        niche=request.GET.get('niche', ''),
+        stage=request.GET.get('stage', ''),
+    )
+    startups = facets.filter_by_facets(startups, request.GET.get('niche_tag', ''), request.GET.get('stage_tag', ''))
+    valuation_ranges = [listing.valuation_range(request)]
     
-    # Filter by stage
-    stage = request.GET.get('stage')
-    if stage:
-        startups = startups.filter(stage__icontains=stage)
+    # "Fits my check size": valuations whose typical round meets the stored range
+    fits = bool(request.GET.get('fits'))
+    window = None
+    if fits:
+        profile = InvestorProfile.objects.filter(user=request.user).first()
+        window = profile and profile.valuation_window()
+        if window:
+            valuation_ranges.append(window)
+    for low, high in valuation_ranges:
+        startups = listing.filter_by_valuation(startups, low, high)
+    sort = request.GET.get('sort', '')
+    startups = listing.sort_startups(startups, sort)
     
-    # Pagination
-    paginator = Paginator(startups, 9)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination on the chosen order (search rank or newest first by default) and id
+    page_obj = paginate(request, startups, 9)
     
     # Get user's favorite startup IDs
     favorite_ids = FavoriteStartup.objects.filter(user=request.user).values_list('startup_id', flat=True)
@@ -161,28 +225,43 @@ def browse_startups(request):
         'startups': page_obj,
         'page_obj': page_obj,
         'favorite_ids': list(favorite_ids),
+        'facets': facets.browse_facets(request, valuation_ranges),
+        'sort': sort,
+        'sort_choices': listing.SORT_CHOICES,
+        'fits': fits,
+        'fits_unavailable': fits and not window,
     })
 
 
 @login_required(login_url='investor_login')
+@replica_reads
+@conditional_page(startup_detail_state)
 def startup_detail_investor(request, startup_id):
     """View startup details for investors."""
     if not request.user.is_investor():
         return redirect('home')
     
-    startup = get_object_or_404(Startup, id=startup_id, approved=True)
+    # The fragment is cached per updated_at (already read by startup_detail_state);
+    # the full row is only queried to render it
+    version = page_last_modified(request) or page_cache.startup_version(startup_id)
+    if version is None:
+        raise Http404('No approved startup with that id.')
+    startup = SimpleLazyObject(lambda: get_object_or_404(Startup, id=startup_id, approved=True))
     
-    return render(request, 'investors/startup_detail.html', {'startup': startup})
+    return render(request, 'investors/startup_detail.html', {
+        'startup': startup, 'startup_id': startup_id, 'startup_version': version,
+    })
 
 
 @login_required(login_url='investor_login')
+@replica_reads
 def investor_applications(request):
     if not request.user.is_investor():
         return redirect('home')
 
     applications = InvestmentApplication.objects.filter(
         investor__user=request.user
-    ).order_by('-created_at')
+    ).select_related('startup').order_by('-created_at')
 
     return render(request, 'investors/applications.html', {'applications': applications})
 
@@ -193,7 +272,7 @@ def update_application_status(request, application_id, status):
         return redirect('home')
 
     application = get_object_or_404(
-        InvestmentApplication,
+        InvestmentApplication.objects.select_related('startup'),
         id=application_id,
         investor__user=request.user
     )
@@ -236,6 +315,8 @@ def toggle_favorite(request, startup_id):
 
 
 @login_required(login_url='investor_login')
+@replica_reads
+@conditional_page(saved_state)
 def saved_startups(request):
     """View saved/favorite startups."""
     if not request.user.is_investor():
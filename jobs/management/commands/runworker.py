@@ -0,0 +1,27 @@
+import signal
+
+from django.core.management.base import BaseCommand
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run a background worker that processes queued jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once the queue is empty instead of polling.')
+        parser.add_argument('--max-jobs', type=int, default=None,
+                            help='Exit after processing this many jobs.')
+        parser.add_argument('--sleep', type=float, default=None,
+                            help='Seconds to wait between polls of an empty queue.')
+        parser.add_argument('--visibility-timeout', type=int, default=None,
+                            help='Seconds a claimed job stays locked before other workers may retry it.')
+
+    def handle(self, *args, **options):
+        worker = Worker(poll_interval=options['sleep'], visibility_timeout=options['visibility_timeout'])
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+
+        self.stdout.write(f'Worker {worker.worker_id} started.')
+        processed = worker.run(burst=options['burst'], max_jobs=options['max_jobs'])
+        self.stdout.write(self.style.SUCCESS(f'Worker stopped after {processed} jobs.'))
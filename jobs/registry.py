@@ -0,0 +1,107 @@
+"""Task registration and enqueueing.
+
+Decorate a function in an app's ``tasks.py`` with ``@task`` and call
+``.delay()`` on it from a view to run it in the worker instead of the
+request::
+
+    @task(priority=5)
+    def delete_user(user_id):
+        ...
+
+    delete_user.delay(user.id)
+
+Passing ``unique_key`` to ``enqueue`` skips the job while another with that
+key is queued or running; periodic runs use the task name, so two workers
+starting together, or a run re-claimed after its visibility timeout that
+finishes twice, still leave a single run in the chain.
+
+Arguments are stored as JSON, so pass ids and plain values, not model
+instances. Calling the function directly still runs it inline.
+
+A task declared with ``every`` (seconds) runs on a schedule: the worker
+queues it on start-up if no run is pending, and every finished (or finally
+failed or abandoned) run queues the next one ``every`` seconds later::
+
+    @task(every=3600)
+    def refresh_matches():
+        ...
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import Job
+
+registry = {}
+
+
+class Task:
+    def __init__(self, func, name, priority, max_attempts, backoff, every=None):
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.every = every
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        """Queue the task with its default options."""
+        return self.enqueue(args=args, kwargs=kwargs)
+
+    def enqueue(self, args=(), kwargs=None, priority=None, countdown=0, unique_key=None):
+        """Queue the task, optionally overriding priority or delaying it ``countdown`` seconds.
+
+        Returns ``None`` instead if a job with ``unique_key`` is already queued or running.
+        """
+        job = Job(
+            task=self.name,
+            args=list(args),
+            kwargs=kwargs or {},
+            priority=self.priority if priority is None else priority,
+            max_attempts=self.max_attempts,
+            run_at=timezone.now() + timedelta(seconds=countdown),
+            unique_key=unique_key,
+        )
+        if unique_key is None:
+            job.save()
+            return job
+        try:
+            with transaction.atomic():
+                job.save()
+        except IntegrityError:
+            return None
+        return job
+
+    def schedule(self, args=(), kwargs=None, countdown=0):
+        """Queue the next run of a periodic task unless one is already pending."""
+        return self.enqueue(args=args, kwargs=kwargs, countdown=countdown, unique_key=self.name)
+
+    def retry_delay(self, attempts):
+        """Exponential backoff: ``backoff``, then twice that, and so on."""
+        return timedelta(seconds=self.backoff * 2 ** (attempts - 1))
+
+
+def task(func=None, *, name=None, priority=0, max_attempts=3, backoff=10, every=None):
+    """Register ``func`` as a background task, run every ``every`` seconds if given."""
+    def register(func):
+        task_name = name or f'{func.__module__}.{func.__qualname__}'
+        registry[task_name] = Task(func, task_name, priority, max_attempts, backoff, every)
+        return registry[task_name]
+
+    if func is not None:
+        return register(func)
+    return register
+
+
+def get_task(name):
+    return registry[name]
+
+
+def schedule_periodic():
+    """Queue every periodic task that has no pending run; returns the tasks queued."""
+    return [periodic for periodic in registry.values()
+            if periodic.every is not None and periodic.schedule() is not None]
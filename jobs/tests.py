@@ -0,0 +1,110 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+from .models import Job
+from .registry import schedule_periodic, task
+from .worker import Worker, claim_next, fail_abandoned, run_job
+
+calls = []
+
+
+@task(name='jobs.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task(name='jobs.tests.explode', max_attempts=2, backoff=30)
+def explode():
+    raise RuntimeError('boom')
+
+
+@task(name='jobs.tests.tick', every=600)
+def tick():
+    calls.append('tick')
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_and_run(self):
+        record.delay('a')
+        self.assertEqual(calls, [])
+        self.assertEqual(Worker().run(burst=True), 1)
+        self.assertEqual(calls, ['a'])
+        self.assertEqual(Job.objects.get().status, 'DONE')
+
+    def test_priority_order(self):
+        record.enqueue(args=['low'])
+        record.enqueue(args=['high'], priority=10)
+        Worker().run(burst=True)
+        self.assertEqual(calls, ['high', 'low'])
+
+    def test_countdown_defers_job(self):
+        record.enqueue(args=['later'], countdown=60)
+        self.assertEqual(Worker().run(burst=True), 0)
+
+    def test_retry_with_backoff_then_fail(self):
+        explode.delay()
+        Worker().run(burst=True)
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), ('QUEUED', 1))
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=25))
+        self.assertIn('RuntimeError: boom', job.last_error)
+
+        Job.objects.update(run_at=timezone.now())
+        Worker().run(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('FAILED', 2))
+
+    def test_visibility_timeout(self):
+        record.delay('x')
+        self.assertIsNotNone(claim_next('dead-worker', visibility_timeout=300))
+        self.assertIsNone(claim_next('other', visibility_timeout=300))
+
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        job = claim_next('other', visibility_timeout=300)
+        self.assertEqual((job.locked_by, job.attempts), ('other', 2))
+
+    def test_unknown_task_fails(self):
+        Job.objects.create(task='jobs.tests.missing')
+        Worker().run(burst=True)
+        self.assertEqual(Job.objects.get().status, 'FAILED')
+
+    def test_periodic_task_reschedules_itself(self):
+        self.assertIn(tick, schedule_periodic())
+        self.assertNotIn(tick, schedule_periodic())
+        Worker().run(burst=True)
+        self.assertEqual(calls, ['tick'])
+        upcoming = Job.objects.get(task=tick.name, status='QUEUED')
+        self.assertGreater(upcoming.run_at, timezone.now() + timedelta(seconds=590))
+
+    def test_duplicate_periodic_runs_keep_one_chain(self):
+        schedule_periodic()
+        Job.objects.exclude(task=tick.name).delete()
+        job = claim_next('slow-worker', visibility_timeout=300)
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        duplicate = claim_next('other', visibility_timeout=300)
+        self.assertEqual(duplicate.pk, job.pk)
+        run_job(duplicate)
+        run_job(job)
+        self.assertEqual(Job.objects.filter(task=tick.name, status='QUEUED').count(), 1)
+
+    def test_abandoned_periodic_run_is_rescheduled(self):
+        schedule_periodic()
+        Job.objects.filter(task=tick.name).update(status='RUNNING', attempts=F('max_attempts'),
+                                                  locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(fail_abandoned(timezone.now()), 1)
+        self.assertEqual(Job.objects.filter(task=tick.name, status='QUEUED').count(), 1)
+
+    def test_finishing_and_rescheduling_commit_together(self):
+        schedule_periodic()
+        Job.objects.exclude(task=tick.name).delete()
+        job = claim_next('worker', visibility_timeout=300)
+        with mock.patch.object(type(tick), 'schedule', side_effect=RuntimeError('worker died')):
+            with self.assertRaises(RuntimeError):
+                run_job(job)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, 'RUNNING')
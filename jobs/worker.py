@@ -0,0 +1,147 @@
+"""Claiming and running queued jobs.
+
+SQLite has no ``SELECT ... FOR UPDATE SKIP LOCKED``, so a worker claims a
+job with a conditional UPDATE that only succeeds while the job is still
+claimable; if two workers race for the same row, one of them updates zero
+rows and moves on. A claimed job is locked for the visibility timeout; if
+the worker dies, the lock expires and another worker picks the job up.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Job
+from .registry import get_task, schedule_periodic
+
+logger = logging.getLogger(__name__)
+
+
+def claimable(now):
+    """Queued jobs that are due, plus running jobs whose lock has expired."""
+    return (
+        Q(status='QUEUED', run_at__lte=now)
+        | Q(status='RUNNING', locked_until__lt=now, attempts__lt=F('max_attempts'))
+    )
+
+
+def fail_abandoned(now):
+    """Give up on jobs whose worker died on every allowed attempt; returns how many."""
+    abandoned = Job.objects.filter(status='RUNNING', locked_until__lt=now, attempts__gte=F('max_attempts'))
+    failed = 0
+    for job in abandoned.only('pk', 'task', 'args', 'kwargs'):
+        # Conditional, so of two workers racing here only one fails the job.
+        if abandoned.filter(pk=job.pk).update(status='FAILED', finished_at=now,
+                                               last_error='Visibility timeout expired.'):
+            failed += 1
+            try:
+                schedule_next(get_task(job.task), job)
+            except KeyError:
+                pass
+    return failed
+
+
+def claim_next(worker_id, visibility_timeout):
+    """Lock and return the highest-priority due job, or ``None``."""
+    now = timezone.now()
+    fail_abandoned(now)
+    candidates = (
+        Job.objects.filter(claimable(now))
+        .order_by('-priority', 'run_at', 'pk')
+        .values_list('pk', flat=True)[:10]
+    )
+    for pk in candidates:
+        claimed = Job.objects.filter(claimable(now), pk=pk).update(
+            status='RUNNING',
+            attempts=F('attempts') + 1,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Run a claimed job and record success, a retry or the final failure."""
+    try:
+        task = get_task(job.task)
+    except KeyError:
+        job.status = 'FAILED'
+        job.last_error = f'Unknown task {job.task!r}.'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'last_error', 'finished_at'])
+        return False
+
+    try:
+        task(*job.args, **job.kwargs)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = 'QUEUED'
+            job.run_at = timezone.now() + task.retry_delay(job.attempts)
+            logger.warning('Job %s (%s) failed, retrying at %s', job.pk, job.task, job.run_at)
+        else:
+            job.status = 'FAILED'
+            job.finished_at = timezone.now()
+            logger.error('Job %s (%s) failed permanently', job.pk, job.task)
+        job.locked_until = None
+        # Finishing a periodic job and queueing its next run commit together,
+        # so a worker dying in between cannot end the chain.
+        with transaction.atomic():
+            job.save(update_fields=['status', 'run_at', 'locked_until', 'last_error', 'finished_at'])
+            if job.status == 'FAILED':
+                schedule_next(task, job)
+        return False
+
+    job.status = 'DONE'
+    job.locked_until = None
+    job.finished_at = timezone.now()
+    with transaction.atomic():
+        job.save(update_fields=['status', 'locked_until', 'finished_at'])
+        schedule_next(task, job)
+    return True
+
+
+def schedule_next(task, job):
+    """Queue the next run of a periodic task once this one is over."""
+    if task.every is not None:
+        task.schedule(args=job.args, kwargs=job.kwargs, countdown=task.every)
+
+
+class Worker:
+    def __init__(self, poll_interval=None, visibility_timeout=None):
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.poll_interval = poll_interval or getattr(settings, 'JOBS_POLL_INTERVAL', 1)
+        self.visibility_timeout = visibility_timeout or getattr(settings, 'JOBS_VISIBILITY_TIMEOUT', 300)
+        self.stopping = False
+
+    def stop(self, *args):
+        """Finish the current job, then exit."""
+        self.stopping = True
+
+    def run(self, burst=False, max_jobs=None):
+        """Process jobs until stopped. With ``burst``, exit once the queue is empty.
+
+        Returns the number of jobs processed.
+        """
+        processed = 0
+        if not burst:
+            schedule_periodic()
+        while not self.stopping and (max_jobs is None or processed < max_jobs):
+            close_old_connections()
+            job = claim_next(self.worker_id, self.visibility_timeout)
+            if job is None:
+                if burst:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            run_job(job)
+            processed += 1
+        return processed
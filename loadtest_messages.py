@@ -0,0 +1,130 @@
+"""Concurrent-connection load test for the messaging long-poll endpoint.
+
+Logs in once, then opens ``--concurrency`` simultaneous long-poll requests
+against ``/accounts/messages/poll/`` and reports how many were answered,
+how long they took and the peak number of requests in flight at once.
+
+Every poll holds its connection for up to ``MESSAGE_POLL_TIMEOUT`` seconds.
+Under WSGI each one pins a worker thread, so capacity is roughly
+workers x threads; under ASGI the waits are coroutines and capacity is
+bounded by file descriptors instead. Compare the two deployments with:
+
+    # ASGI
+    uvicorn venturehub.asgi:application --port 8000
+    # WSGI (e.g. 4 workers x 8 threads)
+    gunicorn venturehub.wsgi:application --workers 4 --threads 8 --bind 127.0.0.1:8000
+
+    python loadtest_messages.py --username alice --password secret --concurrency 500
+
+Only the standard library is used, so the script runs without the server's
+dependencies installed.
+"""
+import argparse
+import asyncio
+import http.cookiejar
+import json
+import statistics
+import time
+import urllib.parse
+import urllib.request
+
+
+def login(base_url, username, password):
+    """Log in through the Django auth form and return the session cookie header."""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    login_url = f'{base_url}/accounts/login/'
+    opener.open(login_url).read()
+    csrftoken = next(c.value for c in jar if c.name == 'csrftoken')
+    data = urllib.parse.urlencode({
+        'username': username,
+        'password': password,
+        'csrfmiddlewaretoken': csrftoken,
+    }).encode()
+    request = urllib.request.Request(login_url, data=data, headers={'Referer': login_url})
+    opener.open(request).read()
+    cookies = {c.name: c.value for c in jar}
+    if 'sessionid' not in cookies:
+        raise SystemExit('Login failed: check the username and password.')
+    return '; '.join(f'{name}={value}' for name, value in cookies.items())
+
+
+def latest_message_id(base_url, cookie):
+    request = urllib.request.Request(f'{base_url}/accounts/messages/poll/', headers={'Cookie': cookie})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)['last_id']
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+
+async def poll_once(host, port, path, cookie, stats, timeout):
+    """Issue one HTTP/1.1 GET and wait for the full response."""
+    started = time.perf_counter()
+    sent = False
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        writer.write(
+            f'GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nCookie: {cookie}\r\n'
+            f'Connection: close\r\n\r\n'.encode()
+        )
+        await writer.drain()
+        sent = True
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        response = await asyncio.wait_for(reader.read(), timeout)
+        writer.close()
+        if not response.startswith(b'HTTP/1.1 200'):
+            raise ValueError(response.split(b'\r\n', 1)[0])
+        stats.latencies.append(time.perf_counter() - started)
+    except Exception:
+        stats.errors += 1
+    finally:
+        if sent:
+            stats.in_flight -= 1
+
+
+async def run(args, cookie, since):
+    url = urllib.parse.urlsplit(args.url)
+    path = f'/accounts/messages/poll/?since={since}'
+    stats = Stats()
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        poll_once(url.hostname, url.port or 80, path, cookie, stats, args.timeout)
+        for _ in range(args.concurrency)
+    ])
+    return stats, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--timeout', type=float, default=120,
+                        help='Client-side timeout per request, in seconds.')
+    args = parser.parse_args()
+
+    cookie = login(args.url, args.username, args.password)
+    since = latest_message_id(args.url, cookie)
+    stats, elapsed = asyncio.run(run(args, cookie, since))
+
+    print(f'Requests:       {args.concurrency}')
+    print(f'Answered:       {len(stats.latencies)}')
+    print(f'Errors:         {stats.errors}')
+    print(f'Wall time:      {elapsed:.1f}s')
+    print(f'Peak in flight: {stats.peak_in_flight}')
+    if stats.latencies:
+        latencies = sorted(stats.latencies)
+        print(f'Latency p50:    {statistics.median(latencies):.2f}s')
+        print(f'Latency max:    {latencies[-1]:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
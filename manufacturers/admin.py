@@ -5,6 +5,7 @@ from .models import ManufacturerProfile, ConnectionRequest
 @admin.register(ManufacturerProfile)
 class ManufacturerProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'company_name', 'industry', 'location', 'production_capacity')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'company_name', 'industry', 'location')
     list_filter = ('industry',)
 
@@ -12,5 +13,6 @@ class ManufacturerProfileAdmin(admin.ModelAdmin):
 @admin.register(ConnectionRequest)
 class ConnectionRequestAdmin(admin.ModelAdmin):
     list_display = ('manufacturer', 'startup', 'status', 'created_at')
+    list_select_related = ('manufacturer__user', 'startup')
     list_filter = ('status', 'created_at')
     search_fields = ('manufacturer__user__username', 'startup__name')
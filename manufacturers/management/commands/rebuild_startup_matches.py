@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from manufacturers.matching import CHUNK_SIZE, rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute every manufacturer's ranked list of matching startups."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Number of manufacturers scored per batch.')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+        started = time.monotonic()
+        total = rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Ranked startups for {total} manufacturers in {time.monotonic() - started:.1f}s.'
+        ))
@@ -0,0 +1,107 @@
+"""Manufacturer–startup matching.
+
+Every manufacturer is scored against every approved startup with NumPy, a
+batch of manufacturers at a time, as a weighted sum
+(``MANUFACTURER_MATCH_WEIGHTS``) of:
+
+* ``industry``: token overlap between the manufacturer's ``industry`` and
+  the startup niche;
+* ``capacity``: how ``production_capacity`` meets the volume a startup of
+  that valuation is expected to order (``MANUFACTURER_MATCH_VOLUME_PER_VALUATION``),
+  compared in orders of magnitude.
+
+Startups the manufacturer already sent a connection request to are left
+out. The best ``MANUFACTURER_MATCHES`` per manufacturer are stored in rank
+order in ``StartupMatch``, so the dashboard and the "best matches" sort of
+``startup_list`` read a page of an index instead of scoring anything.
+
+The lists are rebuilt by the periodic ``refresh_startup_matches_task``
+(every ``MANUFACTURER_MATCH_INTERVAL`` seconds) or
+``manage.py rebuild_startup_matches``.
+"""
+import numpy as np
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from startups.models import Startup
+from venturehub.matching import Vocabulary, jaccard, log_range_fit, tokens, top_k
+from .models import ConnectionRequest, ManufacturerProfile, StartupMatch
+
+DEFAULT_WEIGHTS = {'industry': 0.6, 'capacity': 0.4}
+DEFAULT_VOLUME_PER_VALUATION = (1e-5, 1e-3)
+DEFAULT_MATCHES = 100
+CHUNK_SIZE = 500
+
+
+def expected_volumes(valuations):
+    """Smallest and largest production run a startup at each valuation is expected to need."""
+    low, high = getattr(settings, 'MANUFACTURER_MATCH_VOLUME_PER_VALUATION', DEFAULT_VOLUME_PER_VALUATION)
+    valuations = np.asarray(valuations, dtype=np.float64)
+    return valuations * low, valuations * high
+
+
+class Catalog:
+    """Approved startups as matrices."""
+
+    def __init__(self):
+        rows = list(Startup.objects.filter(approved=True).order_by('pk').values_list('pk', 'niche', 'valuation'))
+        self.ids = [pk for pk, _niche, _valuation in rows]
+        self.index = {pk: column for column, pk in enumerate(self.ids)}
+        niches = [tokens(niche) for _pk, niche, _valuation in rows]
+        self.vocabulary = Vocabulary(niches)
+        self.niches, self.niche_sizes = self.vocabulary.matrix(niches)
+        self.volume_low, self.volume_high = expected_volumes([valuation for *_, valuation in rows])
+
+
+def score(manufacturers, catalog):
+    """``len(manufacturers) x len(catalog)`` scores; ``-inf`` for startups already requested.
+
+    ``manufacturers`` are ``(pk, industry, production_capacity)`` rows.
+    """
+    weights = getattr(settings, 'MANUFACTURER_MATCH_WEIGHTS', DEFAULT_WEIGHTS)
+    industries, sizes = catalog.vocabulary.matrix(tokens(row[1]) for row in manufacturers)
+    industry = jaccard(industries, sizes, catalog.niches, catalog.niche_sizes)
+    capacities = [row[2] for row in manufacturers]
+    capacity = log_range_fit(capacities, capacities, catalog.volume_low, catalog.volume_high)
+    scores = weights['industry'] * industry + weights['capacity'] * capacity
+
+    rows = {pk: row for row, (pk, *_) in enumerate(manufacturers)}
+    requested = ConnectionRequest.objects.filter(manufacturer_id__in=rows).values_list('manufacturer_id', 'startup_id')
+    for manufacturer_id, startup_id in requested:
+        if startup_id in catalog.index:
+            scores[rows[manufacturer_id], catalog.index[startup_id]] = -np.inf
+    return scores
+
+
+def batches(size):
+    rows = ManufacturerProfile.objects.order_by('pk').values_list('pk', 'industry', 'production_capacity')
+    batch = []
+    for row in rows.iterator(chunk_size=size):
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def rebuild(chunk_size=CHUNK_SIZE):
+    """Recompute every manufacturer's ranked list; returns the number of manufacturers."""
+    catalog = Catalog()
+    k = getattr(settings, 'MANUFACTURER_MATCHES', DEFAULT_MATCHES)
+    total = 0
+    for manufacturers in batches(chunk_size):
+        scores = score(manufacturers, catalog)
+        now = timezone.now()
+        matches = [
+            StartupMatch(manufacturer_id=manufacturer[0], startup_id=catalog.ids[column], rank=rank,
+                         score=float(scores[row, column]), computed_at=now)
+            for row, (manufacturer, columns) in enumerate(zip(manufacturers, top_k(scores, k)))
+            for rank, column in enumerate(columns, 1)
+        ]
+        with transaction.atomic():
+            StartupMatch.objects.filter(manufacturer_id__in=[row[0] for row in manufacturers]).delete()
+            StartupMatch.objects.bulk_create(matches)
+        total += len(manufacturers)
+    return total
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturers', '0003_alter_manufacturerprofile_industry_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='manufacturerprofile',
+            name='connections_accepted',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='manufacturerprofile',
+            name='connections_pending',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='manufacturerprofile',
+            name='connections_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
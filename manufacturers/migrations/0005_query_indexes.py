@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturers', '0004_dashboard_counters'),
+        ('startups', '0006_dashboard_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['manufacturer', '-created_at'], name='conn_manufacturer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['manufacturer', 'status', '-created_at'], name='conn_manufacturer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['startup', '-created_at'], name='conn_startup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['startup', 'status', '-created_at'], name='conn_startup_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['status', '-created_at'], name='conn_status_created_idx'),
+        ),
+    ]
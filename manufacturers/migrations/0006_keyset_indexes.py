@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturers', '0005_query_indexes'),
+        ('startups', '0007_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='connectionrequest',
+            name='conn_manufacturer_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='connectionrequest',
+            name='conn_manufacturer_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='connectionrequest',
+            name='conn_startup_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='connectionrequest',
+            name='conn_startup_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='connectionrequest',
+            name='conn_status_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['manufacturer', '-created_at', '-id'], name='conn_manufacturer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['manufacturer', 'status', '-created_at', '-id'], name='conn_manufacturer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['startup', '-created_at', '-id'], name='conn_startup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['startup', 'status', '-created_at', '-id'], name='conn_startup_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='conn_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:51
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturers', '0006_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='manufacturerprofile',
+            index=models.Index(django.db.models.functions.text.Lower('company_name'), name='manufacturer_company_lower_idx'),
+        ),
+    ]
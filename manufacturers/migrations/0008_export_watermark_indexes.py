@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturers', '0007_admin_listing_indexes'),
+        ('startups', '0009_admin_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['created_at', 'id'], name='conn_created_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:39
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturers', '0009_manufacturerprofile_updated_at'),
+        ('startups', '0013_pitch_deck_preview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StartupMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('manufacturer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='startup_matches', to='manufacturers.manufacturerprofile')),
+                ('startup', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='startups.startup')),
+            ],
+            options={
+                'ordering': ['rank'],
+                'indexes': [models.Index(fields=['manufacturer', 'rank'], name='match_manufacturer_rank_idx')],
+                'unique_together': {('manufacturer', 'startup')},
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.conf import settings
 from django.utils import timezone
 
@@ -11,6 +12,18 @@ class ManufacturerProfile(models.Model):
     location = models.CharField(max_length=200, blank=True, default='')
     email = models.EmailField(blank=True)
     phone = models.CharField(max_length=20, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Dashboard counters, maintained by startups.signals
+    connections_total = models.IntegerField(default=0, editable=False)
+    connections_pending = models.IntegerField(default=0, editable=False)
+    connections_accepted = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Case-insensitive prefix search on the admin connection listing.
+            models.Index(Lower('company_name'), name='manufacturer_company_lower_idx'),
+        ]
 
     def __str__(self):
         return self.user.username
@@ -31,7 +44,48 @@ class ConnectionRequest(models.Model):
     
     class Meta:
         unique_together = ('manufacturer', 'startup')
+        indexes = [
+            models.Index(fields=['manufacturer', '-created_at', '-id'], name='conn_manufacturer_created_idx'),
+            models.Index(fields=['manufacturer', 'status', '-created_at', '-id'], name='conn_manufacturer_status_idx'),
+            models.Index(fields=['startup', '-created_at', '-id'], name='conn_startup_created_idx'),
+            models.Index(fields=['startup', 'status', '-created_at', '-id'], name='conn_startup_status_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='conn_status_created_idx'),
+            # Watermark order for incremental exports.
+            models.Index(fields=['created_at', 'id'], name='conn_created_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so the counter signals can diff it.
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Keep the row and its dashboard counters in one transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
     
     def __str__(self):
         return f"{self.manufacturer.user.username} -> {self.startup.name}"
 
+
+
+class StartupMatch(models.Model):
+    """A startup ranked for a manufacturer by ``manufacturers.matching``; rebuilt on a schedule."""
+    manufacturer = models.ForeignKey(ManufacturerProfile, on_delete=models.CASCADE, related_name='startup_matches')
+    startup = models.ForeignKey('startups.Startup', on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveIntegerField()
+    score = models.FloatField()
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('manufacturer', 'startup')
+        ordering = ['rank']
+        indexes = [
+            # "Best matches" pages walk a manufacturer's list in rank order.
+            models.Index(fields=['manufacturer', 'rank'], name='match_manufacturer_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.startup_id} for {self.manufacturer_id}"
@@ -0,0 +1,10 @@
+from django.conf import settings
+from jobs.registry import task
+
+
+@task(every=getattr(settings, 'MANUFACTURER_MATCH_INTERVAL', 3600))
+def refresh_startup_matches_task():
+    """Rebuild every manufacturer's ranked startup list."""
+    # Imported here: NumPy is only needed in the worker.
+    from .matching import rebuild
+    rebuild()
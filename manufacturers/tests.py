@@ -1,3 +1,57 @@
 from django.test import TestCase
+from django.urls import reverse
+from accounts.models import User
+from startups.models import Startup
+from .matching import rebuild
+from .models import ConnectionRequest, ManufacturerProfile, StartupMatch
 
-# Create your tests here.
+
+class StartupMatchTests(TestCase):
+    def setUp(self):
+        self.textiles = self.make_startup('weave', 'Smart Textiles', 50_000_000)
+        self.fabric = self.make_startup('fabric', 'Textiles', 500_000_000_000)
+        self.fintech = self.make_startup('ledger', 'FinTech', 50_000_000)
+        self.user = User.objects.create_user(username='mill', role='MANUFACTURER')
+        self.manufacturer = ManufacturerProfile.objects.get(user=self.user)
+        self.manufacturer.industry = 'Textiles'
+        self.manufacturer.production_capacity = 5_000
+        self.manufacturer.save()
+
+    def make_startup(self, username, niche, valuation):
+        startup = Startup.objects.get(founder=User.objects.create_user(username=username, role='STARTUP'))
+        startup.name, startup.niche, startup.valuation = username.title(), niche, valuation
+        startup.stage, startup.approved = 'Seed', True
+        startup.save()
+        return startup
+
+    def ranked(self):
+        return list(StartupMatch.objects.filter(manufacturer=self.manufacturer).values_list('startup_id', flat=True))
+
+    def test_ranks_by_industry_and_capacity(self):
+        self.assertEqual(rebuild(), 1)
+        self.assertEqual(self.ranked(), [self.textiles.pk, self.fabric.pk, self.fintech.pk])
+
+    def test_skips_requested_startups(self):
+        ConnectionRequest.objects.create(manufacturer=self.manufacturer, startup=self.fabric)
+        rebuild()
+        self.assertEqual(self.ranked(), [self.textiles.pk, self.fintech.pk])
+
+    def test_best_matches_sort(self):
+        rebuild()
+        # Requested after the ranking was computed: hidden at read time.
+        ConnectionRequest.objects.create(manufacturer=self.manufacturer, startup=self.textiles)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('startup_list'), {'sort': 'best'})
+        self.assertEqual(response.context['startups'], [self.fabric, self.fintech])
+        response = self.client.get(reverse('startup_list'), {'sort': 'best', 'niche': 'fin'})
+        self.assertEqual(response.context['startups'], [self.fintech])
+        response = self.client.get(reverse('manufacturer_dashboard'))
+        self.assertContains(response, 'Best Matches for You')
+
+    def test_valuation_filter_and_sort(self):
+        rebuild()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('startup_list'), {'sort': 'valuation_high', 'valuation_min': 40_000_000})
+        self.assertEqual(list(response.context['startups']), [self.fabric, self.fintech, self.textiles])
+        response = self.client.get(reverse('startup_list'), {'sort': 'best', 'valuation_max': 10**9})
+        self.assertEqual(response.context['startups'], [self.textiles, self.fintech])
@@ -2,12 +2,18 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
 from django.contrib import messages
-from django.core.paginator import Paginator
+from django.http import Http404
+from django.utils.functional import SimpleLazyObject
+from venturehub.pagination import paginate
+from venturehub.replicas import no_primary_pin, replica_reads
+from startups import facets, listing, page_cache
 from startups.models import Startup
-from .models import ManufacturerProfile, ConnectionRequest
+from startups.search import matching_startup_ids, search_startups
+from .models import ManufacturerProfile, ConnectionRequest, StartupMatch
 from accounts.models import User
 
 
+@no_primary_pin
 def manufacturer_login(request):
     """Login page for manufacturers."""
     if request.user.is_authenticated:
@@ -78,6 +84,7 @@ def manufacturer_register(request):
     return render(request, 'manufacturers/register.html', {'error': error})
 
 
+@no_primary_pin
 def manufacturer_logout(request):
     """Logout for manufacturers."""
     if request.method == 'POST':
@@ -86,30 +93,37 @@ def manufacturer_logout(request):
 
 
 @login_required(login_url='manufacturer_login')
+@replica_reads
 def manufacturer_dashboard(request):
     """Dashboard for manufacturers showing overview and recent startups."""
     if not request.user.is_manufacturer():
         return redirect('home')
     
-    # Get approved startups
-    startups = Startup.objects.filter(approved=True)[:5]
     total_startups = Startup.objects.filter(approved=True).count()
     
     # Get manufacturer's connection requests
     try:
         manufacturer = ManufacturerProfile.objects.get(user=request.user)
-        connection_requests = ConnectionRequest.objects.filter(manufacturer=manufacturer).order_by('-created_at')[:5]
-        total_connections = ConnectionRequest.objects.filter(manufacturer=manufacturer).count()
-        pending_connections = ConnectionRequest.objects.filter(manufacturer=manufacturer, status='PENDING').count()
-        accepted_connections = ConnectionRequest.objects.filter(manufacturer=manufacturer, status='ACCEPTED').count()
+        connection_requests = ConnectionRequest.objects.filter(manufacturer=manufacturer).select_related('startup').order_by('-created_at')[:5]
+        total_connections = manufacturer.connections_total
+        pending_connections = manufacturer.connections_pending
+        accepted_connections = manufacturer.connections_accepted
+        startups = [match.startup for match in best_matches(manufacturer)[:5]]
     except ManufacturerProfile.DoesNotExist:
         connection_requests = []
         total_connections = 0
         pending_connections = 0
         accepted_connections = 0
+        startups = []
+    
+    # Best matches are ranked by a scheduled job; until it has run, show recent startups
+    matched = bool(startups)
+    if not matched:
+        startups = Startup.objects.filter(approved=True)[:5]
     
     return render(request, 'manufacturers/dashboard.html', {
         'startups': startups,
+        'matched': matched,
         'connection_requests': connection_requests,
         'total_startups': total_startups,
         'total_connections': total_connections,
@@ -118,60 +132,89 @@ def manufacturer_dashboard(request):
     })
 
 
+def best_matches(manufacturer):
+    """The manufacturer's ranked startups, minus ones requested since the ranking was computed."""
+    return (
+        StartupMatch.objects.filter(manufacturer=manufacturer, startup__approved=True)
+        .exclude(startup__in=ConnectionRequest.objects.filter(manufacturer=manufacturer).values('startup'))
+        .select_related('startup')
+        .order_by('rank')
+    )
+
+
 @login_required(login_url='manufacturer_login')
+@replica_reads
 def startup_list(request):
     """View all approved startups."""
     if not request.user.is_manufacturer():
         return redirect('home')
     
-    startups = Startup.objects.filter(approved=True)
-    
-    # Search
-    search = request.GET.get('search')
-    if search:
-        startups = startups.filter(name__icontains=search)
-    
-    # Filter by niche if provided
-    niche = request.GET.get('niche')
-    if niche:
-        startups = startups.filter(niche__icontains=niche)
+    search = request.GET.get('search', '')
+    niche = request.GET.get('niche', '')
+    stage = request.GET.get('stage', '')
+    sort = request.GET.get('sort', '')
+    niche_tag = request.GET.get('niche_tag', '')
+    stage_tag = request.GET.get('stage_tag', '')
+    valuation_min, valuation_max = listing.valuation_range(request)
     
-    # Filter by stage if provided
-    stage = request.GET.get('stage')
-    if stage:
-        startups = startups.filter(stage__icontains=stage)
-    
-    # Pagination
-    paginator = Paginator(startups, 9)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    if sort == 'best':
+        # Walk the precomputed ranking in rank order, narrowed by the search
+        manufacturer = get_object_or_404(ManufacturerProfile, user=request.user)
+        matches = best_matches(manufacturer)
+        if search or niche or stage:
+            matches = matches.filter(startup__in=matching_startup_ids(search, niche, stage))
+        matches = facets.filter_by_facets(matches, niche_tag, stage_tag, prefix='startup__')
+        matches = listing.filter_by_valuation(matches, valuation_min, valuation_max, prefix='startup__')
+        page_obj = paginate(request, matches, 9)
+        startups = [match.startup for match in page_obj]
+    else:
+        startups = Startup.objects.filter(approved=True).order_by('-id')
+        
+        # Search and filter by niche/stage through the full-text index
+        startups = search_startups(startups, search=search, niche=niche, stage=stage)
+        startups = facets.filter_by_facets(startups, niche_tag, stage_tag)
+        startups = listing.filter_by_valuation(startups, valuation_min, valuation_max)
+        startups = listing.sort_startups(startups, sort)
+        
+        # Keyset pagination on the chosen order (search rank or newest first by default) and id
+        page_obj = startups = paginate(request, startups, 9)
     
     return render(request, 'manufacturers/startup_list.html', {
-        'startups': page_obj,
+        'startups': startups,
         'page_obj': page_obj,
+        'sort': sort,
+        'sort_choices': listing.SORT_CHOICES,
+        'facets': facets.browse_facets(request, [(valuation_min, valuation_max)]),
     })
 
 
 @login_required(login_url='manufacturer_login')
+@replica_reads
 def startup_detail(request, startup_id):
     """View detailed information about a startup."""
     if not request.user.is_manufacturer():
         return redirect('home')
     
-    startup = get_object_or_404(Startup, id=startup_id, approved=True)
+    # The fragment is cached per updated_at; the full row is only queried to render it
+    version = page_cache.startup_version(startup_id)
+    if version is None:
+        raise Http404('No approved startup with that id.')
+    startup = SimpleLazyObject(lambda: get_object_or_404(Startup, id=startup_id, approved=True))
     
     # Check if already connected
     try:
         manufacturer = ManufacturerProfile.objects.get(user=request.user)
         existing_request = ConnectionRequest.objects.filter(
             manufacturer=manufacturer, 
-            startup=startup
+            startup_id=startup_id
         ).first()
     except ManufacturerProfile.DoesNotExist:
         existing_request = None
     
     return render(request, 'manufacturers/startup_detail.html', {
         'startup': startup,
+        'startup_id': startup_id,
+        'startup_version': version,
         'existing_request': existing_request,
     })
 
@@ -231,6 +274,7 @@ def manufacturer_profile(request):
 
 
 @login_required(login_url='manufacturer_login')
+@replica_reads
 def connection_history(request):
     """View all connection requests."""
     if not request.user.is_manufacturer():
@@ -238,7 +282,7 @@ def connection_history(request):
     
     try:
         manufacturer = ManufacturerProfile.objects.get(user=request.user)
-        connections = ConnectionRequest.objects.filter(manufacturer=manufacturer).order_by('-created_at')
+        connections = ConnectionRequest.objects.filter(manufacturer=manufacturer).select_related('startup').order_by('-created_at')
     except ManufacturerProfile.DoesNotExist:
         connections = []
     
@@ -5,6 +5,7 @@ from .models import Startup, InvestmentApplication
 @admin.register(Startup)
 class StartupAdmin(admin.ModelAdmin):
     list_display = ('name', 'founder', 'niche', 'stage', 'valuation', 'approved')
+    list_select_related = ('founder',)
     list_filter = ('approved', 'stage', 'niche')
     search_fields = ('name', 'founder__username', 'niche')
     readonly_fields = ('founder',)
@@ -30,6 +31,7 @@ class StartupAdmin(admin.ModelAdmin):
 @admin.register(InvestmentApplication)
 class InvestmentApplicationAdmin(admin.ModelAdmin):
     list_display = ('startup', 'investor', 'amount_requested', 'equity_offered', 'status', 'created_at')
+    list_select_related = ('startup', 'investor__user')
     list_filter = ('status', 'created_at')
     search_fields = ('startup__name', 'investor__user__username')
     readonly_fields = ('created_at',)
@@ -0,0 +1,109 @@
+"""Denormalized dashboard counters.
+
+``Startup``, ``InvestorProfile`` and ``ManufacturerProfile`` carry
+``applications_*`` / ``connections_*`` columns so dashboards can read their
+totals from the profile row they already load instead of running a COUNT
+per figure. The counters are adjusted with ``F()`` updates from the
+``InvestmentApplication`` and ``ConnectionRequest`` signals in
+``startups.signals``; ``reconcile`` recomputes them from scratch and backs
+the ``reconcile_counters`` command.
+"""
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# Statuses that get their own counter column next to ``<kind>_total``.
+COUNTED_STATUSES = ('PENDING', 'ACCEPTED')
+
+
+def counter_deltas(kind, old_status, new_status):
+    """Return the counter adjustments for one row changing status.
+
+    ``kind`` is ``'applications'`` or ``'connections'``. ``old_status`` is
+    ``None`` for a newly created row and ``new_status`` is ``None`` for a
+    deleted one.
+    """
+    deltas = {}
+    if old_status is None:
+        deltas[f'{kind}_total'] = 1
+    elif new_status is None:
+        deltas[f'{kind}_total'] = -1
+    for status in COUNTED_STATUSES:
+        delta = (new_status == status) - (old_status == status)
+        if delta:
+            deltas[f'{kind}_{status.lower()}'] = delta
+    return deltas
+
+
+def apply_deltas(owners, deltas):
+    """Add ``deltas`` to the counters of every ``(model, pk)`` in ``owners``."""
+    if not deltas:
+        return
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    for model, pk in owners:
+        model.objects.filter(pk=pk).update(**updates)
+
+
+def apply_deltas_bulk(model, pks, deltas, batch_size=500):
+    """Add ``deltas`` to the counters of every ``model`` row in ``pks``.
+
+    Runs one UPDATE per ``batch_size`` rows to stay under the database's
+    query parameter limit.
+    """
+    if not deltas:
+        return
+    pks = list(pks)
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    for start in range(0, len(pks), batch_size):
+        model.objects.filter(pk__in=pks[start:start + batch_size]).update(**updates)
+
+
+def record_change(kind, owners, old_status, new_status):
+    """Adjust the counters of ``owners`` for one row changing status."""
+    apply_deltas(owners, counter_deltas(kind, old_status, new_status))
+
+
+def count_subquery(model, fk, status=None):
+    """Correlated ``COUNT`` of ``model`` rows pointing at the outer row."""
+    rows = model.objects.filter(**{fk: OuterRef('pk')})
+    if status:
+        rows = rows.filter(status=status)
+    counts = rows.order_by().values(fk).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts), 0)
+
+
+def counter_values(model, fk, kind):
+    """Expressions recomputing every ``kind`` counter from ``model`` rows."""
+    values = {f'{kind}_total': count_subquery(model, fk)}
+    for status in COUNTED_STATUSES:
+        values[f'{kind}_{status.lower()}'] = count_subquery(model, fk, status)
+    return values
+
+
+def recompute(get_model):
+    """Recompute every counter column. Returns rows updated per model.
+
+    ``get_model`` resolves ``(app_label, model_name)`` to a model class.
+    Migrations keep their own frozen copy rather than calling this.
+    """
+    InvestmentApplication = get_model('startups', 'InvestmentApplication')
+    ConnectionRequest = get_model('manufacturers', 'ConnectionRequest')
+    return {
+        'startups': get_model('startups', 'Startup').objects.update(
+            **counter_values(InvestmentApplication, 'startup', 'applications'),
+            **counter_values(ConnectionRequest, 'startup', 'connections'),
+        ),
+        'investors': get_model('investors', 'InvestorProfile').objects.update(
+            **counter_values(InvestmentApplication, 'investor', 'applications'),
+        ),
+        'manufacturers': get_model('manufacturers', 'ManufacturerProfile').objects.update(
+            **counter_values(ConnectionRequest, 'manufacturer', 'connections'),
+        ),
+    }
+
+
+def reconcile():
+    """Recompute every counter against the live models in one transaction."""
+    with transaction.atomic():
+        return recompute(django_apps.get_model)
@@ -0,0 +1,184 @@
+"""Pitch deck previews: page count, first-page thumbnails and plain text.
+
+Saving a startup with a new ``pitch_deck`` clears its ``pitch_deck_preview``
+and queues ``startups.tasks.process_pitch_deck_task`` (see
+``startups.signals``). The task parses the deck in a process pool, so a
+slow or crashing PDF parser never runs in a web request or takes the worker
+down with it, and writes the derivatives next to the deck::
+
+    pitch_decks/ab/<sha256>.pdf             the deck
+    pitch_decks/ab/<sha256>.preview.json    page count and thumbnail widths
+    pitch_decks/ab/<sha256>.text.txt        extracted text, fed to search
+    pitch_decks/ab/<sha256>.thumb-480.png   one per PITCH_DECK_THUMBNAIL_WIDTHS
+
+Parsing gets ``PITCH_DECK_TIMEOUT`` seconds; a deck that takes longer has
+its pool processes killed and the job fails with ``DeckTimeout``, so a
+parser hanging on a malformed PDF never holds the worker past that.
+
+Decks are content-addressed, so a deck shared by several startups is only
+processed once. The preview dict is also stored on the startup, so detail
+pages show the thumbnail and page count without touching the disk.
+
+Parsing uses optional libraries: ``pypdf`` for the page count and text,
+``pypdfium2`` with Pillow for the thumbnails. Without ``pypdf`` pages are
+counted by scanning the file for page objects and no text is extracted;
+without ``pypdfium2`` there are no thumbnails.
+"""
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from .storage import pitch_deck_storage
+
+DEFAULT_WIDTHS = (160, 480, 960)
+DEFAULT_TEXT_LIMIT = 100_000
+DEFAULT_TIMEOUT = 120
+PAGE_RE = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+DERIVATIVE_RE = re.compile(r'^(.+)\.(preview\.json|text\.txt|thumb-\d+\.png)$')
+
+_pool = None
+
+
+class DeckTimeout(Exception):
+    pass
+
+
+def derivative_name(deck_name, suffix):
+    """Name of the ``suffix`` derivative of the deck stored as ``deck_name``."""
+    return f'{os.path.splitext(deck_name)[0]}.{suffix}'
+
+
+def thumbnail_name(deck_name, width):
+    return derivative_name(deck_name, f'thumb-{width}.png')
+
+
+def derivative_stem(name):
+    """The deck name (without extension) a derivative belongs to, or ``None`` for a deck."""
+    match = DERIVATIVE_RE.match(name)
+    return match.group(1) if match else None
+
+
+# The functions below run in the pool's processes: plain paths in, plain data out.
+
+def read_pages_and_text(path, text_limit):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        with open(path, 'rb') as f:
+            return len(PAGE_RE.findall(f.read())), ''
+    reader = PdfReader(path)
+    parts, length = [], 0
+    for page in reader.pages:
+        if length >= text_limit:
+            break
+        text = page.extract_text() or ''
+        parts.append(text)
+        length += len(text)
+    return len(reader.pages), '\n'.join(parts)[:text_limit]
+
+
+def render_thumbnails(path, widths):
+    """PNG bytes of the first page at each of ``widths``, or ``{}`` without pypdfium2."""
+    try:
+        import pypdfium2
+    except ImportError:
+        return {}
+    document = pypdfium2.PdfDocument(path)
+    try:
+        if not len(document):
+            return {}
+        page = document[0]
+        # Render once at the largest size and scale down from that.
+        image = page.render(scale=max(widths) / page.get_width()).to_pil().convert('RGB')
+        thumbnails = {}
+        for width in sorted(widths, reverse=True):
+            height = max(round(image.height * width / image.width), 1)
+            buffer = io.BytesIO()
+            image.resize((width, height)).save(buffer, format='PNG', optimize=True)
+            thumbnails[width] = buffer.getvalue()
+        return thumbnails
+    finally:
+        document.close()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=getattr(settings, 'PITCH_DECK_WORKERS', 2))
+    return _pool
+
+
+def reset_pool(terminate=False):
+    """Drop the pool; with ``terminate``, also kill its processes (e.g. a hung parser)."""
+    global _pool
+    if _pool is not None:
+        # ProcessPoolExecutor cannot cancel a running call, so stop its processes directly.
+        processes = list((getattr(_pool, '_processes', None) or {}).values()) if terminate else []
+        _pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        _pool = None
+
+
+class DeckTimeout(Exception):
+    pass
+
+
+def extract(path, widths, text_limit):
+    """Parse the deck at ``path``: ``(pages, text, {width: png})``."""
+    pool = get_pool()
+    deadline = time.monotonic() + getattr(settings, 'PITCH_DECK_TIMEOUT', DEFAULT_TIMEOUT)
+    try:
+        pages = pool.submit(read_pages_and_text, path, text_limit)
+        thumbnails = pool.submit(render_thumbnails, path, widths)
+        pages_and_text = pages.result(timeout=max(deadline - time.monotonic(), 0))
+        return (*pages_and_text, thumbnails.result(timeout=max(deadline - time.monotonic(), 0)))
+    except TimeoutError:
+        reset_pool(terminate=True)
+        raise DeckTimeout(f'Parsing {path} took longer than PITCH_DECK_TIMEOUT.')
+    except BrokenProcessPool:
+        # A parser crashed its process; start a fresh pool for the next deck.
+        reset_pool()
+        raise
+
+
+def write_derivative(storage, name, content):
+    # Written to a temporary file and renamed, like the decks themselves.
+    path = storage.path(name)
+    tmp = f'{path}.tmp-{os.getpid()}'
+    with open(tmp, 'wb') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def process(deck_name, storage=pitch_deck_storage, force=False):
+    """Create the derivatives of ``deck_name`` unless they exist (or ``force``) and return its preview dict."""
+    meta_name = derivative_name(deck_name, 'preview.json')
+    if not force and storage.exists(meta_name):
+        with storage.open(meta_name) as f:
+            return json.load(f)
+
+    widths = tuple(getattr(settings, 'PITCH_DECK_THUMBNAIL_WIDTHS', DEFAULT_WIDTHS))
+    text_limit = getattr(settings, 'PITCH_DECK_TEXT_LIMIT', DEFAULT_TEXT_LIMIT)
+    pages, text, thumbnails = extract(storage.path(deck_name), widths, text_limit)
+    for width, png in thumbnails.items():
+        write_derivative(storage, thumbnail_name(deck_name, width), png)
+    write_derivative(storage, derivative_name(deck_name, 'text.txt'), text.encode())
+    preview = {'pages': pages, 'thumbnails': sorted(thumbnails)}
+    # Written last: its presence means the other derivatives are complete.
+    write_derivative(storage, meta_name, json.dumps(preview).encode())
+    return preview
+
+
+def deck_text(deck_name, storage=pitch_deck_storage):
+    """The extracted text of ``deck_name``, or ``''`` if it has not been processed."""
+    try:
+        with storage.open(derivative_name(deck_name, 'text.txt'), 'rb') as f:
+            return f.read().decode()
+    except FileNotFoundError:
+        return ''
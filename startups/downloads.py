@@ -0,0 +1,115 @@
+"""Serving pitch decks: HTTP Range requests and web-server offload.
+
+With ``settings.PITCH_DECK_SENDFILE`` set, Django only checks access and
+answers with an ``X-Sendfile`` (Apache, lighttpd) or ``X-Accel-Redirect``
+(nginx) header; the web server then sends the file itself, ranges included,
+with zero-copy ``sendfile``. Otherwise Django serves it: whole files through
+``FileResponse`` (which WSGI servers hand to ``wsgi.file_wrapper``) and
+single byte ranges as a streamed 206. Content-addressed decks use their hash
+as a strong ETag, so ``If-None-Match`` and ``If-Range`` work across servers.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import parse_etags
+from django.utils.http import content_disposition_header, http_date, quote_etag
+from .storage import content_digest, pitch_deck_storage
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+class UnsatisfiableRange(ValueError):
+    pass
+
+
+def parse_range(header, size):
+    """Return the inclusive ``(start, end)`` of a single-range ``Range`` header.
+
+    ``None`` means send the whole file: no header, a malformed one, or
+    several ranges (which a server may always answer in full).
+    """
+    match = RANGE_RE.match((header or '').strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        start, end = max(size - int(last), 0), size - 1
+        if int(last) == 0:
+            raise UnsatisfiableRange(header)
+    if start >= size:
+        raise UnsatisfiableRange(header)
+    return start, end
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def deck_etag(name, stat):
+    digest = content_digest(name)
+    return quote_etag(digest or f'{stat.st_size:x}-{int(stat.st_mtime):x}')
+
+
+def serve_deck(request, name, filename, storage=pitch_deck_storage, content_type='application/pdf'):
+    """Respond with the deck stored as ``name``, offered to the client as ``filename``.
+
+    Also serves the deck's derivatives, e.g. its thumbnails as ``image/png``.
+    """
+    path = storage.path(name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404('Pitch deck file is missing.')
+    etag = deck_etag(name, stat)
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    mode = getattr(settings, 'PITCH_DECK_SENDFILE', None)
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+    elif mode == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.PITCH_DECK_ACCEL_PREFIX.rstrip('/') + '/' + name
+    else:
+        byte_range = None
+        if_range = request.headers.get('If-Range')
+        if if_range is None or if_range == etag:
+            try:
+                byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+            except UnsatisfiableRange:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{stat.st_size}'
+                return response
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(read_range(path, start, end - start + 1),
+                                             status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = end - start + 1
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = 'private, no-cache'
+    response['Content-Disposition'] = content_disposition_header(False, filename)
+    return response
@@ -0,0 +1,243 @@
+"""Niche and stage taxonomies and the browse page facets.
+
+``Startup.niche`` and ``Startup.stage`` stay free text, but on every save
+they are also normalized into ``Niche`` / ``Stage`` rows keyed by slug, so
+"HealthTech", "healthtech " and "Healthtech" are one facet value. The
+browse pages filter on ``niche_tag`` / ``stage_tag`` (by slug) and list the
+values with their approved-startup counts.
+
+The counts are maintained incrementally by ``startups.signals``, like the
+dashboard counters: ``Niche.approved_count`` and ``Stage.approved_count``
+hold the unfiltered totals and ``FacetCount`` the total per niche and stage
+pair, so counts under a facet filter read the small pair table instead of
+grouping the startups. Counts under a text search or a valuation range
+depend on the query, so those are computed once per filter combination and
+cached until the next change to an approved startup. ``reconcile`` recomputes everything and runs
+as part of the ``reconcile_counters`` command.
+"""
+import hashlib
+import time
+from collections import Counter
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import slugify
+
+PREFIX = 'startup_facets'
+DEFAULT_SEARCH_COUNTS_TIMEOUT = 600
+PARAMS = {'niche': 'niche_tag', 'stage': 'stage_tag'}
+
+
+def tag_slug(value):
+    """The slug a niche or stage is filed under, or ``''`` for a blank value."""
+    return slugify(value or '')[:200]
+
+
+def resolve(model, value, tags=None):
+    """The ``Niche``/``Stage`` row for ``value``, created on first use; ``None`` if blank.
+
+    ``tags`` is an optional ``{slug: row}`` cache shared across calls.
+    """
+    slug = tag_slug(value)
+    if not slug:
+        return None
+    if tags is not None and slug in tags:
+        return tags[slug]
+    tag, _created = model.objects.get_or_create(slug=slug, defaults={'name': ' '.join(value.split())})
+    if tags is not None:
+        tags[slug] = tag
+    return tag
+
+
+def assign(startup, previous=None):
+    """Point ``startup.niche_tag``/``stage_tag`` at its text fields, if those changed since ``previous``."""
+    from .models import Niche, Stage
+    if previous is None or previous.get('niche') != startup.niche:
+        startup.niche_tag = resolve(Niche, startup.niche)
+    if previous is None or previous.get('stage') != startup.stage:
+        startup.stage_tag = resolve(Stage, startup.stage)
+
+
+def assign_many(startups):
+    """``assign`` for unsaved startups about to be ``bulk_create``\\ d, resolving each value once."""
+    from .models import Niche, Stage
+    niches, stages = {}, {}
+    for startup in startups:
+        startup.niche_tag = resolve(Niche, startup.niche, niches)
+        startup.stage_tag = resolve(Stage, startup.stage, stages)
+
+
+def facet_key(approved, niche_id, stage_id):
+    """What a startup contributes to the counts: nothing unless approved."""
+    return (niche_id, stage_id) if approved else None
+
+
+def adjust(niche_id, stage_id, delta):
+    """Add ``delta`` approved startups to a niche, a stage and their pair."""
+    from .models import FacetCount, Niche, Stage
+    if niche_id:
+        Niche.objects.filter(pk=niche_id).update(approved_count=F('approved_count') + delta)
+    if stage_id:
+        Stage.objects.filter(pk=stage_id).update(approved_count=F('approved_count') + delta)
+    if niche_id and stage_id:
+        pair, _created = FacetCount.objects.get_or_create(niche_id=niche_id, stage_id=stage_id)
+        FacetCount.objects.filter(pk=pair.pk).update(count=F('count') + delta)
+
+
+def record_change(old, new):
+    """Move one startup's contribution from ``old`` to ``new`` (``facet_key`` values or ``None``)."""
+    if old == new:
+        return
+    if old:
+        adjust(*old, -1)
+    if new:
+        adjust(*new, 1)
+
+
+def record_many(keys):
+    """Count several new startups at once, e.g. after a ``bulk_create``."""
+    for (niche_id, stage_id), delta in Counter(key for key in keys if key).items():
+        adjust(niche_id, stage_id, delta)
+
+
+def invalidate():
+    """Drop the cached counts of every text search."""
+    cache.set(f'{PREFIX}:version', time.time_ns(), None)
+
+
+def tag_counts(queryset, field):
+    return [
+        (slug, name, count) for slug, name, count in
+        queryset.values_list(f'{field}__slug', f'{field}__name').annotate(n=Count('pk')).order_by('-n', f'{field}__name')
+        if slug
+    ]
+
+
+def search_counts(niche_slug, stage_slug, search, niche, stage, valuation_ranges=()):
+    """Counts under a text search and/or valuation ranges: grouped over the matching startups, cached per combination.
+
+    ``valuation_ranges`` holds ``(low, high)`` pairs that all apply, e.g. the
+    page's range and an investor's "fits my check size" window.
+    """
+    from .listing import filter_by_valuation
+    from .models import Startup
+    from .search import matching_startup_ids
+    version = cache.get(f'{PREFIX}:version', 0)
+    params = repr((niche_slug, stage_slug, search, niche, stage, tuple(valuation_ranges))).encode()
+    key = f'{PREFIX}:{version}:{hashlib.sha256(params).hexdigest()[:32]}'
+    counts = cache.get(key)
+    if counts is None:
+        startups = Startup.objects.filter(approved=True)
+        if search or niche or stage:
+            startups = startups.filter(pk__in=matching_startup_ids(search, niche, stage))
+        for low, high in valuation_ranges:
+            startups = filter_by_valuation(startups, low, high)
+        niche_scope = startups.filter(stage_tag__slug=stage_slug) if stage_slug else startups
+        stage_scope = startups.filter(niche_tag__slug=niche_slug) if niche_slug else startups
+        counts = (tag_counts(niche_scope, 'niche_tag'), tag_counts(stage_scope, 'stage_tag'))
+        cache.set(key, counts, getattr(settings, 'STARTUP_FACET_CACHE_TIMEOUT', DEFAULT_SEARCH_COUNTS_TIMEOUT))
+    return counts
+
+
+def stored_counts(niche_slug, stage_slug):
+    """Counts under facet filters only, read from the maintained totals."""
+    from .models import FacetCount, Niche, Stage
+
+    def pairs(field, other, other_slug):
+        rows = FacetCount.objects.filter(**{f'{other}__slug': other_slug}, count__gt=0)
+        return list(rows.order_by('-count', f'{field}__name').values_list(f'{field}__slug', f'{field}__name', 'count'))
+
+    if stage_slug:
+        niches = pairs('niche', 'stage', stage_slug)
+    else:
+        niches = list(Niche.objects.filter(approved_count__gt=0).order_by('-approved_count', 'name')
+                      .values_list('slug', 'name', 'approved_count'))
+    if niche_slug:
+        stages = pairs('stage', 'niche', niche_slug)
+    else:
+        stages = list(Stage.objects.filter(approved_count__gt=0).order_by('-approved_count', 'name')
+                      .values_list('slug', 'name', 'approved_count'))
+    return niches, stages
+
+
+def filter_by_facets(queryset, niche_slug='', stage_slug='', prefix=''):
+    """Narrow a ``Startup`` queryset (or one related through ``prefix``, e.g. ``'startup__'``) to the facets."""
+    if niche_slug:
+        queryset = queryset.filter(**{f'{prefix}niche_tag__slug': niche_slug})
+    if stage_slug:
+        queryset = queryset.filter(**{f'{prefix}stage_tag__slug': stage_slug})
+    return queryset
+
+
+def browse_facets(request, valuation_ranges=()):
+    """The niche and stage facets of a browse page, with counts under the page's other filters.
+
+    ``valuation_ranges`` are the ``(low, high)`` valuation filters the page
+    applied (see ``search_counts``). Each value carries the query string
+    that selects it (or clears it, if it is already selected), keeping the
+    other filters and dropping the pagination cursor.
+    """
+    selected = {facet: request.GET.get(param, '') for facet, param in PARAMS.items()}
+    search, niche, stage = (request.GET.get(param, '') for param in ('search', 'niche', 'stage'))
+    valuation_ranges = [bounds for bounds in valuation_ranges if bounds != (None, None)]
+    if search or niche or stage or valuation_ranges:
+        niches, stages = search_counts(selected['niche'], selected['stage'], search, niche, stage, valuation_ranges)
+    else:
+        niches, stages = stored_counts(selected['niche'], selected['stage'])
+
+    def values(facet, rows):
+        param = PARAMS[facet]
+        choices = []
+        for slug, name, count in rows:
+            params = request.GET.copy()
+            params.pop('cursor', None)
+            if slug == selected[facet]:
+                params.pop(param, None)
+            else:
+                params[param] = slug
+            choices.append({'slug': slug, 'name': name, 'count': count,
+                            'selected': slug == selected[facet], 'query': params.urlencode()})
+        return choices
+
+    niches, stages = values('niche', niches), values('stage', stages)
+    return {'niches': niches, 'stages': stages, 'groups': [('Niche', niches), ('Stage', stages)],
+            'selected': selected}
+
+
+def recompute(get_model):
+    """Recompute every facet count. Returns rows written per table.
+
+    ``get_model`` resolves ``(app_label, model_name)`` to a model class.
+    Migrations keep their own frozen copy rather than calling this.
+    """
+    Startup = get_model('startups', 'Startup')
+    FacetCount = get_model('startups', 'FacetCount')
+    approved = Startup.objects.filter(approved=True).order_by()
+
+    def total(field):
+        counts = approved.filter(**{field: OuterRef('pk')}).values(field).annotate(n=Count('pk')).values('n')
+        return Coalesce(Subquery(counts), 0)
+
+    written = {
+        'niches': get_model('startups', 'Niche').objects.update(approved_count=total('niche_tag')),
+        'stages': get_model('startups', 'Stage').objects.update(approved_count=total('stage_tag')),
+    }
+    FacetCount.objects.all().delete()
+    pairs = approved.filter(niche_tag__isnull=False, stage_tag__isnull=False).values('niche_tag', 'stage_tag')
+    written['facet pairs'] = len(FacetCount.objects.bulk_create([
+        FacetCount(niche_id=row['niche_tag'], stage_id=row['stage_tag'], count=row['n'])
+        for row in pairs.annotate(n=Count('pk'))
+    ]))
+    return written
+
+
+def reconcile():
+    """Recompute the facet counts against the live models in one transaction."""
+    with transaction.atomic():
+        written = recompute(django_apps.get_model)
+    invalidate()
+    return written
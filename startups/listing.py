@@ -0,0 +1,51 @@
+"""Valuation filters and sort orders shared by the startup browse pages.
+
+Every order ends in the primary key, so ``venturehub.pagination`` can page
+through it with a cursor, and each has a partial index over approved
+startups (see ``Startup.Meta.indexes``) that serves both the order and a
+valuation range on it.
+"""
+from decimal import Decimal, InvalidOperation
+
+SORTS = {
+    'newest': ('-id',),
+    'updated': ('-updated_at', '-id'),
+    'valuation_high': ('-valuation', '-id'),
+    'valuation_low': ('valuation', 'id'),
+}
+SORT_CHOICES = [
+    ('newest', 'Newest first'),
+    ('updated', 'Recently updated'),
+    ('valuation_high', 'Valuation: high to low'),
+    ('valuation_low', 'Valuation: low to high'),
+]
+
+
+def parse_amount(value):
+    """A non-negative ``Decimal`` from a query parameter, or ``None`` if blank or invalid."""
+    try:
+        amount = Decimal(str(value).replace(',', '').strip())
+    except InvalidOperation:
+        return None
+    return amount if amount.is_finite() and amount >= 0 else None
+
+
+def filter_by_valuation(queryset, low=None, high=None, prefix=''):
+    """Narrow a ``Startup`` queryset (or one related through ``prefix``) to ``low <= valuation <= high``."""
+    if low is not None:
+        queryset = queryset.filter(**{f'{prefix}valuation__gte': low})
+    if high is not None:
+        queryset = queryset.filter(**{f'{prefix}valuation__lte': high})
+    return queryset
+
+
+def valuation_range(request):
+    """The ``valuation_min``/``valuation_max`` filters of a browse page."""
+    return parse_amount(request.GET.get('valuation_min', '')), parse_amount(request.GET.get('valuation_max', ''))
+
+
+def sort_startups(queryset, sort):
+    """Order by one of ``SORTS``; other values keep the queryset's own order (e.g. search rank)."""
+    if sort not in SORTS:
+        return queryset
+    return queryset.order_by(*SORTS[sort])
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from startups.storage import adopt_legacy, collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Delete pitch deck files no startup refers to.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age', type=int, default=3600,
+                            help='Keep files modified less than this many seconds ago.')
+        parser.add_argument('--dry-run', action='store_true', help='List the orphans without deleting them.')
+        parser.add_argument('--adopt-legacy', action='store_true',
+                            help='First move decks still stored under their upload name to content-addressed '
+                                 'names, so duplicates collapse into one file.')
+
+    def handle(self, *args, **options):
+        if options['min_age'] < 0:
+            raise CommandError('--min-age cannot be negative.')
+        if options['adopt_legacy'] and not options['dry_run']:
+            for old, new in adopt_legacy().items():
+                self.stdout.write(f'{old} -> {new}')
+        removed = collect_garbage(min_age=options['min_age'], dry_run=options['dry_run'])
+        for name in removed:
+            self.stdout.write(name)
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(removed)} orphaned pitch deck files.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from startups.models import Startup
+from startups.tasks import process_pitch_deck_task
+
+
+class Command(BaseCommand):
+    help = 'Queue preview extraction (thumbnails, page count, text) for pitch decks that have none.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Re-extract every deck, e.g. after installing pypdf or pypdfium2.')
+        parser.add_argument('--sync', action='store_true', help='Process the decks now instead of queueing jobs.')
+
+    def handle(self, *args, **options):
+        startups = Startup.objects.exclude(pitch_deck='')
+        if not options['all']:
+            startups = startups.filter(pitch_deck_preview={})
+        ids = list(startups.order_by('pk').values_list('pk', flat=True))
+        for startup_id in ids:
+            if options['sync']:
+                process_pitch_deck_task(startup_id, force=options['all'])
+            else:
+                process_pitch_deck_task.delay(startup_id, force=options['all'])
+        verb = 'Processed' if options['sync'] else 'Queued'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(ids)} pitch decks.'))
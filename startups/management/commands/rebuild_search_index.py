@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from startups.models import Startup
+from startups.search import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the startup full-text search index from the Startup table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of startups inserted per batch.')
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        total = backend.rebuild(Startup.objects.order_by('pk'), chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {total} startups with {type(backend).__name__}.'
+        ))
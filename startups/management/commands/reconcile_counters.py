@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from startups import facets
+from startups.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized dashboard counters and the niche/stage facet counts.'
+
+    def handle(self, *args, **options):
+        updated = {**reconcile(), **facets.reconcile()}
+        for label, rows in updated.items():
+            self.stdout.write(f'{label}: {rows} rows reconciled')
+        self.stdout.write(self.style.SUCCESS('Counters reconciled.'))
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS startups_startup_fts USING fts5('
+        'name, niche, stage, vision, tokenize="unicode61 remove_diacritics 2")'
+    )
+    schema_editor.execute(
+        'INSERT INTO startups_startup_fts (rowid, name, niche, stage, vision) '
+        'SELECT id, name, niche, stage, vision FROM startups_startup'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS startups_startup_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0004_investmentapplication_subject'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
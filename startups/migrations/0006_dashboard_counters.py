@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:26
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# Frozen copy of startups.counters.recompute as of this migration, so later
+# changes to the app code cannot change what the migration does.
+COUNTED_STATUSES = ('PENDING', 'ACCEPTED')
+
+
+def count_subquery(model, fk, status=None):
+    rows = model.objects.filter(**{fk: OuterRef('pk')})
+    if status:
+        rows = rows.filter(status=status)
+    counts = rows.order_by().values(fk).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts), 0)
+
+
+def counter_values(model, fk, kind):
+    values = {f'{kind}_total': count_subquery(model, fk)}
+    for status in COUNTED_STATUSES:
+        values[f'{kind}_{status.lower()}'] = count_subquery(model, fk, status)
+    return values
+
+
+def populate_counters(apps, schema_editor):
+    InvestmentApplication = apps.get_model('startups', 'InvestmentApplication')
+    ConnectionRequest = apps.get_model('manufacturers', 'ConnectionRequest')
+    apps.get_model('startups', 'Startup').objects.update(
+        **counter_values(InvestmentApplication, 'startup', 'applications'),
+        **counter_values(ConnectionRequest, 'startup', 'connections'),
+    )
+    apps.get_model('investors', 'InvestorProfile').objects.update(
+        **counter_values(InvestmentApplication, 'investor', 'applications'),
+    )
+    apps.get_model('manufacturers', 'ManufacturerProfile').objects.update(
+        **counter_values(ConnectionRequest, 'manufacturer', 'connections'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0005_startup_search_index'),
+        ('investors', '0004_dashboard_counters'),
+        ('manufacturers', '0004_dashboard_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startup',
+            name='applications_accepted',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='applications_pending',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='applications_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='connections_accepted',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='connections_pending',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='connections_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0006_dashboard_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['startup', '-created_at'], name='app_startup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['startup', 'status', '-created_at'], name='app_startup_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['investor', '-created_at'], name='app_investor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['investor', 'status', '-created_at'], name='app_investor_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['status', '-created_at'], name='app_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('approved', True)), fields=['id'], name='startup_approved_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0007_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='investmentapplication',
+            name='app_startup_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='investmentapplication',
+            name='app_startup_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='investmentapplication',
+            name='app_investor_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='investmentapplication',
+            name='app_investor_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='investmentapplication',
+            name='app_status_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['startup', '-created_at', '-id'], name='app_startup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['startup', 'status', '-created_at', '-id'], name='app_startup_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['investor', '-created_at', '-id'], name='app_investor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['investor', 'status', '-created_at', '-id'], name='app_investor_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='app_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0008_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['-amount_requested', '-id'], name='app_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(fields=['name', 'id'], name='startup_name_idx'),
+        ),
+    ]
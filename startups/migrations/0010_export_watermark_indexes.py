@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0009_admin_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investmentapplication',
+            index=models.Index(fields=['created_at', 'id'], name='app_created_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0010_export_watermark_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startup',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('approved', True)), fields=['updated_at'], name='startup_approved_updated_idx'),
+        ),
+    ]
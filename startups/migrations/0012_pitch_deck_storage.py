@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:24
+
+import startups.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0011_modification_tracking'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='startup',
+            name='pitch_deck',
+            field=models.FileField(storage=startups.storage.ContentAddressedStorage(), upload_to='pitch_decks/'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+FTS_OPTIONS = 'tokenize="unicode61 remove_diacritics 2"'
+
+
+def create_table(schema_editor, columns):
+    schema_editor.execute('DROP TABLE IF EXISTS startups_startup_fts')
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE startups_startup_fts USING fts5({", ".join(columns)}, {FTS_OPTIONS})'
+    )
+
+
+def add_deck_column(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    # FTS5 tables cannot be altered: rebuild it with the deck column. Deck
+    # text is filled in as decks are processed (manage.py process_pitch_decks).
+    create_table(schema_editor, ['name', 'niche', 'stage', 'vision', 'deck'])
+    schema_editor.execute(
+        "INSERT INTO startups_startup_fts (rowid, name, niche, stage, vision, deck) "
+        "SELECT id, name, niche, stage, vision, '' FROM startups_startup"
+    )
+    # bm25 weights per column: a match in the name counts most, one in the deck least.
+    schema_editor.execute(
+        "INSERT INTO startups_startup_fts (startups_startup_fts, rank) "
+        "VALUES ('rank', 'bm25(10.0, 5.0, 5.0, 2.0, 1.0)')"
+    )
+
+
+def drop_deck_column(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    create_table(schema_editor, ['name', 'niche', 'stage', 'vision'])
+    schema_editor.execute(
+        'INSERT INTO startups_startup_fts (rowid, name, niche, stage, vision) '
+        'SELECT id, name, niche, stage, vision FROM startups_startup'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0012_pitch_deck_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startup',
+            name='pitch_deck_preview',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(add_deck_column, drop_deck_column),
+    ]
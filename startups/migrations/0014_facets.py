@@ -0,0 +1,116 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import slugify
+
+# Frozen copies of startups.facets.tag_slug and recompute as of this
+# migration, so later changes to the app code cannot change what it does.
+
+
+def tag_slug(value):
+    return slugify(value or '')[:200]
+
+
+def recompute(apps):
+    Startup = apps.get_model('startups', 'Startup')
+    FacetCount = apps.get_model('startups', 'FacetCount')
+    approved = Startup.objects.filter(approved=True).order_by()
+
+    def total(field):
+        counts = approved.filter(**{field: OuterRef('pk')}).values(field).annotate(n=Count('pk')).values('n')
+        return Coalesce(Subquery(counts), 0)
+
+    apps.get_model('startups', 'Niche').objects.update(approved_count=total('niche_tag'))
+    apps.get_model('startups', 'Stage').objects.update(approved_count=total('stage_tag'))
+    pairs = approved.filter(niche_tag__isnull=False, stage_tag__isnull=False).values('niche_tag', 'stage_tag')
+    FacetCount.objects.bulk_create([
+        FacetCount(niche_id=row['niche_tag'], stage_id=row['stage_tag'], count=row['n'])
+        for row in pairs.annotate(n=Count('pk'))
+    ])
+
+
+def populate_facets(apps, schema_editor):
+    """File every startup under the Niche/Stage for its text value, then count them."""
+    Startup = apps.get_model('startups', 'Startup')
+    for field, model_name in (('niche', 'Niche'), ('stage', 'Stage')):
+        model = apps.get_model('startups', model_name)
+        variants = {}
+        for value in Startup.objects.order_by(field).values_list(field, flat=True).distinct():
+            slug = tag_slug(value)
+            if slug:
+                variants.setdefault(slug, []).append(value)
+        for slug, values in variants.items():
+            tag = model.objects.create(slug=slug, name=' '.join(values[0].split()))
+            Startup.objects.filter(**{f'{field}__in': values}).update(**{f'{field}_tag': tag})
+    recompute(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0013_pitch_deck_preview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Niche',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=200, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('approved_count', models.IntegerField(default=0, editable=False)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Stage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=200, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('approved_count', models.IntegerField(default=0, editable=False)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='niche_tag',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='startups', to='startups.niche'),
+        ),
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('niche', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='startups.niche')),
+                ('stage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='startups.stage')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='stage_tag',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='startups', to='startups.stage'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('approved', True)), fields=['niche_tag', '-id'], name='startup_niche_tag_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('approved', True)), fields=['stage_tag', '-id'], name='startup_stage_tag_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='facetcount',
+            constraint=models.UniqueConstraint(fields=('niche', 'stage'), name='facetcount_pair_unique'),
+        ),
+        migrations.RunPython(populate_facets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0014_facets'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='startup',
+            name='startup_approved_updated_idx',
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('approved', True)), fields=['updated_at', 'id'], name='startup_approved_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('approved', True)), fields=['valuation', 'id'], name='startup_valuation_idx'),
+        ),
+    ]
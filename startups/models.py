@@ -1,5 +1,47 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from .storage import pitch_deck_storage
+
+
+class Taxonomy(models.Model):
+    """A normalized niche or stage value; see ``startups.facets``."""
+    slug = models.SlugField(max_length=200, unique=True)
+    name = models.CharField(max_length=200)
+    # Approved startups filed under this value, maintained by startups.signals.
+    approved_count = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class Niche(Taxonomy):
+    pass
+
+
+class Stage(Taxonomy):
+    pass
+
+
+class FacetCount(models.Model):
+    """Approved startups per niche and stage pair, for facet counts under a filter."""
+    niche = models.ForeignKey(Niche, on_delete=models.CASCADE, related_name='+')
+    stage = models.ForeignKey(Stage, on_delete=models.CASCADE, related_name='+')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['niche', 'stage'], name='facetcount_pair_unique'),
+        ]
+
+
+# Fields signal handlers diff against their stored values: the facet counts
+# (startups.signals) and the investor recommendations (investors.signals).
+TRACKED_FIELDS = ('approved', 'niche', 'stage', 'valuation', 'niche_tag_id', 'stage_tag_id')
+
 
 class Startup(models.Model):
     founder = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -7,8 +49,15 @@ class Startup(models.Model):
     niche = models.CharField(max_length=200)
     valuation = models.DecimalField(max_digits=15, decimal_places=2)
     stage = models.CharField(max_length=100)
+    # niche and stage normalized by startups.facets, for faceted browsing.
+    niche_tag = models.ForeignKey(Niche, null=True, blank=True, on_delete=models.SET_NULL,
+                                  editable=False, related_name='startups')
+    stage_tag = models.ForeignKey(Stage, null=True, blank=True, on_delete=models.SET_NULL,
+                                  editable=False, related_name='startups')
     vision = models.TextField()
-    pitch_deck = models.FileField(upload_to='pitch_decks/')
+    pitch_deck = models.FileField(upload_to='pitch_decks/', storage=pitch_deck_storage)
+    # {'pages': ..., 'thumbnails': [widths]} once startups.decks has processed the deck.
+    pitch_deck_preview = models.JSONField(default=dict, blank=True, editable=False)
     demo_video = models.URLField(blank=True)
     
     # Contact information
@@ -17,6 +66,64 @@ class Startup(models.Model):
     website = models.URLField(blank=True)
 
     approved = models.BooleanField(default=False)
+    # Set on every save (not by the counter UPDATEs); drives ETag/Last-Modified.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Dashboard counters, maintained by startups.signals
+    applications_total = models.IntegerField(default=0, editable=False)
+    applications_pending = models.IntegerField(default=0, editable=False)
+    applications_accepted = models.IntegerField(default=0, editable=False)
+    connections_total = models.IntegerField(default=0, editable=False)
+    connections_pending = models.IntegerField(default=0, editable=False)
+    connections_accepted = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Browse pages and counts only ever look at approved startups.
+            models.Index(fields=['id'], condition=models.Q(approved=True), name='startup_approved_idx'),
+            models.Index(fields=['name', 'id'], name='startup_name_idx'),
+            # Newest change among approved startups, for browse page validators.
+            # ... and the browse pages' "recently updated" order.
+            models.Index(fields=['updated_at', 'id'], condition=models.Q(approved=True),
+                         name='startup_approved_updated_idx'),
+            # Valuation ranges and orders on the browse pages.
+            models.Index(fields=['valuation', 'id'], condition=models.Q(approved=True),
+                         name='startup_valuation_idx'),
+            # Browse pages filtered by a facet, newest first.
+            models.Index(fields=['niche_tag', '-id'], condition=models.Q(approved=True),
+                         name='startup_niche_tag_idx'),
+            models.Index(fields=['stage_tag', '-id'], condition=models.Q(approved=True),
+                         name='startup_stage_tag_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored deck so startups.signals can tell when it changes.
+        instance._loaded_pitch_deck = instance.__dict__.get('pitch_deck')
+        # ... and the fields the facets and matching depend on.
+        instance._loaded_values = instance.tracked_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using, fields, from_queryset)
+        if fields is None or 'pitch_deck' in fields:
+            self._loaded_pitch_deck = self.pitch_deck.name
+        if fields is None or {'approved', 'niche', 'stage', 'valuation', 'niche_tag', 'stage_tag'} & set(fields):
+            self._loaded_values = self.tracked_values()
+
+    def tracked_values(self):
+        """The ``TRACKED_FIELDS`` of this instance, or ``None`` if some are deferred."""
+        if any(field not in self.__dict__ for field in TRACKED_FIELDS):
+            return None
+        return {field: self.__dict__[field] for field in TRACKED_FIELDS}
+
+    def save(self, *args, **kwargs):
+        # Keep the row and its facet counts in one transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        # After every post_save handler has compared against the old values.
+        self._loaded_values = self.tracked_values()
 
     def __str__(self):
         return self.name
@@ -42,5 +149,29 @@ class InvestmentApplication(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['startup', '-created_at', '-id'], name='app_startup_created_idx'),
+            models.Index(fields=['startup', 'status', '-created_at', '-id'], name='app_startup_status_idx'),
+            models.Index(fields=['investor', '-created_at', '-id'], name='app_investor_created_idx'),
+            models.Index(fields=['investor', 'status', '-created_at', '-id'], name='app_investor_status_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='app_status_created_idx'),
+            models.Index(fields=['-amount_requested', '-id'], name='app_amount_idx'),
+            # Watermark order for incremental exports.
+            models.Index(fields=['created_at', 'id'], name='app_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so the counter signals can diff it.
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Keep the row and its dashboard counters in one transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.startup.name} -> {self.investor.user.username}"
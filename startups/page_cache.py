@@ -0,0 +1,64 @@
+"""Rendered startup fragments, cached per startup, version and viewer role.
+
+Templates wrap the parts of a page that only depend on one startup in
+``{% startupcache "<fragment>" startup_id updated_at %}`` (see
+``startups.templatetags.startup_cache``). The key holds the startup's
+``updated_at``, which moves on every save (including ``startup_approval``
+flipping ``approved``) and when a pitch deck preview is stored, so a changed
+startup simply misses: no invalidation has to reach other processes. Views
+read ``updated_at`` with the same cheap query that checks the startup is
+approved (``startup_version``), so unapproved startups 404 before any
+fragment is looked up. Old fragments are never read again and expire after
+``STARTUP_PAGE_CACHE_TIMEOUT`` seconds.
+
+Counter updates are ``F()`` UPDATEs that leave ``updated_at`` alone; they
+are not part of any cached fragment either.
+
+Hits and misses are counted for the admin dashboard.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+PREFIX = 'startup_page'
+DEFAULT_TIMEOUT = 600
+STATS = ('hits', 'misses')
+
+
+def startup_version(startup_id):
+    """``updated_at`` of the approved startup ``startup_id``, or ``None`` if there is none."""
+    from .models import Startup
+    return Startup.objects.filter(id=startup_id, approved=True).values_list('updated_at', flat=True).first()
+
+
+def fragment_key(name, startup_id, version, role):
+    stamp = version.timestamp() if hasattr(version, 'timestamp') else version
+    return f'{PREFIX}:{name}:{startup_id}:{stamp}:{role}'
+
+
+def get_fragment(key):
+    """Return the cached fragment at ``key`` or ``None``, counting the hit or miss."""
+    html = cache.get(key)
+    record('hits' if html is not None else 'misses')
+    return html
+
+
+def set_fragment(key, html):
+    cache.set(key, html, getattr(settings, 'STARTUP_PAGE_CACHE_TIMEOUT', DEFAULT_TIMEOUT))
+
+
+def record(stat):
+    key = f'{PREFIX}:stats:{stat}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def cache_stats():
+    """Hit and miss counts and the hit rate (a percentage, ``None`` before any lookup)."""
+    counts = cache.get_many([f'{PREFIX}:stats:{stat}' for stat in STATS])
+    stats = {stat: counts.get(f'{PREFIX}:stats:{stat}', 0) for stat in STATS}
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(100 * stats['hits'] / lookups) if lookups else None
+    return stats
@@ -0,0 +1,80 @@
+"""Bulk pitching: one startup applying to many investors at once.
+
+``pitch_to_investors`` replaces the old per-investor loop in
+``apply_to_investors``. It validates every id with a single ``in_bulk``
+query, skips investors that already have a pending application from the
+startup and inserts the rest with ``bulk_create`` in one transaction.
+Because ``bulk_create`` sends no ``post_save`` signals, the dashboard
+counters, the admin statistics and the investors' notification counters
+are updated here directly.
+"""
+from collections import namedtuple
+
+from django.db import transaction
+from accounts.notifications import adjust_many
+from admin_dashboard.stats import invalidate_platform_stats
+from investors.models import InvestorProfile
+from .counters import apply_deltas, apply_deltas_bulk, counter_deltas
+from .models import InvestmentApplication
+
+PitchResult = namedtuple('PitchResult', ['created', 'skipped', 'invalid'])
+
+
+def parse_investor_ids(raw_ids):
+    """Turn submitted ids into unique ints, keeping order. Returns ``(ids, invalid)``."""
+    ids, invalid, seen = [], 0, set()
+    for raw in raw_ids:
+        try:
+            pk = int(raw)
+        except (TypeError, ValueError):
+            invalid += 1
+            continue
+        if pk not in seen:
+            seen.add(pk)
+            ids.append(pk)
+    return ids, invalid
+
+
+def pitch_to_investors(startup, investor_ids, subject, message, amount, equity, batch_size=500):
+    """Create a pending application from ``startup`` to every investor in ``investor_ids``.
+
+    Returns a ``PitchResult`` with the number of applications created, the
+    number skipped because one was already pending and the number of ids
+    that did not match an investor.
+    """
+    ids, invalid = parse_investor_ids(investor_ids)
+    investors = InvestorProfile.objects.in_bulk(ids)
+    invalid += len(ids) - len(investors)
+
+    with transaction.atomic():
+        # Served by the (startup, status) index; cheaper than an IN list of ids.
+        pending = set(
+            InvestmentApplication.objects.filter(startup=startup, status='PENDING')
+            .values_list('investor_id', flat=True)
+        )
+        targets = [pk for pk in ids if pk in investors and pk not in pending]
+        InvestmentApplication.objects.bulk_create(
+            [
+                InvestmentApplication(
+                    startup=startup,
+                    investor_id=pk,
+                    subject=subject,
+                    message=message,
+                    amount_requested=amount,
+                    equity_offered=equity,
+                )
+                for pk in targets
+            ],
+            batch_size=batch_size,
+        )
+
+        if targets:
+            deltas = counter_deltas('applications', None, 'PENDING')
+            apply_deltas([(type(startup), startup.pk)], {k: v * len(targets) for k, v in deltas.items()})
+            apply_deltas_bulk(InvestorProfile, targets, deltas, batch_size=batch_size)
+
+    if targets:
+        invalidate_platform_stats()
+        adjust_many([investors[pk].user_id for pk in targets], 'pending_applications', 1)
+
+    return PitchResult(created=len(targets), skipped=len(investors) - len(targets), invalid=invalid)
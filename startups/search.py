@@ -0,0 +1,211 @@
+"""Full-text search over startups.
+
+Views call :func:`search_startups` with a ``Startup`` queryset and the raw
+search/filter strings from the request. The work is delegated to a search
+backend so the storage engine can be swapped without touching the views:
+
+* ``SQLiteFTSBackend`` keeps an FTS5 virtual table in sync with ``Startup``
+  and returns results ranked by bm25 with prefix matching. Besides the
+  startup's own fields it indexes the text extracted from its pitch deck
+  (``startups.decks``), weighted lowest.
+* ``IcontainsBackend`` is the plain ``LIKE '%x%'`` fallback used on databases
+  without a dedicated backend (e.g. until a Postgres tsvector backend exists).
+
+A different backend can be selected with the ``STARTUP_SEARCH_BACKEND``
+setting (a dotted path to a ``SearchBackend`` subclass).
+"""
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from .decks import deck_text
+
+# Columns stored in the index, in the order they are declared in the table.
+# 'deck' holds the pitch deck text; the others are Startup fields.
+INDEXED_FIELDS = ('name', 'niche', 'stage', 'vision', 'deck')
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class SearchBackend:
+    """Interface every search backend implements."""
+
+    def index(self, startup):
+        """Add or refresh a single startup in the index."""
+        raise NotImplementedError
+
+    def index_many(self, startups):
+        """Add or refresh several startups, e.g. after a ``bulk_create``."""
+        for startup in startups:
+            self.index(startup)
+
+    def remove(self, startup_id):
+        """Drop a startup from the index."""
+        raise NotImplementedError
+
+    def rebuild(self, startups, chunk_size=1000):
+        """Re-index every startup in ``startups``. Returns the number indexed."""
+        raise NotImplementedError
+
+    def search(self, queryset, text='', **columns):
+        """Narrow ``queryset`` to startups matching ``text`` and ``columns``.
+
+        ``text`` is matched against every indexed field, each keyword in
+        ``columns`` (e.g. ``niche='clean'``) only against that field.
+        """
+        raise NotImplementedError
+
+    def matching_ids(self, text='', **columns):
+        """Like :meth:`search`, but as a subquery for ``startup__in`` lookups."""
+        raise NotImplementedError
+
+
+class IcontainsBackend(SearchBackend):
+    """Fallback backend that searches with ``icontains`` and keeps no index."""
+
+    def index(self, startup):
+        pass
+
+    def remove(self, startup_id):
+        pass
+
+    def rebuild(self, startups, chunk_size=1000):
+        return 0
+
+    def search(self, queryset, text='', **columns):
+        if text:
+            queryset = queryset.filter(name__icontains=text)
+        for field, value in columns.items():
+            if value:
+                queryset = queryset.filter(**{f'{field}__icontains': value})
+        return queryset
+
+    def matching_ids(self, text='', **columns):
+        from .models import Startup
+        return self.search(Startup.objects.all(), text, **columns).values('pk')
+
+
+def indexed_values(startup):
+    """The values of ``INDEXED_FIELDS`` for ``startup``."""
+    deck = deck_text(startup.pitch_deck.name) if startup.pitch_deck_preview else ''
+    return [*(getattr(startup, field) or '' for field in INDEXED_FIELDS[:-1]), deck]
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """SQLite FTS5 backend.
+
+    The virtual table is created by the ``0005_startup_search_index``
+    migration (``0013_pitch_deck_preview`` adds the deck column) and uses the startup id as its rowid, so a match joins back to
+    ``startups_startup`` through the primary key.
+    """
+
+    table = 'startups_startup_fts'
+
+    def index(self, startup):
+        values = indexed_values(startup)
+        columns = ', '.join(INDEXED_FIELDS)
+        placeholders = ', '.join(['%s'] * len(INDEXED_FIELDS))
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [startup.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, {columns}) VALUES (%s, {placeholders})',
+                [startup.pk, *values],
+            )
+
+    def index_many(self, startups):
+        columns = ', '.join(INDEXED_FIELDS)
+        placeholders = ', '.join(['%s'] * (len(INDEXED_FIELDS) + 1))
+        rows = [[startup.pk, *indexed_values(startup)] for startup in startups]
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [[row[0]] for row in rows])
+            cursor.executemany(f'INSERT INTO {self.table} (rowid, {columns}) VALUES ({placeholders})', rows)
+
+    def remove(self, startup_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [startup_id])
+
+    def rebuild(self, startups, chunk_size=1000):
+        columns = ', '.join(INDEXED_FIELDS)
+        placeholders = ', '.join(['%s'] * (len(INDEXED_FIELDS) + 1))
+        insert = f'INSERT INTO {self.table} (rowid, {columns}) VALUES ({placeholders})'
+        fields = INDEXED_FIELDS[:-1]
+        rows = startups.values_list('pk', *fields, 'pitch_deck', 'pitch_deck_preview').iterator(chunk_size=chunk_size)
+
+        total = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            batch = []
+            for pk, *values, deck, preview in rows:
+                batch.append([pk, *(value or '' for value in values), deck_text(deck) if preview else ''])
+                if len(batch) >= chunk_size:
+                    cursor.executemany(insert, batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(insert, batch)
+                total += len(batch)
+            # Merge the b-tree segments written above into one.
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+        return total
+
+    def search(self, queryset, text='', **columns):
+        match = build_match_query(text, **columns)
+        if not match:
+            return queryset
+        db_table = queryset.model._meta.db_table
+        # The rank is an annotation rather than an extra select so it can be
+        # filtered on, which keyset pagination needs to resume after a row.
+        return queryset.extra(
+            tables=[self.table],
+            where=[f'{self.table}.rowid = {db_table}.id', f'{self.table} MATCH %s'],
+            params=[match],
+        ).annotate(search_rank=RawSQL(f'{self.table}.rank', [])).order_by('search_rank')
+
+    def matching_ids(self, text='', **columns):
+        # Queried on its own rather than through search(): the extra() join
+        # names startups_startup directly, which a subquery aliases away.
+        match = build_match_query(text, **columns)
+        if not match:
+            from .models import Startup
+            return Startup.objects.values('pk')
+        return RawSQL(f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', [match])
+
+
+def build_match_query(text='', **columns):
+    """Build an FTS5 MATCH expression with prefix matching on every keyword.
+
+    User input is reduced to word tokens and each one is quoted, so FTS5
+    operators typed into the search box are treated as plain words.
+    """
+    def terms(value):
+        return ' '.join(f'"{token}"*' for token in TOKEN_RE.findall(value or ''))
+
+    parts = [terms(text)] if terms(text) else []
+    for field, value in columns.items():
+        if field not in INDEXED_FIELDS:
+            raise ValueError(f'{field!r} is not an indexed field')
+        if terms(value):
+            parts.append(f'{field} : ({terms(value)})')
+    return ' AND '.join(parts)
+
+
+def get_backend():
+    """Return the configured backend, defaulting to FTS5 on SQLite."""
+    path = getattr(settings, 'STARTUP_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == 'sqlite':
+        return SQLiteFTSBackend()
+    return IcontainsBackend()
+
+
+def search_startups(queryset, search='', niche='', stage=''):
+    """Apply the browse page search box and niche/stage filters to ``queryset``."""
+    return get_backend().search(queryset, search, niche=niche, stage=stage)
+
+
+def matching_startup_ids(search='', niche='', stage=''):
+    """Subquery of the ids of startups matching ``search``/``niche``/``stage``."""
+    return get_backend().matching_ids(search, niche=niche, stage=stage)
@@ -0,0 +1,139 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from investors.models import InvestorProfile
+from manufacturers.models import ConnectionRequest, ManufacturerProfile
+from accounts.notifications import adjust
+from .counters import counter_deltas, record_change
+from . import facets
+from .models import TRACKED_FIELDS, InvestmentApplication, Startup
+from .search import get_backend
+from .tasks import process_pitch_deck_task
+
+
+@receiver(post_save, sender=Startup)
+def index_startup(sender, instance, **kwargs):
+    get_backend().index(instance)
+
+
+@receiver(pre_save, sender=Startup)
+def detect_pitch_deck_change(sender, instance, update_fields=None, **kwargs):
+    name = instance.pitch_deck.name or ''
+    if update_fields is not None and 'pitch_deck' not in update_fields:
+        instance._pitch_deck_changed = False
+        return
+    if instance._state.adding:
+        previous = ''
+    elif getattr(instance, '_loaded_pitch_deck', None) is not None:
+        previous = instance._loaded_pitch_deck
+    else:
+        previous = sender.objects.filter(pk=instance.pk).values_list('pitch_deck', flat=True).first()
+    instance._pitch_deck_changed = name != (previous or '')
+    if instance._pitch_deck_changed:
+        # The old preview describes the old deck; the new one comes from the task below.
+        instance.pitch_deck_preview = {}
+
+
+@receiver(post_save, sender=Startup)
+def queue_pitch_deck_processing(sender, instance, **kwargs):
+    if not getattr(instance, '_pitch_deck_changed', False):
+        return
+    instance._pitch_deck_changed = False
+    instance._loaded_pitch_deck = instance.pitch_deck.name or ''
+    if instance.pitch_deck:
+        process_pitch_deck_task.delay(instance.pk)
+
+
+@receiver(pre_save, sender=Startup)
+def assign_facet_tags(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding:
+        previous = None
+    elif getattr(instance, '_loaded_values', None) is not None:
+        previous = instance._loaded_values
+    else:
+        previous = sender.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS).first()
+    if update_fields is None:
+        facets.assign(instance, previous)
+    # Read by the post_save handlers here and in investors.signals.
+    instance._previous_values = previous
+
+
+def facet_key(values):
+    return values and facets.facet_key(values['approved'], values['niche_tag_id'], values['stage_tag_id'])
+
+
+@receiver(post_save, sender=Startup)
+def update_facet_counts_on_save(sender, instance, **kwargs):
+    old = facet_key(getattr(instance, '_previous_values', None))
+    new = facet_key(instance.tracked_values())
+    facets.record_change(old, new)
+    if old or new:
+        # Any edit to an approved startup can change which searches match it.
+        facets.invalidate()
+
+
+@receiver(post_delete, sender=Startup)
+def update_facet_counts_on_delete(sender, instance, **kwargs):
+    old = facet_key(getattr(instance, '_loaded_values', None) or instance.tracked_values())
+    if old:
+        facets.record_change(old, None)
+        facets.invalidate()
+
+
+@receiver(post_delete, sender=Startup)
+def unindex_startup(sender, instance, **kwargs):
+    get_backend().remove(instance.pk)
+
+
+def notify_pending_change(kind, instance, old_status, new_status):
+    """Keep the reviewer's cached notification counter in step."""
+    delta = counter_deltas(kind, old_status, new_status).get(f'{kind}_pending')
+    if not delta:
+        return
+    if kind == 'applications':
+        user_id = InvestorProfile.objects.filter(pk=instance.investor_id).values_list('user_id', flat=True).first()
+    else:
+        user_id = Startup.objects.filter(pk=instance.startup_id).values_list('founder_id', flat=True).first()
+    if user_id is not None:
+        adjust(user_id, f'pending_{kind}', delta)
+
+
+def counter_owners(instance):
+    if isinstance(instance, InvestmentApplication):
+        return 'applications', [(Startup, instance.startup_id), (InvestorProfile, instance.investor_id)]
+    return 'connections', [(Startup, instance.startup_id), (ManufacturerProfile, instance.manufacturer_id)]
+
+
+@receiver(pre_save, sender=InvestmentApplication)
+@receiver(pre_save, sender=ConnectionRequest)
+def remember_previous_status(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding:
+        instance._previous_status = None
+    elif update_fields is not None and 'status' not in update_fields:
+        instance._previous_status = instance.status
+    elif getattr(instance, '_loaded_status', None) is not None:
+        instance._previous_status = instance._loaded_status
+    else:
+        instance._previous_status = (
+            sender.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=InvestmentApplication)
+@receiver(post_save, sender=ConnectionRequest)
+def update_counters_on_save(sender, instance, created, **kwargs):
+    old_status = None if created else instance._previous_status
+    if not created and old_status == instance.status:
+        return
+    kind, owners = counter_owners(instance)
+    record_change(kind, owners, old_status, instance.status)
+    notify_pending_change(kind, instance, old_status, instance.status)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=InvestmentApplication)
+@receiver(post_delete, sender=ConnectionRequest)
+def update_counters_on_delete(sender, instance, **kwargs):
+    status = getattr(instance, '_loaded_status', None) or instance.status
+    kind, owners = counter_owners(instance)
+    record_change(kind, owners, status, None)
+    notify_pending_change(kind, instance, status, None)
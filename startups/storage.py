@@ -0,0 +1,154 @@
+"""Content-addressed storage for pitch decks.
+
+A deck is stored as ``pitch_decks/<sha256[:2]>/<sha256><ext>`` under
+``settings.PITCH_DECK_ROOT``, named after its content:
+
+* uploads are copied to disk chunk by chunk while being hashed, so memory
+  use does not grow with the deck (uploads Django already spooled to a
+  temporary file are hashed and then moved, not copied);
+* the same deck uploaded twice is stored once and both startups point at it;
+* the file is moved into place atomically, so readers never see half a deck.
+
+Replacing a deck leaves the old file behind, since other startups may share
+it. ``collect_garbage`` (the ``gc_pitch_decks`` command) deletes files no
+startup refers to, along with their previews (see ``startups.decks``);
+``adopt_legacy`` moves decks saved under their upload name before this
+storage existed to their content-addressed name.
+"""
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+PREFIX = 'pitch_decks'
+CHUNK_SIZE = 1024 * 1024
+TEMP_PREFIX = '.upload-'
+CONTENT_NAME_RE = re.compile(rf'^{PREFIX}/([0-9a-f]{{2}})/(\1[0-9a-f]{{62}})(\.[\w]+)?$')
+
+
+def content_name(digest, ext):
+    return f'{PREFIX}/{digest[:2]}/{digest}{ext}'
+
+
+def content_digest(name):
+    """The SHA-256 a content-addressed ``name`` was derived from, or ``None`` for a legacy name."""
+    match = CONTENT_NAME_RE.match(name)
+    return match.group(2) if match else None
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage under ``settings.PITCH_DECK_ROOT`` that names files by their SHA-256."""
+
+    @property
+    def base_location(self):
+        return str(settings.PITCH_DECK_ROOT)
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+    def get_available_name(self, name, max_length=None):
+        # _save names the file after its content: an existing file is a duplicate, not a clash.
+        return name
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()
+        directory = self.path(PREFIX)
+        os.makedirs(directory, exist_ok=True)
+
+        if hasattr(content, 'temporary_file_path'):
+            source = content.temporary_file_path()
+            digest = file_digest(source)
+        else:
+            fd, source = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+            sha = hashlib.sha256()
+            try:
+                with os.fdopen(fd, 'wb') as out:
+                    for chunk in content.chunks(CHUNK_SIZE):
+                        sha.update(chunk)
+                        out.write(chunk)
+            except BaseException:
+                os.unlink(source)
+                raise
+            digest = sha.hexdigest()
+
+        final = content_name(digest, ext)
+        path = self.path(final)
+        if os.path.exists(path):
+            if not hasattr(content, 'temporary_file_path'):
+                os.unlink(source)
+            # Refresh the mtime so collect_garbage gives the new reference its grace period.
+            os.utime(path)
+            return final
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if hasattr(content, 'temporary_file_path'):
+            file_move_safe(source, path)
+        else:
+            os.replace(source, path)
+        if self.file_permissions_mode is not None:
+            os.chmod(path, self.file_permissions_mode)
+        return final
+
+
+pitch_deck_storage = ContentAddressedStorage()
+
+
+def referenced_names():
+    from .models import Startup
+    return set(Startup.objects.exclude(pitch_deck='').values_list('pitch_deck', flat=True))
+
+
+def collect_garbage(storage=pitch_deck_storage, min_age=3600, dry_run=False):
+    """Delete deck files no startup refers to and return their names.
+
+    Files younger than ``min_age`` seconds are kept: their startup row may
+    not be committed yet. Leftover temporary files count as orphans, and a
+    deck's derivatives live and die with the deck.
+    """
+    from .decks import derivative_stem
+    referenced = referenced_names()
+    referenced_stems = {os.path.splitext(name)[0] for name in referenced}
+    cutoff = time.time() - min_age
+    removed = []
+    for directory, _dirs, files in os.walk(storage.path(PREFIX)):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, storage.location).replace(os.sep, '/')
+            if name in referenced or derivative_stem(name) in referenced_stems:
+                continue
+            if os.path.getmtime(path) > cutoff:
+                continue
+            if not dry_run:
+                os.unlink(path)
+            removed.append(name)
+    return removed
+
+
+def adopt_legacy(storage=pitch_deck_storage):
+    """Re-save decks stored under their upload name by content; returns ``{old: new}``."""
+    from .models import Startup
+    renamed = {}
+    for pk, name in Startup.objects.exclude(pitch_deck='').values_list('pk', 'pitch_deck'):
+        if content_digest(name) or not storage.exists(name):
+            continue
+        if name not in renamed:
+            with storage.open(name) as f:
+                renamed[name] = storage.save(name, f)
+        Startup.objects.filter(pk=pk).update(pitch_deck=renamed[name])
+    return renamed
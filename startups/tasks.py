@@ -0,0 +1,29 @@
+from django.utils import timezone
+from jobs.registry import task
+from . import decks
+from .models import Startup
+from .pitching import pitch_to_investors
+from .search import get_backend
+
+
+@task(priority=5)
+def pitch_to_investors_task(startup_id, investor_ids, subject, message, amount, equity):
+    """Background version of pitch_to_investors for large fan-outs."""
+    startup = Startup.objects.get(pk=startup_id)
+    pitch_to_investors(startup, investor_ids, subject, message, amount, equity)
+
+
+@task(priority=3)
+def process_pitch_deck_task(startup_id, force=False):
+    """Extract a startup's pitch deck preview and index the deck's text."""
+    startup = Startup.objects.filter(pk=startup_id).first()
+    if startup is None or not startup.pitch_deck:
+        return
+    name = startup.pitch_deck.name
+    preview = decks.process(name, force=force)
+    # update() so a deck replaced meanwhile is left to its own job; updated_at
+    # moves because the detail pages show the preview and cache fragments per updated_at.
+    if Startup.objects.filter(pk=startup_id, pitch_deck=name).update(
+            pitch_deck_preview=preview, updated_at=timezone.now()):
+        startup.pitch_deck_preview = preview
+        get_backend().index(startup)
@@ -0,0 +1,45 @@
+from django import template
+from startups import page_cache
+
+register = template.Library()
+
+
+class StartupCacheNode(template.Node):
+    def __init__(self, nodelist, name, startup_id, version):
+        self.nodelist = nodelist
+        self.name = name
+        self.startup_id = startup_id
+        self.version = version
+
+    def render(self, context):
+        request = context.get('request')
+        role = getattr(getattr(request, 'user', None), 'role', '')
+        key = page_cache.fragment_key(self.name.resolve(context), self.startup_id.resolve(context),
+                                      self.version.resolve(context), role)
+        html = page_cache.get_fragment(key)
+        if html is None:
+            html = self.nodelist.render(context)
+            page_cache.set_fragment(key, html)
+        return html
+
+
+@register.tag
+def startupcache(parser, token):
+    """Cache the enclosed template fragment for one startup and the viewer's role.
+
+    Usage::
+
+        {% load startup_cache %}
+        {% startupcache "detail" startup_id startup_version %} ... {% endstartupcache %}
+
+    The fragment must only depend on that startup: it is shared by every
+    viewer with the same role and keyed on the startup's ``updated_at``, so
+    it is no longer used once the startup is saved.
+    """
+    bits = token.split_contents()
+    if len(bits) != 4:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' takes a fragment name, a startup id and the startup's updated_at.")
+    nodelist = parser.parse(('endstartupcache',))
+    parser.delete_first_token()
+    return StartupCacheNode(nodelist, *(parser.compile_filter(bit) for bit in bits[1:]))
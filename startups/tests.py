@@ -1,8 +1,32 @@
-from django.test import TestCase
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from accounts.models import User
+from django.utils import timezone
+from accounts.models import Message, User
+from jobs.models import Job
+from jobs.worker import Worker
 from investors.models import InvestorProfile
-from startups.models import Startup, InvestmentApplication
+from manufacturers.models import ConnectionRequest, ManufacturerProfile
+from startups import decks, facets
+from startups.models import FacetCount, Niche, Stage, Startup, InvestmentApplication
+from startups.decks import derivative_name, thumbnail_name, write_derivative
+from startups.page_cache import cache_stats
+from startups.storage import collect_garbage, content_digest, pitch_deck_storage
+from startups.pitching import PitchResult, pitch_to_investors
+from startups.search import search_startups
+from startups.tasks import process_pitch_deck_task
+from venturehub.pagination import CursorPaginator, keyset_filter
 
 
 class StartupApplicationTests(TestCase):
@@ -122,3 +146,676 @@ class StartupApplicationTests(TestCase):
         response = self.client.post(url)
         # should not delete rejected applications
         self.assertTrue(InvestmentApplication.objects.filter(id=app.id).exists())
+
+
+class StartupSearchTests(TestCase):
+    def setUp(self):
+        self.investor_user = User.objects.create_user(
+            username='i1', email='i1@example.com', password='pass', role='INVESTOR'
+        )
+        self.food = self._make_startup('food', 'FoodTech Labs', 'Food Technology', 'Seed')
+        self.energy = self._make_startup('energy', 'GreenErgy', 'Clean Energy', 'Series B')
+
+    def _make_startup(self, username, name, niche, stage):
+        user = User.objects.create_user(username=username, password='pass', role='STARTUP')
+        startup = Startup.objects.get(founder=user)
+        startup.name = name
+        startup.niche = niche
+        startup.stage = stage
+        startup.approved = True
+        startup.save()
+        return startup
+
+    def test_prefix_search_across_fields(self):
+        results = search_startups(Startup.objects.all(), search='tech')
+        self.assertEqual(list(results), [self.food])
+
+    def test_niche_and_stage_filters(self):
+        results = search_startups(Startup.objects.all(), niche='clean', stage='series')
+        self.assertEqual(list(results), [self.energy])
+        results = search_startups(Startup.objects.all(), niche='clean', stage='seed')
+        self.assertEqual(list(results), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.food.name = 'Orbital Kitchens'
+        self.food.save()
+        self.assertEqual(list(search_startups(Startup.objects.all(), search='orbit')), [self.food])
+        self.assertEqual(list(search_startups(Startup.objects.all(), search='foodtech')), [])
+
+        self.food.delete()
+        self.assertEqual(list(search_startups(Startup.objects.all(), search='orbit')), [])
+
+    def test_operators_in_query_are_treated_as_words(self):
+        results = search_startups(Startup.objects.all(), search='green OR "(')
+        self.assertEqual(list(results), [])
+
+    def test_rebuild_command(self):
+        Startup.objects.filter(pk=self.energy.pk).update(name='Sunrise Power')
+        call_command('rebuild_search_index', stdout=StringIO())
+        results = search_startups(Startup.objects.all(), search='sunrise')
+        self.assertEqual(list(results), [self.energy])
+
+    def test_browse_view_uses_search(self):
+        self.client.login(username='i1', password='pass')
+        response = self.client.get(reverse('browse_startups'), {'search': 'green'})
+        self.assertContains(response, 'GreenErgy')
+        self.assertNotContains(response, 'FoodTech Labs')
+
+
+class DashboardCounterTests(TestCase):
+    def setUp(self):
+        self.startup_user = User.objects.create_user(username='s1', password='pass', role='STARTUP')
+        self.startup = Startup.objects.get(founder=self.startup_user)
+        inv_user = User.objects.create_user(username='i1', password='pass', role='INVESTOR')
+        self.investor = InvestorProfile.objects.get(user=inv_user)
+        man_user = User.objects.create_user(username='m1', password='pass', role='MANUFACTURER')
+        self.manufacturer = ManufacturerProfile.objects.get(user=man_user)
+
+    def _apply(self, **kwargs):
+        return InvestmentApplication.objects.create(
+            startup=self.startup, investor=self.investor, message='hi',
+            amount_requested=1000, equity_offered=5, **kwargs
+        )
+
+    def _counters(self, obj, kind):
+        obj.refresh_from_db()
+        return (getattr(obj, f'{kind}_total'), getattr(obj, f'{kind}_pending'),
+                getattr(obj, f'{kind}_accepted'))
+
+    def test_application_lifecycle(self):
+        app = self._apply()
+        self._apply(status='ACCEPTED')
+        self.assertEqual(self._counters(self.startup, 'applications'), (2, 1, 1))
+        self.assertEqual(self._counters(self.investor, 'applications'), (2, 1, 1))
+
+        app = InvestmentApplication.objects.get(pk=app.pk)
+        app.status = 'ACCEPTED'
+        app.save()
+        self.assertEqual(self._counters(self.investor, 'applications'), (2, 0, 2))
+
+        app.delete()
+        self.assertEqual(self._counters(self.startup, 'applications'), (1, 0, 1))
+        self.assertEqual(self._counters(self.investor, 'applications'), (1, 0, 1))
+
+    def test_connection_lifecycle(self):
+        conn = ConnectionRequest.objects.create(manufacturer=self.manufacturer, startup=self.startup)
+        self.assertEqual(self._counters(self.manufacturer, 'connections'), (1, 1, 0))
+        conn.status = 'ACCEPTED'
+        conn.save()
+        self.assertEqual(self._counters(self.startup, 'connections'), (1, 0, 1))
+        self.manufacturer.user.delete()
+        self.assertEqual(self._counters(self.startup, 'connections'), (0, 0, 0))
+
+    def test_reconcile_repairs_drift(self):
+        self._apply()
+        Startup.objects.filter(pk=self.startup.pk).update(applications_total=42, connections_pending=7)
+        call_command('reconcile_counters', stdout=StringIO())
+        self.assertEqual(self._counters(self.startup, 'applications'), (1, 1, 0))
+        self.assertEqual(self._counters(self.startup, 'connections'), (0, 0, 0))
+
+    def test_dashboard_reads_counters(self):
+        self._apply()
+        self.client.login(username='s1', password='pass')
+        response = self.client.get(reverse('startup_dashboard'))
+        self.assertEqual(response.context['total_apps'], 1)
+        self.assertEqual(response.context['pending_apps'], 1)
+
+
+class QueryPlanTests(TestCase):
+    """Fail when a hot listing query stops using an index."""
+
+    def hot_queries(self):
+        return {
+            'approved startups': Startup.objects.filter(approved=True),
+            'startup applications': InvestmentApplication.objects.filter(startup=1).order_by('-created_at'),
+            'startup applications by status': InvestmentApplication.objects.filter(
+                startup=1, status='PENDING').order_by('-created_at'),
+            'investor applications': InvestmentApplication.objects.filter(
+                investor__user=1).order_by('-created_at'),
+            'investor applications by status': InvestmentApplication.objects.filter(
+                investor=1, status='PENDING').order_by('-created_at'),
+            'applications by status': InvestmentApplication.objects.filter(
+                status='PENDING').order_by('-created_at'),
+            'manufacturer connections': ConnectionRequest.objects.filter(
+                manufacturer=1).order_by('-created_at'),
+            'manufacturer connections by status': ConnectionRequest.objects.filter(
+                manufacturer=1, status='PENDING'),
+            'startup connections': ConnectionRequest.objects.filter(startup=1).order_by('-created_at'),
+            'connections by status': ConnectionRequest.objects.filter(
+                status='PENDING').order_by('-created_at'),
+            'inbox': Message.objects.filter(recipient=1),
+            'unread messages': Message.objects.filter(recipient=1, is_read=False),
+            'sent messages': Message.objects.filter(sender=1),
+            'startup applications after cursor': InvestmentApplication.objects.filter(startup=1).filter(
+                keyset_filter(['-created_at', '-pk'], [timezone.now(), 1])).order_by('-created_at', '-pk'),
+            'approved startups after cursor': Startup.objects.filter(approved=True).filter(
+                keyset_filter(['-id'], [1])).order_by('-id'),
+            'approved startups by niche': Startup.objects.filter(approved=True, niche_tag=1).order_by('-id'),
+            'approved startups by valuation': Startup.objects.filter(
+                approved=True, valuation__gte=10**6, valuation__lte=10**8).order_by('-valuation', '-id'),
+            'approved startups recently updated': Startup.objects.filter(approved=True).order_by('-updated_at', '-id'),
+        }
+
+    def test_hot_queries_use_indexes(self):
+        for name, queryset in self.hot_queries().items():
+            with self.subTest(name):
+                plan = queryset.explain()
+                for line in plan.splitlines():
+                    self.assertNotRegex(line, r'\bSCAN \w+\s*$', f'full table scan:\n{plan}')
+                    self.assertNotIn('USE TEMP B-TREE', line, f'unindexed sort:\n{plan}')
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        founder = User.objects.create_user(username='s1', password='pass', role='STARTUP')
+        self.startup = Startup.objects.get(founder=founder)
+        # Every row shares one timestamp, so only the id tie-breaker orders them.
+        created_at = timezone.now()
+        for n in range(25):
+            investor = User.objects.create_user(username=f'i{n}', role='INVESTOR')
+            InvestmentApplication.objects.create(
+                startup=self.startup, investor=InvestorProfile.objects.get(user=investor),
+                message='hi', amount_requested=1000, equity_offered=5, created_at=created_at,
+            )
+        self.queryset = InvestmentApplication.objects.filter(startup=self.startup).order_by('-created_at')
+        self.expected = list(self.queryset.order_by('-created_at', '-pk').values_list('pk', flat=True))
+
+    def test_walks_forward_and_back_without_gaps(self):
+        paginator = CursorPaginator(self.queryset, 10)
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([app.pk for page in pages for app in page], self.expected)
+
+        back = paginator.get_page(pages[-1].previous_cursor)
+        self.assertEqual([app.pk for app in back], [app.pk for app in pages[1]])
+        first = paginator.get_page(back.previous_cursor)
+        self.assertEqual([app.pk for app in first], self.expected[:10])
+        self.assertFalse(first.has_previous())
+
+    def test_tampered_or_foreign_cursor_restarts(self):
+        paginator = CursorPaginator(self.queryset, 10)
+        cursor = paginator.get_page().next_cursor
+        self.assertEqual([app.pk for app in paginator.get_page(cursor + 'x')], self.expected[:10])
+        other = CursorPaginator(self.queryset.order_by('amount_requested'), 10)
+        self.assertFalse(other.get_page(cursor).has_previous())
+
+    def test_approximate_total(self):
+        self.assertEqual(CursorPaginator(self.queryset, 10, count_limit=20).count(), (20, False))
+        self.assertEqual(CursorPaginator(self.queryset, 10, count_limit=100).count(), (25, True))
+
+    def test_history_view_links_pages(self):
+        self.client.login(username='s1', password='pass')
+        url = reverse('startup_applications_history')
+        response = self.client.get(url)
+        page = response.context['page_obj']
+        self.assertEqual((page.total, page.total_is_exact), (25, True))
+        response = self.client.get(f'{url}?{page.next_query}')
+        self.assertEqual([app.pk for app in response.context['applications']], self.expected[10:20])
+
+    def test_search_results_page_by_rank(self):
+        for n in range(5):
+            founder = User.objects.create_user(username=f'f{n}', role='STARTUP')
+            Startup.objects.filter(founder=founder).update(approved=True)
+            startup = Startup.objects.get(founder=founder)
+            startup.name = f'Rocket {"rocket " * n}Labs'
+            startup.save()
+        ranked = search_startups(Startup.objects.order_by('-id'), search='rocket')
+        paginator = CursorPaginator(ranked, 2)
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        self.assertEqual([s.pk for page in pages for s in page], [s.pk for s in ranked.order_by('search_rank', 'pk')])
+
+
+class QueryCountTests(TestCase):
+    """Listing views must run the same number of queries however many rows they show."""
+
+    def setUp(self):
+        self.startup_user = User.objects.create_user(username='s1', password='pass', role='STARTUP')
+        self.startup = Startup.objects.get(founder=self.startup_user)
+        self.investor_user = User.objects.create_user(username='i1', password='pass', role='INVESTOR')
+        self.investor = InvestorProfile.objects.get(user=self.investor_user)
+        self.manufacturer_user = User.objects.create_user(username='m1', password='pass', role='MANUFACTURER')
+        self.manufacturer = ManufacturerProfile.objects.get(user=self.manufacturer_user)
+        User.objects.create_user(username='admin', password='pass', role='ADMIN')
+        self.rows = 0
+
+    def add_rows(self, count):
+        """Add ``count`` related rows to every listing under test."""
+        for _ in range(count):
+            self.rows += 1
+            n = self.rows
+            # Users without a password skip hashing, which keeps this fast.
+            founder = User.objects.create_user(username=f'founder{n}', role='STARTUP')
+            investor = User.objects.create_user(username=f'investor{n}', role='INVESTOR')
+            maker = User.objects.create_user(username=f'maker{n}', role='MANUFACTURER')
+            other_startup = Startup.objects.get(founder=founder)
+            for startup, investor_profile in [
+                (self.startup, InvestorProfile.objects.get(user=investor)),
+                (other_startup, self.investor),
+            ]:
+                InvestmentApplication.objects.create(
+                    startup=startup, investor=investor_profile, message='hi',
+                    amount_requested=1000, equity_offered=5,
+                )
+            ConnectionRequest.objects.create(manufacturer=ManufacturerProfile.objects.get(user=maker),
+                                             startup=self.startup)
+            ConnectionRequest.objects.create(manufacturer=self.manufacturer, startup=other_startup)
+            Message.objects.create(sender=founder, recipient=self.investor_user, subject='hi', content='hi')
+            Message.objects.create(sender=self.investor_user, recipient=maker, subject='hi', content='hi')
+
+    def count_queries(self, url):
+        # Measure the uncached path so cached counters don't hide a query.
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertConstantQueries(self, username, url_name):
+        self.client.login(username=username, password='pass')
+        self.add_rows(1)
+        first = self.count_queries(reverse(url_name))
+        self.add_rows(3)
+        self.assertEqual(self.count_queries(reverse(url_name)), first,
+                         f'{url_name} runs more queries as rows are added')
+
+    def test_startup_listings(self):
+        for url_name in ['startup_dashboard', 'startup_applications_history', 'startup_connection_history']:
+            with self.subTest(url_name):
+                self.assertConstantQueries('s1', url_name)
+
+    def test_investor_listings(self):
+        for url_name in ['investor_dashboard', 'investor_applications', 'inbox', 'sent_messages']:
+            with self.subTest(url_name):
+                self.assertConstantQueries('i1', url_name)
+
+    def test_manufacturer_listings(self):
+        for url_name in ['manufacturer_dashboard', 'connection_history']:
+            with self.subTest(url_name):
+                self.assertConstantQueries('m1', url_name)
+
+    def test_admin_listings(self):
+        for url_name in ['admin_dashboard', 'manage_startups', 'manage_applications',
+                         'manage_connections', 'manage_users']:
+            with self.subTest(url_name):
+                self.assertConstantQueries('admin', url_name)
+
+
+class BulkPitchTests(TestCase):
+    def setUp(self):
+        founder = User.objects.create_user(username='s1', role='STARTUP')
+        self.startup = Startup.objects.get(founder=founder)
+        self.investors = [
+            InvestorProfile.objects.get(user=User.objects.create_user(username=f'i{n}', role='INVESTOR'))
+            for n in range(5)
+        ]
+
+    def pitch(self, ids):
+        return pitch_to_investors(self.startup, ids, 'Seed', 'hi', '1000', '5')
+
+    def test_creates_in_constant_queries(self):
+        ids = [str(inv.id) for inv in self.investors]
+        with self.assertNumQueries(7):
+            result = self.pitch(ids)
+        self.assertEqual(result, PitchResult(created=5, skipped=0, invalid=0))
+        self.assertEqual(InvestmentApplication.objects.filter(startup=self.startup).count(), 5)
+
+    def test_skips_pending_and_invalid_ids(self):
+        self.pitch([self.investors[0].id])
+        result = self.pitch([self.investors[0].id, self.investors[1].id, self.investors[1].id, 'x', 999999])
+        self.assertEqual(result, PitchResult(created=1, skipped=1, invalid=2))
+
+    def test_updates_counters(self):
+        self.pitch([inv.id for inv in self.investors[:3]])
+        self.startup.refresh_from_db()
+        self.investors[0].refresh_from_db()
+        self.assertEqual((self.startup.applications_total, self.startup.applications_pending), (3, 3))
+        self.assertEqual((self.investors[0].applications_total, self.investors[0].applications_pending), (1, 1))
+
+    @override_settings(BULK_PITCH_BACKGROUND_THRESHOLD=3)
+    def test_large_fan_out_goes_to_worker(self):
+        self.startup.founder.set_password('pass')
+        self.startup.founder.save()
+        self.client.login(username='s1', password='pass')
+        self.client.post(reverse('apply_to_investors'), {
+            'investor_ids': [inv.id for inv in self.investors],
+            'message': 'hi', 'amount': '1000', 'equity': '5',
+        })
+        self.assertFalse(InvestmentApplication.objects.exists())
+        Worker().run(burst=True)
+        self.assertEqual(InvestmentApplication.objects.filter(startup=self.startup).count(), 5)
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        founder = User.objects.create_user(username='founder', role='STARTUP')
+        self.startup = Startup.objects.get(founder=founder)
+        self.startup.name = 'Acme Robotics'
+        self.startup.approved = True
+        self.startup.save()
+        self.investor = User.objects.create_user(username='ivy', role='INVESTOR')
+        self.maker = User.objects.create_user(username='max', role='MANUFACTURER')
+
+    def get_detail(self, url_name='startup_detail_investor'):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url_name, args=[self.startup.pk]))
+        # Only full-row loads count; the conditional GET validator reads updated_at alone.
+        return response, [q['sql'] for q in queries if '"startups_startup"."vision"' in q['sql']]
+
+    def test_detail_is_served_from_cache_until_saved(self):
+        self.client.force_login(self.investor)
+        response, startup_queries = self.get_detail()
+        self.assertContains(response, 'Acme Robotics')
+        self.assertEqual(len(startup_queries), 1)
+
+        response, startup_queries = self.get_detail()
+        self.assertContains(response, 'Acme Robotics')
+        self.assertEqual(startup_queries, [])
+
+        self.startup.name = 'Acme Drones'
+        self.startup.save()
+        response, startup_queries = self.get_detail()
+        self.assertContains(response, 'Acme Drones')
+        self.assertEqual(len(startup_queries), 1)
+        self.assertEqual(cache_stats(), {'hits': 1, 'misses': 2, 'hit_rate': 33})
+
+    def test_fragments_are_per_role(self):
+        self.client.force_login(self.investor)
+        self.get_detail()
+        self.client.force_login(self.maker)
+        response, startup_queries = self.get_detail('startup_detail')
+        self.assertContains(response, 'Acme Robotics')
+        self.assertContains(response, 'Send Connection Request')
+        self.assertEqual(len(startup_queries), 1)
+
+    def test_approval_flip_invalidates(self):
+        self.client.force_login(self.investor)
+        self.get_detail()
+        admin = User.objects.create_user(username='root', role='ADMIN')
+        self.client.force_login(admin)
+        self.client.get(reverse('startup_approval', args=[self.startup.pk, 'reject']))
+        self.client.force_login(self.investor)
+        response, _queries = self.get_detail()
+        self.assertEqual(response.status_code, 404)
+
+    def test_changes_from_other_processes_are_seen(self):
+        # e.g. the worker storing a deck preview: no signal reaches this process's cache.
+        self.client.force_login(self.investor)
+        self.get_detail()
+        Startup.objects.filter(pk=self.startup.pk).update(name='Acme Drones', updated_at=timezone.now())
+        response, startup_queries = self.get_detail()
+        self.assertContains(response, 'Acme Drones')
+        self.assertEqual(len(startup_queries), 1)
+        Startup.objects.filter(pk=self.startup.pk).update(approved=False)
+        response, _queries = self.get_detail()
+        self.assertEqual(response.status_code, 404)
+
+    def test_browse_cards_are_cached(self):
+        self.client.force_login(self.investor)
+        self.client.get(reverse('browse_startups'))
+        response = self.client.get(reverse('browse_startups'))
+        self.assertContains(response, reverse('startup_detail_investor', args=[self.startup.pk]))
+        self.assertEqual(cache_stats()['hits'], 1)
+
+
+class UploadDeckMixin:
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        settings_override = self.settings(PITCH_DECK_ROOT=root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.founder = User.objects.create_user(username='founder', role='STARTUP')
+        self.startup = Startup.objects.get(founder=self.founder)
+        self.startup.name = 'Acme'
+        self.startup.approved = True
+        self.startup.save()
+        self.investor = User.objects.create_user(username='ivy', role='INVESTOR')
+
+    def upload(self, content=None):
+        self.client.force_login(self.founder)
+        self.client.post(reverse('startup_profile'), {
+            'name': 'Acme', 'pitch_deck': SimpleUploadedFile('deck.pdf', content or self.DECK),
+        })
+        self.startup.refresh_from_db()
+        return self.startup.pitch_deck.name
+
+
+class PitchDeckTests(UploadDeckMixin, TestCase):
+    DECK = b'%PDF-1.4 ' + bytes(range(256)) * 40
+
+    def test_identical_decks_are_stored_once(self):
+        name = self.upload()
+        self.assertIsNotNone(content_digest(name))
+        self.assertEqual(pitch_deck_storage.save('other.pdf', ContentFile(self.DECK)), name)
+        directory = os.path.dirname(pitch_deck_storage.path(name))
+        self.assertEqual(os.listdir(directory), [os.path.basename(name)])
+
+    def test_range_requests(self):
+        self.upload()
+        self.client.force_login(self.investor)
+        url = reverse('pitch_deck', args=[self.startup.pk])
+
+        full = self.client.get(url)
+        self.assertEqual(full.status_code, 200)
+        self.assertEqual(b''.join(full.streaming_content), self.DECK)
+        self.assertEqual(full['Accept-Ranges'], 'bytes')
+
+        part = self.client.get(url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(part.status_code, 206)
+        self.assertEqual(part['Content-Range'], f'bytes 100-199/{len(self.DECK)}')
+        self.assertEqual(b''.join(part.streaming_content), self.DECK[100:200])
+
+        tail = self.client.get(url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(tail.streaming_content), self.DECK[-10:])
+        self.assertEqual(self.client.get(url, HTTP_RANGE=f'bytes={len(self.DECK)}-').status_code, 416)
+        stale = self.client.get(url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=full['ETag']).status_code, 304)
+
+    def test_web_server_offload(self):
+        name = self.upload()
+        self.client.force_login(self.investor)
+        url = reverse('pitch_deck', args=[self.startup.pk])
+        with self.settings(PITCH_DECK_SENDFILE='x-accel-redirect', PITCH_DECK_ACCEL_PREFIX='/protected/'):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected/{name}')
+        self.assertEqual(response.content, b'')
+        with self.settings(PITCH_DECK_SENDFILE='x-sendfile'):
+            self.assertEqual(self.client.get(url)['X-Sendfile'], pitch_deck_storage.path(name))
+
+    def test_unapproved_decks_are_private(self):
+        self.upload()
+        self.startup.approved = False
+        self.startup.save()
+        self.client.force_login(self.investor)
+        self.assertEqual(self.client.get(reverse('pitch_deck', args=[self.startup.pk])).status_code, 404)
+
+    def test_garbage_collection_keeps_referenced_decks(self):
+        old = self.upload()
+        new = self.upload(b'%PDF-1.4 second deck')
+        self.assertEqual(collect_garbage(min_age=3600), [])
+        self.assertEqual(collect_garbage(min_age=0), [old])
+        self.assertFalse(pitch_deck_storage.exists(old))
+        self.assertTrue(pitch_deck_storage.exists(new))
+
+
+def make_pdf(pages):
+    """A minimal uncompressed PDF with ``pages`` blank pages."""
+    kids = ' '.join(f'{3 + i} 0 R' for i in range(pages))
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>'.encode()]
+    objects += [b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>'] * pages
+    out, offsets = b'%PDF-1.4\n', []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return out
+
+
+def hang(path, text_limit):
+    """Stands in for a parser stuck on a malformed deck."""
+    time.sleep(60)
+
+
+
+class PitchDeckPreviewTests(UploadDeckMixin, TestCase):
+    DECK = make_pdf(3)
+
+    def process_jobs(self):
+        Worker().run(burst=True)
+        self.startup.refresh_from_db()
+        return self.startup.pitch_deck_preview
+
+    def test_new_deck_is_processed_in_the_background(self):
+        name = self.upload()
+        self.assertEqual(self.startup.pitch_deck_preview, {})
+        preview = self.process_jobs()
+        self.assertEqual(preview['pages'], 3)
+        self.assertTrue(pitch_deck_storage.exists(derivative_name(name, 'preview.json')))
+        self.assertTrue(pitch_deck_storage.exists(derivative_name(name, 'text.txt')))
+
+        self.client.force_login(self.investor)
+        response = self.client.get(reverse('startup_detail_investor', args=[self.startup.pk]))
+        self.assertContains(response, '(3 pages)')
+
+    def test_hung_parser_fails_the_job(self):
+        name = self.upload()
+        started = time.monotonic()
+        with mock.patch('startups.decks.read_pages_and_text', hang), self.settings(PITCH_DECK_TIMEOUT=1):
+            decks.reset_pool()
+            with self.assertRaises(decks.DeckTimeout):
+                decks.process(name)
+        self.assertLess(time.monotonic() - started, 30)
+        self.assertIsNone(decks._pool)
+        self.assertFalse(pitch_deck_storage.exists(derivative_name(name, 'preview.json')))
+
+    def test_only_deck_changes_queue_processing(self):
+        self.upload()
+        self.process_jobs()
+        self.startup.vision = 'Robots'
+        self.startup.save()
+        self.assertFalse(Job.objects.filter(task=process_pitch_deck_task.name, status='QUEUED').exists())
+        self.assertEqual(self.startup.pitch_deck_preview['pages'], 3)
+
+        self.upload(make_pdf(2))
+        self.assertEqual(self.startup.pitch_deck_preview, {})
+        self.assertEqual(self.process_jobs()['pages'], 2)
+
+    def test_thumbnails(self):
+        name = self.upload()
+        self.process_jobs()
+        write_derivative(pitch_deck_storage, thumbnail_name(name, 160), b'\x89PNG thumbnail')
+        Startup.objects.filter(pk=self.startup.pk).update(pitch_deck_preview={'pages': 3, 'thumbnails': [160]})
+        self.client.force_login(self.investor)
+
+        response = self.client.get(reverse('pitch_deck_thumbnail', args=[self.startup.pk, 160]))
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(b''.join(response.streaming_content), b'\x89PNG thumbnail')
+        self.assertEqual(self.client.get(reverse('pitch_deck_thumbnail', args=[self.startup.pk, 480])).status_code, 404)
+
+    def test_deck_text_is_searchable(self):
+        name = self.upload()
+        self.process_jobs()
+        write_derivative(pitch_deck_storage, derivative_name(name, 'text.txt'), 'Photonic lidar'.encode())
+        self.startup.save()
+        self.assertEqual(list(search_startups(Startup.objects.all(), 'photon')), [self.startup])
+
+    def test_derivatives_are_collected_with_their_deck(self):
+        old = self.upload()
+        self.process_jobs()
+        new = self.upload(make_pdf(1))
+        self.process_jobs()
+        self.assertEqual(collect_garbage(min_age=3600), [])
+        removed = collect_garbage(min_age=0)
+        self.assertEqual(sorted(removed), sorted([old, derivative_name(old, 'preview.json'),
+                                                  derivative_name(old, 'text.txt')]))
+        self.assertTrue(pitch_deck_storage.exists(derivative_name(new, 'text.txt')))
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.investor = User.objects.create_user(username='inv', password='pass', role='INVESTOR')
+        self.robots = self.make_startup('robots', 'Robotics', 'Seed')
+        self.arms = self.make_startup('arms', 'robotics ', 'Series A')
+        self.farm = self.make_startup('farm', 'AgriTech', 'Seed')
+
+    def make_startup(self, username, niche, stage, approved=True):
+        user = User.objects.create_user(username=username, password='pass', role='STARTUP')
+        startup = Startup.objects.get(founder=user)
+        startup.name = username.title()
+        startup.niche = niche
+        startup.stage = stage
+        startup.approved = approved
+        startup.save()
+        return startup
+
+    def counts(self):
+        return (
+            dict(Niche.objects.values_list('slug', 'approved_count')),
+            dict(Stage.objects.values_list('slug', 'approved_count')),
+            {(pair.niche.slug, pair.stage.slug): pair.count for pair in FacetCount.objects.select_related('niche', 'stage')},
+        )
+
+    def test_values_are_normalized(self):
+        self.assertEqual(self.robots.niche_tag, self.arms.niche_tag)
+        self.assertEqual(self.robots.niche_tag.name, 'Robotics')
+        self.assertEqual(list(Niche.objects.values_list('slug', flat=True)), ['agritech', 'robotics'])
+
+    def test_counts_follow_edits_approval_and_deletes(self):
+        self.assertEqual(self.counts(), (
+            {'robotics': 2, 'agritech': 1},
+            {'seed': 2, 'series-a': 1},
+            {('robotics', 'seed'): 1, ('robotics', 'series-a'): 1, ('agritech', 'seed'): 1},
+        ))
+        self.arms.stage = 'Seed'
+        self.arms.save()
+        self.farm.approved = False
+        self.farm.save()
+        self.make_startup('pending', 'AgriTech', 'Seed', approved=False)
+        Startup.objects.get(pk=self.robots.pk).delete()
+        niches, stages, pairs = self.counts()
+        self.assertEqual(niches, {'robotics': 1, 'agritech': 0})
+        self.assertEqual(stages, {'seed': 1, 'series-a': 0})
+        self.assertEqual({pair: n for pair, n in pairs.items() if n}, {('robotics', 'seed'): 1})
+
+    def test_reconcile_repairs_drift(self):
+        expected = self.counts()
+        Niche.objects.update(approved_count=7)
+        FacetCount.objects.all().delete()
+        call_command('reconcile_counters', stdout=StringIO())
+        self.assertEqual(self.counts(), expected)
+
+    def test_counts_without_search_skip_the_startups_table(self):
+        request = RequestFactory().get('/', {'stage_tag': 'seed'})
+        with CaptureQueriesContext(connection) as queries:
+            context = facets.browse_facets(request)
+        self.assertFalse(any('"startups_startup"' in query['sql'] for query in queries))
+        self.assertEqual([(v['slug'], v['count']) for v in context['niches']], [('agritech', 1), ('robotics', 1)])
+        self.assertEqual([(v['slug'], v['selected']) for v in context['stages']],
+                         [('seed', True), ('series-a', False)])
+        self.assertNotIn('stage_tag', context['stages'][0]['query'])
+
+    def test_search_counts_are_cached_until_a_startup_changes(self):
+        request = RequestFactory().get('/', {'search': 'robots'})
+        self.assertEqual([(v['slug'], v['count']) for v in facets.browse_facets(request)['niches']], [('robotics', 1)])
+        with self.assertNumQueries(0):
+            facets.browse_facets(request)
+        self.arms.name = 'Robots Two'
+        self.arms.save()
+        self.assertEqual([(v['slug'], v['count']) for v in facets.browse_facets(request)['niches']], [('robotics', 2)])
+
+    def test_browse_views_filter_by_facet(self):
+        self.client.login(username='inv', password='pass')
+        response = self.client.get(reverse('browse_startups'), {'niche_tag': 'agritech'})
+        self.assertEqual([startup.pk for startup in response.context['startups']], [self.farm.pk])
+        self.assertContains(response, 'AgriTech (1)')
+        self.assertContains(response, 'Robotics (2)')
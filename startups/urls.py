@@ -7,6 +7,9 @@ urlpatterns = [
     path('logout/', views.startup_logout, name='startup_logout'),
     path('dashboard/', views.startup_dashboard, name='startup_dashboard'),
     path('profile/', views.startup_profile, name='startup_profile'),
+    path('<int:startup_id>/pitch-deck/', views.pitch_deck, name='pitch_deck'),
+    path('<int:startup_id>/pitch-deck/thumbnail-<int:width>.png', views.pitch_deck_thumbnail,
+         name='pitch_deck_thumbnail'),
     path('connection/<int:request_id>/<str:action>/', views.handle_connection_request, name='handle_connection_request'),
     # new endpoints for investor applications
     path('apply/', views.apply_to_investors, name='apply_to_investors'),
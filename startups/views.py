@@ -1,14 +1,25 @@
+import os
+
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
 from django.contrib import messages
-from django.core.paginator import Paginator
+from django.utils.text import slugify
+from venturehub.pagination import paginate
+from venturehub.replicas import no_primary_pin, replica_reads
+from .decks import thumbnail_name
+from .downloads import serve_deck
 from .models import InvestmentApplication, Startup
+from .pitching import pitch_to_investors
+from .tasks import pitch_to_investors_task
 from investors.models import InvestorProfile
 from manufacturers.models import ConnectionRequest
 from accounts.models import User
 
 
+@no_primary_pin
 def startup_login(request):
     """Login page for startups."""
     if request.user.is_authenticated:
@@ -79,6 +90,7 @@ def startup_register(request):
     return render(request, 'startups/register.html', {'error': error})
 
 
+@no_primary_pin
 def startup_logout(request):
     """Logout for startups."""
     if request.method == 'POST':
@@ -87,6 +99,7 @@ def startup_logout(request):
 
 
 @login_required(login_url='startup_login')
+@replica_reads
 def startup_dashboard(request):
     """Dashboard for startups."""
     if not request.user.is_startup():
@@ -98,25 +111,21 @@ def startup_dashboard(request):
         startup = Startup.objects.create(founder=request.user, name='', niche='', valuation=0, stage='', vision='')
     
     # Get connection requests from manufacturers
-    connection_requests = ConnectionRequest.objects.filter(startup=startup).order_by('-created_at')
-    pending_connections = connection_requests.filter(status='PENDING').count()
-    total_connections = connection_requests.count()
+    connection_requests = ConnectionRequest.objects.filter(startup=startup).select_related('manufacturer__user').order_by('-created_at')
     
     # Get investment applications
-    investment_apps = InvestmentApplication.objects.filter(startup=startup).order_by('-created_at')
-    pending_apps = investment_apps.filter(status='PENDING').count()
-    accepted_apps = investment_apps.filter(status='ACCEPTED').count()
-    total_apps = investment_apps.count()
+    investment_apps = InvestmentApplication.objects.filter(startup=startup).select_related('investor__user').order_by('-created_at')
     
+    # Totals come from the counters stored on the startup row
     return render(request, 'startups/dashboard.html', {
         'startup': startup,
         'connection_requests': connection_requests[:5],
         'investment_apps': investment_apps[:5],
-        'pending_connections': pending_connections,
-        'total_connections': total_connections,
-        'pending_apps': pending_apps,
-        'accepted_apps': accepted_apps,
-        'total_apps': total_apps,
+        'pending_connections': startup.connections_pending,
+        'total_connections': startup.connections_total,
+        'pending_apps': startup.applications_pending,
+        'accepted_apps': startup.applications_accepted,
+        'total_apps': startup.applications_total,
     })
 
 
@@ -141,6 +150,17 @@ def startup_profile(request):
         startup.phone = request.POST.get('phone', '')
         startup.website = request.POST.get('website', '')
         startup.demo_video = request.POST.get('demo_video', '')
+        
+        # Streamed to disk in chunks and stored once per distinct content (startups.storage)
+        deck = request.FILES.get('pitch_deck')
+        if deck:
+            if not deck.name.lower().endswith('.pdf'):
+                messages.error(request, 'The pitch deck must be a PDF.')
+                return render(request, 'startups/profile.html', {'startup': startup})
+            if deck.size > settings.PITCH_DECK_MAX_SIZE:
+                messages.error(request, f'The pitch deck must be under {settings.PITCH_DECK_MAX_SIZE // (1024 * 1024)} MB.')
+                return render(request, 'startups/profile.html', {'startup': startup})
+            startup.pitch_deck = deck
         startup.save()
         
         messages.success(request, 'Profile updated successfully!')
@@ -149,6 +169,34 @@ def startup_profile(request):
     return render(request, 'startups/profile.html', {'startup': startup})
 
 
+def get_deck_startup(request, startup_id, *fields):
+    """The startup whose deck the user may see: approved ones for everyone, otherwise founder and admins only."""
+    startup = get_object_or_404(Startup.objects.only('name', 'approved', 'founder_id', 'pitch_deck', *fields),
+                                id=startup_id)
+    allowed = startup.approved or startup.founder_id == request.user.pk or request.user.is_admin()
+    if not startup.pitch_deck or not allowed:
+        raise Http404('No pitch deck.')
+    return startup
+
+
+@login_required
+def pitch_deck(request, startup_id):
+    """Download a startup's pitch deck."""
+    startup = get_deck_startup(request, startup_id)
+    extension = os.path.splitext(startup.pitch_deck.name)[1] or '.pdf'
+    return serve_deck(request, startup.pitch_deck.name, f'{slugify(startup.name) or "pitch-deck"}{extension}')
+
+
+@login_required
+def pitch_deck_thumbnail(request, startup_id, width):
+    """First page of a startup's pitch deck as a PNG, ``width`` pixels wide."""
+    startup = get_deck_startup(request, startup_id, 'pitch_deck_preview')
+    if width not in startup.pitch_deck_preview.get('thumbnails', []):
+        raise Http404('No thumbnail of that size.')
+    return serve_deck(request, thumbnail_name(startup.pitch_deck.name, width),
+                      f'{slugify(startup.name) or "pitch-deck"}-{width}.png', content_type='image/png')
+
+
 @login_required(login_url='startup_login')
 def handle_connection_request(request, request_id, action):
     """Accept or reject connection requests from manufacturers."""
@@ -156,7 +204,7 @@ def handle_connection_request(request, request_id, action):
         return redirect('home')
     
     startup = get_object_or_404(Startup, founder=request.user)
-    conn_request = get_object_or_404(ConnectionRequest, id=request_id, startup=startup)
+    conn_request = get_object_or_404(ConnectionRequest.objects.select_related('manufacturer'), id=request_id, startup=startup)
     
     if action == 'accept':
         conn_request.status = 'ACCEPTED'
@@ -176,7 +224,9 @@ def apply_to_investors(request, investor_id=None):
     If an `investor_id` is provided via URL, that investor will be pre‑selected
     in the form. Otherwise the form displays all investors and the startup may
     choose multiple entries.  Submitting the form creates a separate
-    InvestmentApplication for each selected investor.
+    InvestmentApplication for each selected investor through the bulk
+    pitching engine, skipping investors that already have a pending one.
+    Very large selections are handed to the background worker.
     """
     if not request.user.is_startup():
         return redirect('home')
@@ -198,31 +248,23 @@ def apply_to_investors(request, investor_id=None):
         amount = request.POST.get('amount')
         equity = request.POST.get('equity')
 
-        created = 0
-        for inv_id in investor_ids:
-            try:
-                investor = InvestorProfile.objects.get(id=inv_id)
-            except InvestorProfile.DoesNotExist:
-                continue
-
-            InvestmentApplication.objects.create(
-                startup=startup,
-                investor=investor,
-                subject=subject,
-                message=message,
-                amount_requested=amount,
-                equity_offered=equity,
-            )
-            created += 1
+        if len(investor_ids) > settings.BULK_PITCH_BACKGROUND_THRESHOLD:
+            pitch_to_investors_task.delay(startup.pk, investor_ids, subject, message, amount, equity)
+            messages.info(request, f'Your pitch to {len(investor_ids)} investors is being sent in the background.')
+            return redirect('startup_dashboard')
 
-        if created:
-            messages.success(request, f"Investment application{'s' if created != 1 else ''} submitted successfully!")
-        else:
+        result = pitch_to_investors(startup, investor_ids, subject, message, amount, equity)
+
+        if result.created:
+            messages.success(request, f"{result.created} investment application{'s' if result.created != 1 else ''} submitted successfully!")
+        if result.skipped:
+            messages.info(request, f"Skipped {result.skipped} investor{'s' if result.skipped != 1 else ''} with a pending application already.")
+        if not result.created and not result.skipped:
             messages.error(request, 'No valid investor selected.')
         return redirect('startup_dashboard')
 
     # GET – render the form
-    investors = InvestorProfile.objects.all().order_by('user__username')
+    investors = InvestorProfile.objects.select_related('user').order_by('user__username')
     selected = None
     if investor_id:
         selected = InvestorProfile.objects.filter(id=investor_id).first()
@@ -234,18 +276,17 @@ def apply_to_investors(request, investor_id=None):
 
 
 @login_required(login_url='startup_login')
+@replica_reads
 def startup_applications_history(request):
-    """View all investment applications sent by the startup with pagination."""
+    """View all investment applications sent by the startup with cursor pagination."""
     if not request.user.is_startup():
         return redirect('home')
 
     startup = get_object_or_404(Startup, founder=request.user)
-    applications = InvestmentApplication.objects.filter(startup=startup).order_by('-created_at')
+    applications = InvestmentApplication.objects.filter(startup=startup).select_related('investor__user').order_by('-created_at')
 
-    # Pagination
-    paginator = Paginator(applications, 10)  # 10 applications per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination on (created_at, id), 10 applications per page
+    page_obj = paginate(request, applications, 10, count_limit=settings.PAGINATION_COUNT_LIMIT)
 
     return render(request, 'startups/applications_history.html', {
         'page_obj': page_obj,
@@ -260,7 +301,9 @@ def startup_application_detail(request, application_id):
         return redirect('home')
 
     startup = get_object_or_404(Startup, founder=request.user)
-    application = get_object_or_404(InvestmentApplication, id=application_id, startup=startup)
+    application = get_object_or_404(
+        InvestmentApplication.objects.select_related('investor__user'), id=application_id, startup=startup
+    )
 
     return render(request, 'startups/application_detail.html', {
         'application': application,
@@ -287,18 +330,17 @@ def delete_application(request, application_id):
 
 
 @login_required(login_url='startup_login')
+@replica_reads
 def startup_connection_history(request):
-    """View all manufacturer connection requests for the startup with pagination."""
+    """View all manufacturer connection requests for the startup with cursor pagination."""
     if not request.user.is_startup():
         return redirect('home')
 
     startup = get_object_or_404(Startup, founder=request.user)
-    connections = ConnectionRequest.objects.filter(startup=startup).order_by('-created_at')
+    connections = ConnectionRequest.objects.filter(startup=startup).select_related('manufacturer__user').order_by('-created_at')
 
-    # Pagination
-    paginator = Paginator(connections, 10)  # 10 connections per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination on (created_at, id), 10 connections per page
+    page_obj = paginate(request, connections, 10, count_limit=settings.PAGINATION_COUNT_LIMIT)
 
     return render(request, 'startups/connection_history.html', {
         'page_obj': page_obj,
@@ -313,7 +355,9 @@ def startup_connection_detail(request, connection_id):
         return redirect('home')
 
     startup = get_object_or_404(Startup, founder=request.user)
-    connection = get_object_or_404(ConnectionRequest, id=connection_id, startup=startup)
+    connection = get_object_or_404(
+        ConnectionRequest.objects.select_related('manufacturer__user'), id=connection_id, startup=startup
+    )
 
     return render(request, 'startups/connection_detail.html', {
         'connection': connection,
@@ -330,7 +374,9 @@ def unfriend_connection(request, connection_id):
         return redirect('startup_connection_history')
 
     startup = get_object_or_404(Startup, founder=request.user)
-    connection = get_object_or_404(ConnectionRequest, id=connection_id, startup=startup)
+    connection = get_object_or_404(
+        ConnectionRequest.objects.select_related('manufacturer'), id=connection_id, startup=startup
+    )
 
     # Only allow unfriending if the connection is ACCEPTED
     if connection.status != 'ACCEPTED':
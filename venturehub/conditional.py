@@ -0,0 +1,58 @@
+"""Conditional GET for logged-in pages.
+
+``@conditional_page(state)`` wraps a view with Django's ``condition``:
+``state(request, *args, **kwargs)`` returns ``(parts, last_modified)``
+describing the page's content with a query or two that are much cheaper
+than the view (e.g. a ``MAX(updated_at)``). When the client's
+``If-None-Match`` / ``If-Modified-Since`` still match, the view is skipped
+and a 304 is sent.
+
+The pages also show per-viewer chrome (the nav badges, flash messages, the
+CSRF token), so the ETag also covers the user, session and notification
+counters, and no validators are sent while flash messages are waiting.
+Browsers send both headers and the ETag wins, so ``Last-Modified`` only
+needs to describe the content. Responses are marked ``private, no-cache``:
+shared caches must not keep them and browsers must revalidate every time.
+"""
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from accounts.notifications import get_notifications
+
+
+def conditional_page(state_func):
+    def state(request, *args, **kwargs):
+        # condition() asks for the ETag and Last-Modified separately; compute both once.
+        if not hasattr(request, '_page_state'):
+            if len(get_messages(request)):
+                request._page_state = (None, None)
+            else:
+                request._page_state = state_func(request, *args, **kwargs)
+        return request._page_state
+
+    def etag(request, *args, **kwargs):
+        parts, _last_modified = state(request, *args, **kwargs)
+        if parts is None:
+            return None
+        user = request.user
+        viewer = (user.pk, request.session.session_key, sorted(get_notifications(user).items()))
+        return hashlib.sha256(repr((viewer, parts)).encode()).hexdigest()[:32]
+
+    def last_modified(request, *args, **kwargs):
+        return state(request, *args, **kwargs)[1]
+
+    def decorator(view):
+        return cache_control(private=True, no_cache=True)(
+            condition(etag_func=etag, last_modified_func=last_modified)(view)
+        )
+    return decorator
+
+
+def page_last_modified(request):
+    """The ``last_modified`` the page's state gave for ``request``, or ``None`` if it was not computed.
+
+    Lets a view reuse what its validator already queried, e.g. a startup's ``updated_at``.
+    """
+    return getattr(request, '_page_state', (None, None))[1]
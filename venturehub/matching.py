@@ -0,0 +1,104 @@
+"""Vectorized building blocks for the matching engines.
+
+The engines (``investors.matching``) score a batch of profiles against every
+approved startup at once: free-text fields become rows of a token matrix,
+so a batch's similarities to all startups are one matrix product, and the
+best ``k`` startups of each row are picked with ``argpartition`` instead of
+a full sort. Requires NumPy, which only the worker and the rebuild commands
+import.
+"""
+import re
+
+import numpy as np
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokens(text):
+    """Lower-cased word tokens of ``text``, e.g. ``'Health Tech, AI'`` -> ``{'health', 'tech', 'ai'}``."""
+    return set(TOKEN_RE.findall((text or '').lower()))
+
+
+class Vocabulary:
+    """Maps tokens to matrix columns."""
+
+    def __init__(self, token_sets=()):
+        self.columns = {}
+        for words in token_sets:
+            for word in words:
+                self.columns.setdefault(word, len(self.columns))
+
+    def __len__(self):
+        return len(self.columns)
+
+    def matrix(self, token_sets):
+        """Binary ``len(token_sets) x len(self)`` matrix and the size of each set.
+
+        The sizes include tokens outside the vocabulary, which cannot match
+        but still make a row less similar to everything.
+        """
+        token_sets = list(token_sets)
+        matrix = np.zeros((len(token_sets), len(self)), dtype=np.float32)
+        sizes = np.zeros(len(token_sets), dtype=np.float32)
+        for row, words in enumerate(token_sets):
+            sizes[row] = len(words)
+            matrix[row, [self.columns[word] for word in words if word in self.columns]] = 1
+        return matrix, sizes
+
+    def weights(self, counters):
+        """Rows of ``counters`` (token -> weight) scaled to unit length.
+
+        Rows are normalized over all their tokens, so scores against
+        different vocabularies stay comparable.
+        """
+        matrix = np.zeros((len(counters), len(self)), dtype=np.float32)
+        for row, counter in enumerate(counters):
+            norm = sum(weight * weight for weight in counter.values()) ** 0.5
+            for word, weight in counter.items():
+                if word in self.columns:
+                    matrix[row, self.columns[word]] = weight / norm
+        return matrix
+
+
+def jaccard(left, left_sizes, right, right_sizes):
+    """Pairwise Jaccard similarity of the rows of two binary token matrices."""
+    common = left @ right.T
+    union = left_sizes[:, None] + right_sizes[None, :] - common
+    return np.divide(common, union, out=np.zeros_like(common), where=union > 0)
+
+
+def unit_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def log_range_fit(low, high, other_low, other_high):
+    """How well each ``[low, high]`` interval meets each ``[other_low, other_high]`` one.
+
+    Amounts are compared in orders of magnitude: overlapping intervals score
+    1 and the score decays by ``e`` for every factor of ten between them.
+    Rows with no interval (``high <= 0``) score a neutral 0.5.
+    """
+    def log(values):
+        return np.log10(np.maximum(np.asarray(values, dtype=np.float64), 1.0))
+
+    low, high = log(low)[:, None], log(high)[:, None]
+    other_low, other_high = log(other_low)[None, :], log(other_high)[None, :]
+    gap = np.maximum(np.maximum(low - other_high, other_low - high), 0)
+    fit = np.exp(-gap)
+    return np.where(high > 0, fit, 0.5).astype(np.float32)
+
+
+def top_k(scores, k):
+    """Column indices of the ``k`` highest scores of each row, best first.
+
+    ``-inf`` scores (excluded pairs) are never returned, so rows may come
+    back shorter than ``k``.
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return [[] for _ in range(scores.shape[0])]
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(-scores, best, axis=1).argsort(axis=1, kind='stable')
+    best = np.take_along_axis(best, order, axis=1)
+    return [[column for column in row if np.isfinite(scores[i, column])] for i, row in enumerate(best)]
@@ -0,0 +1,206 @@
+"""Keyset (cursor) pagination.
+
+``Paginator`` pages with ``OFFSET``, so every page costs a ``COUNT(*)`` plus
+a scan over all the rows before it. ``CursorPaginator`` instead remembers the
+sort key of the last row shown and asks for the rows after it::
+
+    WHERE created_at <= %s AND (created_at < %s OR id < %s)
+    ORDER BY created_at DESC, id DESC LIMIT 11
+
+which an index on the sort columns answers in the same time on page 1 and
+page 1000. The sort key comes from the queryset's own ``order_by()``, with
+the primary key appended as a tie-breaker, and travels between requests in an
+opaque cursor signed with ``SECRET_KEY`` so clients cannot forge positions.
+
+Cursor pages only know their neighbours, not their page number. When a total
+is wanted, ``count_limit`` counts at most that many rows and reports the
+total as approximate beyond it.
+
+Views normally call :func:`paginate`, which reads the cursor from the request
+and returns a :class:`CursorPage` with the query strings for its links.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core import signing
+from django.db.models import Q
+
+CURSOR_PARAM = 'cursor'
+SALT = 'venturehub.pagination'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorSerializer:
+    """JSON serializer that round-trips dates and decimals as exact strings."""
+
+    @staticmethod
+    def default(value):
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, (decimal.Decimal, uuid.UUID)):
+            return str(value)
+        raise TypeError(f'{type(value).__name__} cannot be used in a cursor')
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':'), default=self.default).encode('latin-1')
+
+    def loads(self, data):
+        return json.loads(data.decode('latin-1'))
+
+
+def keyset_ordering(queryset):
+    """Return the queryset's ordering with the primary key as a tie-breaker."""
+    ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+    if not ordering:
+        raise ValueError('CursorPaginator needs an ordered queryset.')
+    if not all(isinstance(field, str) for field in ordering):
+        raise ValueError('CursorPaginator only supports ordering by field names.')
+    if not {'pk', 'id'} & {field.lstrip('-') for field in ordering}:
+        ordering.append('-pk' if ordering[0].startswith('-') else 'pk')
+    return ordering
+
+
+def keyset_filter(ordering, values, backwards=False):
+    """``Q`` selecting the rows that sort after ``values`` (or before them)."""
+    names = [field.lstrip('-') for field in ordering]
+    descending = [field.startswith('-') != backwards for field in ordering]
+
+    # (a, b) < (x, y) is a < x OR (a = x AND b < y) ...
+    after = Q()
+    for i, name in enumerate(names):
+        clause = Q(**{f'{name}__{"lt" if descending[i] else "gt"}': values[i]})
+        for prev_name, prev_value in zip(names[:i], values):
+            clause &= Q(**{prev_name: prev_value})
+        after |= clause
+    # ... plus a range on the leading column so an index can seek to it.
+    bound = Q(**{f'{names[0]}__{"lte" if descending[0] else "gte"}': values[0]})
+    return bound & after
+
+
+def row_value(row, name):
+    """Read ``name`` (possibly spanning relations) from a model or a dict."""
+    if isinstance(row, dict):
+        return row[name]
+    if name == 'pk':
+        return row.pk
+    for part in name.split('__'):
+        row = getattr(row, part)
+    return row
+
+
+class CursorPaginator:
+    def __init__(self, queryset, per_page, count_limit=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_limit = count_limit
+        self.ordering = keyset_ordering(queryset)
+
+    def encode_cursor(self, row, direction):
+        values = [row_value(row, field.lstrip('-')) for field in self.ordering]
+        return signing.dumps(
+            {'o': self.ordering, 'k': values, 'd': direction},
+            salt=SALT, serializer=CursorSerializer, compress=True,
+        )
+
+    def decode_cursor(self, cursor):
+        try:
+            data = signing.loads(cursor, salt=SALT, serializer=CursorSerializer)
+        except signing.BadSignature:
+            raise InvalidCursor('Bad cursor signature.')
+        # A cursor from a differently sorted listing cannot be resumed.
+        if data.get('o') != self.ordering or data.get('d') not in ('next', 'prev'):
+            raise InvalidCursor('Cursor does not match this listing.')
+        return data['k'], data['d']
+
+    def count(self):
+        """Return ``(total, exact)``, counting at most ``count_limit`` rows."""
+        rows = self.queryset.order_by()
+        if self.count_limit is None:
+            return rows.count(), True
+        total = rows[:self.count_limit + 1].count()
+        return min(total, self.count_limit), total <= self.count_limit
+
+    def get_page(self, cursor=None):
+        """Return the page at ``cursor``, or the first page if it is missing or invalid."""
+        try:
+            values, direction = self.decode_cursor(cursor) if cursor else (None, 'next')
+        except InvalidCursor:
+            values, direction = None, 'next'
+
+        limit = self.per_page + 1
+        if values is None:
+            rows = list(self.queryset.order_by(*self.ordering)[:limit])
+            return CursorPage(rows[:self.per_page], self, has_next=len(rows) > self.per_page, has_previous=False)
+
+        if direction == 'next':
+            rows = list(self.queryset.filter(keyset_filter(self.ordering, values)).order_by(*self.ordering)[:limit])
+            return CursorPage(rows[:self.per_page], self, has_next=len(rows) > self.per_page, has_previous=True)
+
+        reverse = [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+        rows = list(self.queryset.filter(keyset_filter(self.ordering, values, backwards=True)).order_by(*reverse)[:limit])
+        return CursorPage(rows[:self.per_page][::-1], self, has_next=True, has_previous=len(rows) > self.per_page)
+
+
+class CursorPage:
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[-1], 'next') if self.has_next() else None
+
+    @property
+    def previous_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[0], 'prev') if self.has_previous() else None
+
+
+def paginate(request, queryset, per_page, count_limit=None):
+    """Return the cursor page of ``queryset`` requested by ``request``.
+
+    The page carries ``first_query``, ``previous_query`` and ``next_query``:
+    the request's query string with the cursor swapped, so links keep the
+    listing's search and filter parameters. When ``count_limit`` is set,
+    ``total`` and ``total_is_exact`` are filled in as well.
+    """
+    page = CursorPaginator(queryset, per_page, count_limit).get_page(request.GET.get(CURSOR_PARAM))
+
+    def query(cursor):
+        params = request.GET.copy()
+        params.pop(CURSOR_PARAM, None)
+        params.pop('page', None)
+        if cursor:
+            params[CURSOR_PARAM] = cursor
+        return params.urlencode()
+
+    page.first_query = query(None)
+    page.previous_query = query(page.previous_cursor) if page.has_previous() else None
+    page.next_query = query(page.next_cursor) if page.has_next() else None
+    if count_limit is not None:
+        page.total, page.total_is_exact = page.paginator.count()
+    return page
@@ -0,0 +1,156 @@
+"""Read-replica routing.
+
+``settings.DATABASE_REPLICAS`` lists ``DATABASES`` aliases that hold copies
+of ``default``. Reads are sent to one of them only inside views decorated
+with ``@replica_reads`` (browse pages, detail pages, dashboards, admin
+listings); everything else, every write, and any read inside a transaction
+on ``default`` go to the primary.
+
+A replica may lag behind, so users must see their own writes: the
+``PinPrimaryMiddleware`` watches the statements a request runs on the
+primary and marks a logged-in user's session after any INSERT, UPDATE or
+DELETE, whatever the HTTP method (several admin and favorite links write on
+GET). A pinned session reads from the primary for the rest of the session,
+or for ``REPLICA_STICKY_SECONDS`` when that is set. Views that write nothing
+the user then reads, like the login and logout forms, are marked
+``@no_primary_pin``. Sessions and the job queue always live on the primary.
+
+For a local replica, add an alias pointing at another SQLite file and fill
+it with ``python manage.py sync_replica``.
+"""
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_SESSION_KEY = '_primary_pinned_at'
+# None pins for the rest of the session: replica lag has no upper bound.
+DEFAULT_STICKY_SECONDS = None
+# Apps whose tables are never read from a replica.
+PRIMARY_APPS = {'sessions', 'jobs'}
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+# Statements the current request ran that changed the primary, or None outside one.
+_primary_writes = contextvars.ContextVar('primary_writes', default=None)
+
+
+@contextmanager
+def use_replicas():
+    """Let reads in this block go to a replica."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def is_pinned(request):
+    """Whether ``request``'s session must read from the primary."""
+    pinned_at = request.session.get(PIN_SESSION_KEY)
+    if pinned_at is None:
+        return False
+    sticky = getattr(settings, 'REPLICA_STICKY_SECONDS', DEFAULT_STICKY_SECONDS)
+    return sticky is None or time.time() - pinned_at < sticky
+
+
+def replica_reads(view):
+    """Serve a read-only view's queries from a replica unless the session is pinned."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or is_pinned(request):
+            return view(request, *args, **kwargs)
+        with use_replicas():
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+def no_primary_pin(view):
+    """Mark a view whose writes must not pin the session, e.g. login and logout."""
+    view.pins_primary = False
+    return view
+
+
+def record_writes(execute, sql, params, many, context):
+    """Execute wrapper noting the statements that change the primary."""
+    writes = _primary_writes.get()
+    if writes is not None and sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS):
+        writes.append(sql)
+    return execute(sql, params, many, context)
+
+
+class PinPrimaryMiddleware:
+    """Pin the session to the primary after a request that wrote to it."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not getattr(settings, 'DATABASE_REPLICAS', None):
+            return self.get_response(request)
+        writes = []
+        token = _primary_writes.set(writes)
+        try:
+            with connections[DEFAULT_DB_ALIAS].execute_wrapper(record_writes):
+                response = self.get_response(request)
+        finally:
+            _primary_writes.reset(token)
+        self.pin(request, writes)
+        return response
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'DATABASE_REPLICAS', None):
+            return await self.get_response(request)
+        # Sync views and the async ORM run on the request's thread-sensitive
+        # thread, so watch that thread's connection.
+        primary = await sync_to_async(connections.__getitem__)(DEFAULT_DB_ALIAS)
+        writes = []
+        token = _primary_writes.set(writes)
+        primary.execute_wrappers.append(record_writes)
+        try:
+            response = await self.get_response(request)
+        finally:
+            primary.execute_wrappers.remove(record_writes)
+            _primary_writes.reset(token)
+        await sync_to_async(self.pin)(request, writes)
+        return response
+
+    def pin(self, request, writes):
+        if writes and getattr(request, '_pins_primary', True) and request.user.is_authenticated:
+            request.session[PIN_SESSION_KEY] = time.time()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._pins_primary = getattr(view_func, 'pins_primary', True)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, 'DATABASE_REPLICAS', None)
+        if (not replicas or not _replica_reads.get() or model._meta.app_label in PRIMARY_APPS
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
     'investors',
     'manufacturers',
     'admin_dashboard',
+    'jobs',
 ]
 
 MIDDLEWARE = [
@@ -52,6 +54,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'venturehub.replicas.PinPrimaryMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -68,6 +71,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'accounts.context_processors.notifications',
             ],
         },
     },
@@ -81,7 +85,8 @@ WSGI_APPLICATION = 'venturehub.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # django.db.backends.sqlite3 plus the SQLITE_PROFILE below.
+        'ENGINE': 'venturehub.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
@@ -132,3 +137,177 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'role_redirect'
 LOGOUT_REDIRECT_URL = 'home'
+
+# Admin dashboard statistics
+# Seconds the platform statistics stay cached between writes.
+PLATFORM_STATS_TTL = 60
+# Bearer token for /admin-dashboard/stats.json; leave empty to require an admin login.
+PLATFORM_STATS_TOKEN = ''
+
+# Background jobs (python manage.py runworker)
+# Seconds an idle worker waits before polling the queue again.
+JOBS_POLL_INTERVAL = 1
+# Seconds a claimed job stays locked before another worker may retry it.
+JOBS_VISIBILITY_TIMEOUT = 300
+
+# Pitches to more investors than this are sent by the background worker.
+BULK_PITCH_BACKGROUND_THRESHOLD = 200
+
+# Message long-polling (accounts.views.poll_messages)
+# Seconds a poll request waits for a new message before returning empty.
+MESSAGE_POLL_TIMEOUT = 25
+# Seconds between database re-checks for messages sent from other processes.
+MESSAGE_POLL_INTERVAL = 2
+
+# Nav notification counters (accounts.notifications)
+# Seconds a user's cached counters live before being recomputed.
+NOTIFICATION_CACHE_TIMEOUT = 300
+
+# Cursor pagination (venturehub.pagination)
+# Listings count at most this many rows and show larger totals as "N+".
+PAGINATION_COUNT_LIMIT = 1000
+# Rows per page on the admin manage_* listings.
+ADMIN_PAGE_SIZE = 25
+
+# Analytics exports (admin_dashboard.exports)
+# Bearer token for /admin-dashboard/api/export/... without an admin session.
+EXPORT_API_TOKEN = ''
+
+# Password hashing (accounts.hashers)
+# Hasher for new passwords: 'pbkdf2', 'scrypt' or 'argon2' (needs argon2-cffi).
+# Hashes from the other policies still verify and are upgraded on next login,
+# as are hashes made with different PASSWORD_HASHER_PARAMS.
+PASSWORD_HASHER_POLICY = 'pbkdf2'
+# Cost parameters per policy; anything left out uses Django's default.
+# Compare settings with: python manage.py benchmark_logins
+PASSWORD_HASHER_PARAMS = {
+    'pbkdf2': {},
+    'scrypt': {},
+    'argon2': {},
+}
+# Hasher class in accounts.hashers for each policy; the chosen one comes first.
+PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'PBKDF2PasswordHasher',
+    'scrypt': 'ScryptPasswordHasher',
+    'argon2': 'Argon2PasswordHasher',
+}
+PASSWORD_HASHERS = [
+    f'accounts.hashers.{PASSWORD_HASHER_CLASSES[name]}'
+    for name in sorted(PASSWORD_HASHER_CLASSES, key=lambda name: name != PASSWORD_HASHER_POLICY)
+]
+
+# Caches
+# 'default' holds counters and versions updated with incr/decr (notification
+# counts, platform stats, facet count versions, page cache stats). LocMemCache
+# keeps those atomic but per process, so deployments where the worker and
+# several web processes must see each other's updates need Redis: set
+# VENTUREHUB_REDIS_URL. The 'sessions' cache then lives there too; otherwise it
+# is kept in files under VENTUREHUB_CACHE_DIR.
+CACHE_DIR = Path(os.environ.get('VENTUREHUB_CACHE_DIR', BASE_DIR / '.cache'))
+REDIS_URL = os.environ.get('VENTUREHUB_REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        alias: {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': alias,
+        }
+        for alias in ('default', 'sessions')
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'sessions': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR / 'sessions',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+
+# Sessions (accounts.sessions)
+# Sessions are read from a per-process LRU, then the shared 'sessions' cache,
+# and only then from the database.
+SESSION_ENGINE = 'accounts.sessions'
+SESSION_CACHE_ALIAS = 'sessions'
+# Sessions kept in each process's LRU, and seconds each entry is trusted there.
+SESSION_LOCAL_CACHE_SIZE = 1000
+SESSION_LOCAL_CACHE_TTL = 2
+# Seconds a session row's expire_date may lag behind when only the expiry changed.
+SESSION_WRITE_BEHIND_INTERVAL = 300
+# Remove expired rows with: python manage.py purge_sessions
+
+# SQLite tuning (venturehub.sqlite)
+# 'production' enables WAL, synchronous=NORMAL, mmap/cache sizing, a busy
+# timeout, BEGIN IMMEDIATE and persistent connections; 'default' is plain SQLite.
+# Opt in on deployments with VENTUREHUB_SQLITE_PROFILE=production; dev and test
+# runs keep 'default'. Compare them with: python manage.py benchmark_sqlite
+SQLITE_PROFILE = os.environ.get('VENTUREHUB_SQLITE_PROFILE', 'default')
+
+# Read replicas (venturehub.replicas)
+# DATABASES aliases that serve the reads of @replica_reads views. For a local
+# replica add e.g.
+#     DATABASES['replica'] = {**DATABASES['default'], 'NAME': BASE_DIR / 'replica.sqlite3',
+#                             'TEST': {'MIRROR': 'default'}}
+# list 'replica' here and copy the primary into it with: python manage.py sync_replica
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['venturehub.replicas.ReplicaRouter']
+# Seconds a user's reads stay on the primary after a request of theirs wrote to
+# it. None keeps them there for the rest of the session, since replica lag has no
+# upper bound; only set a number that is safely above the lag you measure.
+REPLICA_STICKY_SECONDS = None
+
+# Startup page fragments (startups.page_cache)
+# Seconds a rendered startup detail/browse fragment is kept; fragments are keyed
+# on the startup's updated_at, so saving it stops serving them immediately.
+STARTUP_PAGE_CACHE_TIMEOUT = 600
+
+# Pitch decks (startups.storage, startups.downloads)
+# Decks are stored as pitch_decks/<sha256[:2]>/<sha256>.pdf under this directory.
+# Delete unreferenced files with: python manage.py gc_pitch_decks
+PITCH_DECK_ROOT = BASE_DIR
+PITCH_DECK_MAX_SIZE = 25 * 1024 * 1024
+# None serves downloads from Django (with Range support); 'x-sendfile' (Apache,
+# lighttpd) or 'x-accel-redirect' (nginx) lets the web server send the file.
+PITCH_DECK_SENDFILE = None
+# Internal nginx location aliased to PITCH_DECK_ROOT, for X-Accel-Redirect.
+PITCH_DECK_ACCEL_PREFIX = '/protected/'
+
+# Pitch deck previews (startups.decks)
+# New decks are parsed in the background (python manage.py runworker) into a
+# page count, first-page thumbnails and search text, stored next to the deck.
+# Install pypdf for the text and pypdfium2 + Pillow for the thumbnails.
+# Backfill existing decks with: python manage.py process_pitch_decks
+PITCH_DECK_THUMBNAIL_WIDTHS = (160, 480, 960)
+# Processes parsing decks in each worker.
+PITCH_DECK_WORKERS = 2
+# Characters of deck text kept for search.
+PITCH_DECK_TEXT_LIMIT = 100_000
+# Seconds a deck may take to parse before its job fails; keep it below
+# JOBS_VISIBILITY_TIMEOUT so no other worker picks the job up meanwhile.
+PITCH_DECK_TIMEOUT = 120
+
+# Investor recommendations (investors.matching)
+# Startups kept per investor, refreshed by the worker when profiles change.
+# Needs NumPy in the worker. Rebuild all with: python manage.py rebuild_recommendations
+INVESTOR_RECOMMENDATIONS = 20
+INVESTOR_MATCH_WEIGHTS = {'range': 0.4, 'niche': 0.4, 'history': 0.2}
+# Share of its valuation a startup's round is assumed to raise, matched against
+# investment_range_min/max; also bounds the "Fits my check size" browse filter.
+INVESTOR_MATCH_ROUND_FRACTION = (0.05, 0.25)
+
+# Manufacturer best matches (manufacturers.matching)
+# Ranked startups kept per manufacturer, rebuilt every MANUFACTURER_MATCH_INTERVAL
+# seconds by the worker, or with: python manage.py rebuild_startup_matches
+MANUFACTURER_MATCHES = 100
+MANUFACTURER_MATCH_INTERVAL = 3600
+MANUFACTURER_MATCH_WEIGHTS = {'industry': 0.6, 'capacity': 0.4}
+# Units a startup is expected to order per unit of valuation, matched against
+# production_capacity.
+MANUFACTURER_MATCH_VOLUME_PER_VALUATION = (1e-5, 1e-3)
+
+# Browse facets (startups.facets)
+# Niche/stage counts under a text search are cached per filter combination for
+# this many seconds, or until an approved startup changes.
+STARTUP_FACET_CACHE_TIMEOUT = 600
@@ -0,0 +1,63 @@
+"""SQLite connection profiles, selected with ``settings.SQLITE_PROFILE``
+(``VENTUREHUB_SQLITE_PROFILE`` in the environment) and applied to every
+connection by the ``venturehub.sqlite_backend`` database engine.
+
+``default`` is SQLite as Django opens it: rollback journal, full fsync on
+every commit, a new connection per request. ``production`` applies, on every
+new connection through the backend's ``init_command``:
+
+* ``journal_mode=WAL`` so readers no longer block the writer or each other,
+* ``synchronous=NORMAL``, which is durable against crashes of the process in
+  WAL mode and only fsyncs at checkpoints,
+* ``mmap_size`` and ``cache_size`` so hot pages are read from memory,
+* ``busy_timeout`` so a writer waits for the lock instead of failing,
+
+and opens transactions with ``BEGIN IMMEDIATE``: a transaction that reads
+then writes takes the write lock up front, instead of failing with "database
+is locked" when two of them try to upgrade their read locks at once.
+Connections are kept for ``CONN_MAX_AGE`` seconds (with health checks) so the
+pragmas are not re-run per request; under ASGI Django closes connections per
+request anyway.
+
+Compare the profiles with ``python manage.py benchmark_sqlite``.
+"""
+PROFILES = {
+    'default': {
+        'pragmas': {},
+        'transaction_mode': None,
+        'conn_max_age': 0,
+    },
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,  # negative means KiB: 64 MiB
+            'busy_timeout': 5000,  # milliseconds
+        },
+        'transaction_mode': 'IMMEDIATE',
+        'conn_max_age': 600,
+    },
+}
+
+
+def init_command(pragmas):
+    """The ``init_command`` string that applies ``pragmas``."""
+    return ';'.join(f'PRAGMA {name}={value}' for name, value in pragmas.items())
+
+
+def database_settings(profile):
+    """``DATABASES`` entries (``OPTIONS``, ``CONN_MAX_AGE``...) for SQLite ``profile``."""
+    if profile not in PROFILES:
+        raise ValueError(f'Unknown SQLite profile {profile!r}; choose from {", ".join(PROFILES)}.')
+    config = PROFILES[profile]
+    options = {}
+    if config['pragmas']:
+        options['init_command'] = init_command(config['pragmas'])
+    if config['transaction_mode']:
+        options['transaction_mode'] = config['transaction_mode']
+    return {
+        'OPTIONS': options,
+        'CONN_MAX_AGE': config['conn_max_age'],
+        'CONN_HEALTH_CHECKS': bool(config['conn_max_age']),
+    }
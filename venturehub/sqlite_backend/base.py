@@ -0,0 +1,26 @@
+"""SQLite backend that applies the ``settings.SQLITE_PROFILE`` connection profile.
+
+Set as ``ENGINE`` (``'venturehub.sqlite_backend'``); see ``venturehub.sqlite``
+for the profiles. Settings given in the database's own entry win over the
+profile's: each key of its ``OPTIONS``, and ``CONN_MAX_AGE`` and
+``CONN_HEALTH_CHECKS`` unless left at Django's defaults (``0`` and
+``False``), which Django fills in before the backend sees the entry.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.sqlite3 import base
+from venturehub.sqlite import database_settings
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, settings_dict, alias=DEFAULT_DB_ALIAS):
+        profile = database_settings(getattr(settings, 'SQLITE_PROFILE', 'default'))
+        # None (persistent connections) is an explicit choice too.
+        max_age = settings_dict.get('CONN_MAX_AGE', 0)
+        settings_dict = {
+            **settings_dict,
+            'CONN_MAX_AGE': profile['CONN_MAX_AGE'] if max_age == 0 else max_age,
+            'CONN_HEALTH_CHECKS': settings_dict.get('CONN_HEALTH_CHECKS') or profile['CONN_HEALTH_CHECKS'],
+            'OPTIONS': {**profile['OPTIONS'], **settings_dict.get('OPTIONS', {})},
+        }
+        super().__init__(settings_dict, alias)
@@ -0,0 +1,20 @@
+"""
+Settings for the test suite::
+
+    python manage.py test --settings=venturehub.test_settings
+
+Keeps the file-based session cache in a temporary directory, removed at
+exit, instead of under the checkout.
+"""
+
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
+
+from .settings import *  # noqa: F401,F403
+
+CACHE_DIR = Path(tempfile.mkdtemp(prefix='venturehub-cache-'))
+atexit.register(shutil.rmtree, CACHE_DIR, ignore_errors=True)
+if not REDIS_URL:  # noqa: F405
+    CACHES['sessions']['LOCATION'] = CACHE_DIR / 'sessions'  # noqa: F405